@@ -0,0 +1,46 @@
+"""add_ai_calls
+
+Revision ID: 3d7b9e2a5c80
+Revises: c5e8a1f04d26
+Create Date: 2026-10-19 17:58:04.117392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d7b9e2a5c80'
+down_revision = 'c5e8a1f04d26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('ai_calls',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('location_id', sa.UUID(), nullable=True),
+    sa.Column('agent_type', sa.String(length=50), nullable=False),
+    sa.Column('operation', sa.String(length=50), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('input_tokens', sa.Integer(), nullable=False),
+    sa.Column('output_tokens', sa.Integer(), nullable=False),
+    sa.Column('cache_read_tokens', sa.Integer(), nullable=False),
+    sa.Column('cache_creation_tokens', sa.Integer(), nullable=False),
+    sa.Column('cost_usd', sa.Numeric(precision=12, scale=6), nullable=True),
+    sa.Column('latency_seconds', sa.Float(), nullable=False),
+    sa.Column('stop_reason', sa.String(length=50), nullable=True),
+    sa.Column('parse_ok', sa.Boolean(), nullable=False),
+    sa.Column('error_class', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ai_calls_created_at', 'ai_calls', ['created_at'], unique=False)
+    op.create_index('ix_ai_calls_location_id_created_at', 'ai_calls', ['location_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_calls_location_id_created_at', table_name='ai_calls')
+    op.drop_index('ix_ai_calls_created_at', table_name='ai_calls')
+    op.drop_table('ai_calls')
@@ -0,0 +1,31 @@
+"""add_quota_buckets
+
+Revision ID: 6e1f0a9c4b27
+Revises: 3d7b9e2a5c80
+Create Date: 2026-10-19 19:12:40.528106
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1f0a9c4b27'
+down_revision = '3d7b9e2a5c80'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('quota_buckets',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('rate_factor', sa.Float(), nullable=False),
+    sa.Column('blocked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('quota_buckets')
@@ -0,0 +1,45 @@
+"""add_job_queue_columns_to_tasks
+
+Revision ID: 7752f14de62f
+Revises: 8d414e49801b
+Create Date: 2026-10-19 10:03:17.520941
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7752f14de62f'
+down_revision = '8d414e49801b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE can't run inside a transaction block on older Postgres
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE taskstatus ADD VALUE IF NOT EXISTS 'DEAD'")
+
+    op.add_column('tasks', sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('tasks', sa.Column('dedupe_key', sa.String(), nullable=True))
+    op.add_column('tasks', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('tasks', sa.Column('max_attempts', sa.Integer(), server_default='5', nullable=False))
+    op.add_column('tasks', sa.Column('locked_by', sa.String(), nullable=True))
+    op.add_column('tasks', sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+    op.create_unique_constraint('tasks_dedupe_key_key', 'tasks', ['dedupe_key'])
+    op.create_index('ix_tasks_status_scheduled_at', 'tasks', ['status', 'scheduled_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_scheduled_at', table_name='tasks')
+    op.drop_constraint('tasks_dedupe_key_key', 'tasks', type_='unique')
+    op.drop_column('tasks', 'locked_until')
+    op.drop_column('tasks', 'locked_by')
+    op.drop_column('tasks', 'max_attempts')
+    op.drop_column('tasks', 'attempts')
+    op.drop_column('tasks', 'dedupe_key')
+    op.drop_column('tasks', 'payload')
+    # Postgres can't drop enum values; dead-lettered rows are moved back to FAILED
+    op.execute("UPDATE tasks SET status = 'FAILED' WHERE status = 'DEAD'")
@@ -0,0 +1,38 @@
+"""add_reports_location_type_period_end_index
+
+Revision ID: 8d06c3e5b7a4
+Revises: e27b94c1a0d3
+Create Date: 2026-10-19 15:03:18.660154
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d06c3e5b7a4'
+down_revision = 'e27b94c1a0d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so report reads and writes aren't blocked
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reports_location_type_period_end',
+            'reports',
+            ['location_id', 'report_type', sa.text('period_end DESC')],
+            unique=False,
+            postgresql_include=['id', 'created_at', 'email_sent'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_reports_location_type_period_end',
+            table_name='reports',
+            postgresql_concurrently=True
+        )
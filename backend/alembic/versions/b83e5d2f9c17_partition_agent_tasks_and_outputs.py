@@ -0,0 +1,97 @@
+"""partition_agent_tasks_and_outputs
+
+Revision ID: b83e5d2f9c17
+Revises: 1f9a7c3e64b2
+Create Date: 2026-10-19 16:34:07.295411
+
+Rebuilds agent_tasks and agent_outputs as tables range-partitioned by month
+on created_at, with one partition per month of existing data, the next
+months (PARTITION_PREMAKE_MONTHS is kept topped up by the scheduler), and a
+default partition. Rows are copied over and the old tables dropped; the
+tables are locked while rows are copied, so run during a quiet period.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import date, datetime
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e5d2f9c17'
+down_revision = '1f9a7c3e64b2'
+branch_labels = None
+depends_on = None
+
+PREMAKE_MONTHS = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition(table):
+    """Replace table with a partitioned copy of itself, moving its rows."""
+    conn = op.get_bind()
+    legacy = f"{table}_unpartitioned"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE (created_at)"
+    )
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+    op.execute(f"ALTER TABLE {table} ADD FOREIGN KEY (location_id) REFERENCES locations (id)")
+
+    # Monthly partitions from the oldest row through the premade months ahead
+    oldest = conn.execute(sa.text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+    current = datetime.utcnow().date().replace(day=1)  # UTC, like PartitionManager
+    month = (oldest.date() if oldest else current).replace(day=1)
+    while month <= _add_months(current, PREMAKE_MONTHS):
+        name = f"{table}_p{month.year:04d}_{month.month:02d}"
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy}")
+
+
+def upgrade() -> None:
+    # A foreign key can only reference a partitioned table by (id, created_at)
+    op.drop_constraint('agent_outputs_task_id_fkey', 'agent_outputs', type_='foreignkey')
+
+    _partition('agent_tasks')
+    _partition('agent_outputs')
+
+    op.create_index('ix_agent_tasks_location_id_created_at', 'agent_tasks', ['location_id', 'created_at'], unique=False)
+    op.create_index('ix_agent_outputs_location_id_output_type_created_at', 'agent_outputs', ['location_id', 'output_type', 'created_at'], unique=False)
+    op.create_index('ix_agent_outputs_task_id', 'agent_outputs', ['task_id'], unique=False)
+
+
+def _unpartition(table):
+    """Replace a partitioned table with a plain copy of itself."""
+    legacy = f"{table}_partitioned"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey")
+    op.execute(f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+    op.execute(f"ALTER TABLE {table} ADD FOREIGN KEY (location_id) REFERENCES locations (id)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy}")  # Drops the attached partitions too
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agent_outputs_task_id', table_name='agent_outputs')
+    op.drop_index('ix_agent_outputs_location_id_output_type_created_at', table_name='agent_outputs')
+    op.drop_index('ix_agent_tasks_location_id_created_at', table_name='agent_tasks')
+
+    _unpartition('agent_tasks')
+    _unpartition('agent_outputs')
+
+    op.create_foreign_key('agent_outputs_task_id_fkey', 'agent_outputs', 'agent_tasks', ['task_id'], ['id'])
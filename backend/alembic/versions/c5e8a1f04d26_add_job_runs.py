@@ -0,0 +1,52 @@
+"""add_job_runs
+
+Revision ID: c5e8a1f04d26
+Revises: b83e5d2f9c17
+Create Date: 2026-10-19 17:12:48.306514
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e8a1f04d26'
+down_revision = 'b83e5d2f9c17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('job_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.Enum('RUNNING', 'SUCCEEDED', 'FAILED', name='jobrunstatus'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('duration_seconds', sa.Float(), nullable=True),
+    sa.Column('location_count', sa.Integer(), nullable=True),
+    sa.Column('items', sa.Integer(), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('db_queries', sa.Integer(), nullable=False),
+    sa.Column('db_seconds', sa.Float(), nullable=False),
+    sa.Column('external_seconds', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_runs_job_name_started_at', 'job_runs', ['job_name', 'started_at'], unique=False)
+
+    op.add_column('tasks', sa.Column('job_run_id', sa.UUID(), nullable=True))
+    op.add_column('tasks', sa.Column('metrics', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.create_foreign_key('tasks_job_run_id_fkey', 'tasks', 'job_runs', ['job_run_id'], ['id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_tasks_job_run_id'), 'tasks', ['job_run_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_job_run_id'), table_name='tasks')
+    op.drop_constraint('tasks_job_run_id_fkey', 'tasks', type_='foreignkey')
+    op.drop_column('tasks', 'metrics')
+    op.drop_column('tasks', 'job_run_id')
+    op.drop_index('ix_job_runs_job_name_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
+    op.execute("DROP TYPE IF EXISTS jobrunstatus")
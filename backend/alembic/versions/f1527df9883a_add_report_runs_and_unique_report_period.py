@@ -0,0 +1,97 @@
+"""add_report_runs_and_unique_report_period
+
+Revision ID: f1527df9883a
+Revises: 7752f14de62f
+Create Date: 2026-10-19 11:26:52.904117
+
+Adding the unique (location, type, period_start) constraint removes
+duplicate reports, keeping the earliest of each. The removed rows are
+copied into reports_removed_duplicates first, and their ids and count
+are logged. Downgrading leaves that table in place; drop it by hand once
+nothing in it is needed.
+
+"""
+from alembic import op
+import logging
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1527df9883a'
+down_revision = '7752f14de62f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing reports table has no uniqueness - keep the earliest report per
+    # (location, type, period_start) before adding the constraint
+    conn = op.get_bind()
+    conn.execute(sa.text("""
+        CREATE TEMP TABLE duplicate_report_ids ON COMMIT DROP AS
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY location_id, report_type, period_start
+                ORDER BY created_at ASC NULLS LAST, id
+            ) AS rn
+            FROM reports
+        ) ranked
+        WHERE ranked.rn > 1
+    """))
+
+    # Keep a copy of every report about to be deleted
+    op.execute("CREATE TABLE IF NOT EXISTS reports_removed_duplicates (LIKE reports INCLUDING DEFAULTS)")
+    op.execute("""
+        INSERT INTO reports_removed_duplicates
+        SELECT r.* FROM reports r JOIN duplicate_report_ids d ON d.id = r.id
+    """)
+
+    removed = conn.execute(sa.text("SELECT id FROM duplicate_report_ids")).scalars().all()
+    if removed:
+        logger.warning(
+            f"Removing {len(removed)} duplicate reports (copied to reports_removed_duplicates): "
+            + ", ".join(str(report_id) for report_id in removed)
+        )
+
+    op.execute("DELETE FROM reports WHERE id IN (SELECT id FROM duplicate_report_ids)")
+    op.create_unique_constraint('uq_reports_location_type_period', 'reports', ['location_id', 'report_type', 'period_start'])
+
+    op.create_table('report_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('report_type', postgresql.ENUM('WEEKLY', 'MONTHLY', 'CUSTOM', name='reporttype', create_type=False), nullable=False),
+    sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('period_end', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.Enum('RUNNING', 'COMPLETED', 'COMPLETED_WITH_ERRORS', name='reportrunstatus'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('report_type', 'period_start', name='uq_report_runs_type_period')
+    )
+    op.create_table('report_run_items',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('run_id', sa.UUID(), nullable=False),
+    sa.Column('location_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'COMPLETED', 'FAILED', 'SKIPPED', name='reportrunitemstatus'), nullable=False),
+    sa.Column('report_id', sa.UUID(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['report_id'], ['reports.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['run_id'], ['report_runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('run_id', 'location_id', name='uq_report_run_items_run_location')
+    )
+    op.create_index(op.f('ix_report_run_items_run_id'), 'report_run_items', ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_report_run_items_run_id'), table_name='report_run_items')
+    op.drop_table('report_run_items')
+    op.drop_table('report_runs')
+    op.execute("DROP TYPE IF EXISTS reportrunitemstatus")
+    op.execute("DROP TYPE IF EXISTS reportrunstatus")
+    op.drop_constraint('uq_reports_location_type_period', 'reports', type_='unique')
@@ -7,16 +7,26 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.services import metrics, query_tracker
+
+# Connections kept open, and extra connections allowed under load (per process;
+# start.py divides DB_MAX_CONNECTIONS between its workers)
+DB_POOL_SIZE = settings.DB_POOL_SIZE
+DB_MAX_OVERFLOW = settings.DB_MAX_OVERFLOW
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Test connections before using them
-    pool_size=10,
-    max_overflow=20,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
     echo=settings.ENVIRONMENT == "development"  # Log SQL queries in development
 )
 
+# Time every query for /metrics, and record statement shapes for N+1 detection
+metrics.instrument_engine(engine)
+query_tracker.instrument_engine(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -8,9 +8,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from app.config import settings
-from app.routers import health, onboarding, reports, agents, oauth, locations
+from app.routers import health, metrics, admin, onboarding, reports, agents, oauth, locations
 from app.database import engine, Base
 from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.job_queue import start_job_workers, stop_job_workers
+from app.services.email_outbox import start_outbox_sender, stop_outbox_sender
+from app.services.metrics import metrics_middleware
+from app.services.query_tracker import query_tracking_middleware
 import logging
 
 # Configure logging
@@ -38,6 +42,13 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Per-route latency, DB and outbound call metrics (served on /metrics)
+app.middleware("http")(metrics_middleware)
+
+# Flag repeated statement shapes (N+1 queries) per request
+if settings.query_tracking_enabled:
+    app.middleware("http")(query_tracking_middleware)
+
 # Add validation error handler for debugging
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -52,6 +63,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 # Include routers
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 app.include_router(onboarding.router)
 app.include_router(reports.router)
 app.include_router(agents.router)
@@ -78,7 +91,11 @@ async def startup_event():
         logger.error(f"❌ Database connection failed: {str(e)}")
         raise
 
-    # Start the report scheduler
+    # Start the report scheduler (unless a dedicated worker process runs it)
+    if not settings.RUN_SCHEDULER_IN_API:
+        logger.info("ℹ️  Scheduler disabled in API process (RUN_SCHEDULER_IN_API=false)")
+        return
+
     try:
         start_scheduler()
         logger.info("✅ Report scheduler started successfully")
@@ -86,6 +103,18 @@ async def startup_event():
         logger.error(f"❌ Failed to start report scheduler: {str(e)}")
         # Don't raise - scheduler is not critical for API functionality
 
+    try:
+        start_job_workers()
+        logger.info("✅ Job queue workers started successfully")
+    except Exception as e:
+        logger.error(f"❌ Failed to start job queue workers: {str(e)}")
+
+    try:
+        start_outbox_sender()
+        logger.info("✅ Email outbox sender started successfully")
+    except Exception as e:
+        logger.error(f"❌ Failed to start email outbox sender: {str(e)}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -96,12 +125,27 @@ async def shutdown_event():
     logger.info("Shutting down Sponte AI Backend")
 
     # Stop the report scheduler
+    if not settings.RUN_SCHEDULER_IN_API:
+        return
+
     try:
         stop_scheduler()
         logger.info("✅ Report scheduler stopped successfully")
     except Exception as e:
         logger.error(f"❌ Failed to stop report scheduler: {str(e)}")
 
+    try:
+        stop_job_workers()
+        logger.info("✅ Job queue workers stopped successfully")
+    except Exception as e:
+        logger.error(f"❌ Failed to stop job queue workers: {str(e)}")
+
+    try:
+        stop_outbox_sender()
+        logger.info("✅ Email outbox sender stopped successfully")
+    except Exception as e:
+        logger.error(f"❌ Failed to stop email outbox sender: {str(e)}")
+
 
 @app.get("/")
 async def root():
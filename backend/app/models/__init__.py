@@ -9,8 +9,15 @@ from app.models.agent_config import AgentConfig, AgentType, AutonomyMode
 from app.models.oauth_token import OAuthToken, OAuthProvider
 from app.models.task import Task, TaskType, TaskStatus
 from app.models.report import Report, ReportType
+from app.models.report_archive import ReportArchive
+from app.models.report_run import ReportRun, ReportRunItem, ReportRunStatus, ReportRunItemStatus
+from app.models.email_outbox import EmailOutbox, EmailKind, EmailOutboxStatus
 from app.models.agent_task import AgentTask, AgentTaskStatus, AgentTaskType
 from app.models.agent_output import AgentOutput, OutputStatus, OutputType, GBPCallToAction
+from app.models.agent_activity import AgentActivityDaily
+from app.models.job_run import JobRun, JobRunStatus
+from app.models.ai_call import AICall
+from app.models.quota_bucket import QuotaBucket
 
 __all__ = [
     "User",
@@ -26,6 +33,14 @@ __all__ = [
     "TaskStatus",
     "Report",
     "ReportType",
+    "ReportArchive",
+    "ReportRun",
+    "ReportRunItem",
+    "ReportRunStatus",
+    "ReportRunItemStatus",
+    "EmailOutbox",
+    "EmailKind",
+    "EmailOutboxStatus",
     "AgentTask",
     "AgentTaskStatus",
     "AgentTaskType",
@@ -33,4 +48,9 @@ __all__ = [
     "OutputStatus",
     "OutputType",
     "GBPCallToAction",
+    "AgentActivityDaily",
+    "JobRun",
+    "JobRunStatus",
+    "AICall",
+    "QuotaBucket",
 ]
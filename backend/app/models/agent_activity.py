@@ -0,0 +1,31 @@
+"""
+Agent activity rollup model.
+Per-location, per-day counters of agent work, maintained incrementally as
+agent tasks and outputs change status (see app/services/activity_rollup.py),
+so reports and trend charts sum a handful of rows instead of scanning
+agent_tasks / agent_outputs history.
+"""
+
+from sqlalchemy import Column, String, Date, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class AgentActivityDaily(Base):
+    """
+    Activity counters for one location, UTC day and activity type.
+    activity_type is an agent type (GBP, BLOG, ...) for task counters and an
+    output type name (GBP_POST, BLOG_POST, ...) for output counters.
+    """
+    __tablename__ = "agent_activity_daily"
+
+    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    activity_type = Column(String(50), primary_key=True)
+
+    created = Column(Integer, nullable=False, default=0)  # Outputs created
+    published = Column(Integer, nullable=False, default=0)  # Outputs posted to their platform
+    completed = Column(Integer, nullable=False, default=0)  # Tasks completed (and not since rejected)
+
+    def __repr__(self):
+        return f"<AgentActivityDaily {self.location_id} {self.day} {self.activity_type}>"
@@ -3,7 +3,7 @@ Agent Output model.
 Tracks what AI agents have produced (posts, articles, citations, etc.).
 """
 
-from sqlalchemy import Column, String, Enum, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Enum, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -47,11 +47,15 @@ class AgentOutput(Base):
 
     Represents content created by AI agents (posts, articles, etc.).
     Each output is linked to a task that generated it.
+
+    Partitioned by month on created_at (see app/services/partitions.py), so
+    the primary key includes created_at. task_id has no database foreign key:
+    a partitioned agent_tasks can only be referenced by (id, created_at).
     """
     __tablename__ = "agent_outputs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("agent_tasks.id"), nullable=False)
+    task_id = Column(UUID(as_uuid=True), nullable=False)
     location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id"), nullable=False)
 
     output_type = Column(Enum(OutputType), nullable=False)
@@ -76,14 +80,24 @@ class AgentOutput(Base):
     output_metadata = Column(JSONB, nullable=True)  # AI reasoning, prompt used, etc.
 
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     posted_at = Column(DateTime, nullable=True)  # When actually posted to platform
     scheduled_for = Column(DateTime, nullable=True)  # For scheduled posts
 
     # Relationships
-    task = relationship("AgentTask", back_populates="outputs")
+    task = relationship(
+        "AgentTask",
+        primaryjoin="foreign(AgentOutput.task_id) == AgentTask.id",
+        back_populates="outputs"
+    )
     location = relationship("Location", back_populates="agent_outputs")
 
+    __table_args__ = (
+        Index("ix_agent_outputs_location_id_output_type_created_at", "location_id", "output_type", "created_at"),
+        Index("ix_agent_outputs_task_id", "task_id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
     def __repr__(self):
         return f"<AgentOutput {self.id} - {self.output_type} [{self.status}]>"
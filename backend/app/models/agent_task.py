@@ -3,7 +3,7 @@ Agent Task model.
 Tracks what each AI agent needs to do (pending work queue).
 """
 
-from sqlalchemy import Column, String, Enum, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Enum, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -52,6 +52,9 @@ class AgentTask(Base):
 
     Represents a single task that an AI agent needs to complete.
     Tasks are created by the scheduler or manually by users.
+
+    Partitioned by month on created_at (see app/services/partitions.py), so
+    the primary key includes created_at.
     """
     __tablename__ = "agent_tasks"
 
@@ -74,13 +77,22 @@ class AgentTask(Base):
     error_message = Column(Text, nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
 
     # Relationships
     location = relationship("Location", back_populates="agent_tasks")
-    outputs = relationship("AgentOutput", back_populates="task")
+    outputs = relationship(
+        "AgentOutput",
+        primaryjoin="AgentTask.id == foreign(AgentOutput.task_id)",
+        back_populates="task"
+    )
+
+    __table_args__ = (
+        Index("ix_agent_tasks_location_id_created_at", "location_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     def __repr__(self):
         return f"<AgentTask {self.id} - {self.agent_type}:{self.task_type} [{self.status}]>"
@@ -0,0 +1,45 @@
+"""
+AI call telemetry model.
+One row per Claude generation with its model, token usage, latency, stop
+reason and whether the response parsed (see app/services/ai_telemetry.py).
+"""
+
+from sqlalchemy import Column, String, DateTime, Boolean, Float, Integer, Numeric, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+import uuid
+
+
+class AICall(Base):
+    """
+    One call to the Anthropic API.
+    Calls that raised have error_class set and no token counts.
+    """
+    __tablename__ = "ai_calls"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=True)
+    agent_type = Column(String(50), nullable=False)  # gbp, blog, ...
+    operation = Column(String(50), nullable=False)  # gbp_post, blog_post, review_response
+    model = Column(String(100), nullable=False)
+
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    cache_read_tokens = Column(Integer, nullable=False, default=0)
+    cache_creation_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Numeric(12, 6), nullable=True)  # Estimated from ai_telemetry.MODEL_PRICING; None for unknown models
+
+    latency_seconds = Column(Float, nullable=False)
+    stop_reason = Column(String(50), nullable=True)  # end_turn, max_tokens, ...
+    parse_ok = Column(Boolean, nullable=False, default=False)  # Response was the JSON the prompt asked for
+    error_class = Column(String(100), nullable=True)  # Exception raised by the API call
+
+    __table_args__ = (
+        Index("ix_ai_calls_created_at", "created_at"),
+        Index("ix_ai_calls_location_id_created_at", "location_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<AICall {self.operation} {self.model} {self.location_id}>"
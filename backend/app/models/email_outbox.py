@@ -0,0 +1,66 @@
+"""
+Email outbox model.
+Emails are written to the outbox in the same transaction as the row they
+belong to (a report, a completed onboarding) and delivered by a background
+sender, so a committed report always gets its email and request handlers
+never wait on the email provider.
+"""
+
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Text, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+from app.database import Base
+import uuid
+import enum
+
+
+class EmailKind(str, enum.Enum):
+    """Which template an outbox message renders"""
+    WELCOME = "welcome"
+    REPORT = "report"
+
+
+class EmailOutboxStatus(str, enum.Enum):
+    """Delivery status of an outbox message"""
+    PENDING = "pending"  # Waiting to be sent (or retried)
+    SENDING = "sending"  # Leased by a sender
+    SENT = "sent"  # Accepted by the email provider
+    DEAD = "dead"  # Gave up after max_attempts
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing email awaiting delivery.
+    idempotency_key is unique per logical email and is also sent to the
+    provider, so a retry after a crash mid-send is not delivered twice.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(SQLEnum(EmailKind), nullable=False)
+    status = Column(SQLEnum(EmailOutboxStatus), nullable=False, default=EmailOutboxStatus.PENDING)
+    idempotency_key = Column(String, nullable=False, unique=True)
+
+    # Template arguments; report emails read report data from the report itself
+    payload = Column(JSONB, nullable=False, default=dict)
+    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id", ondelete="SET NULL"), nullable=True)
+
+    # Delivery bookkeeping
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=8)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String, nullable=True)
+    batch_key = Column(String, nullable=True)  # Idempotency key of the provider batch this was last sent in
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox {self.kind.value} [{self.status.value}] attempts={self.attempts}>"
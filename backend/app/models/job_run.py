@@ -0,0 +1,53 @@
+"""
+Job run history model.
+One row per scheduled job invocation, with its duration, the locations it
+considered, the items it produced and where its time went
+(see app/services/job_runs.py).
+"""
+
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, Float, Integer, Text, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.database import Base
+import uuid
+import enum
+
+
+class JobRunStatus(str, enum.Enum):
+    """Outcome of a job run"""
+    RUNNING = "running"  # Still running, or the process died mid-run
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"  # The job raised; error_message has the exception
+
+
+class JobRun(Base):
+    """
+    One invocation of a scheduled job.
+    Tasks the run enqueued point back at it through tasks.job_run_id.
+    """
+    __tablename__ = "job_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_name = Column(String(100), nullable=False)
+    status = Column(SQLEnum(JobRunStatus), nullable=False, default=JobRunStatus.RUNNING)
+
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+
+    location_count = Column(Integer, nullable=True)  # Locations the job considered
+    items = Column(Integer, nullable=False, default=0)  # Jobs enqueued / rows or reports processed
+    result = Column(JSONB, nullable=True)  # Job-specific counts
+
+    # Where the time went
+    db_queries = Column(Integer, nullable=False, default=0)
+    db_seconds = Column(Float, nullable=False, default=0.0)
+    external_seconds = Column(JSONB, nullable=True)  # Service name -> seconds
+
+    error_message = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_runs_job_name_started_at", "job_name", "started_at"),
+    )
+
+    def __repr__(self):
+        return f"<JobRun {self.job_name} {self.started_at} [{self.status.value}]>"
@@ -48,6 +48,7 @@ class Location(Base):
     primary_goal = Column(String, nullable=True)  # more_calls, more_traffic, more_reviews, etc.
     report_frequency = Column(String, nullable=True)  # weekly, monthly
     report_emails = Column(Text, nullable=True)  # Comma-separated email list
+    timezone = Column(String, nullable=True)  # IANA timezone (e.g., 'America/Chicago') for local scheduling
 
     # Google Business Profile Integration
     gbp_location_name = Column(String, nullable=True)  # Google's location resource name (e.g., 'locations/123456')
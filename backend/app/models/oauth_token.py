@@ -2,7 +2,7 @@
 OAuthToken model - stores encrypted OAuth tokens for third-party integrations.
 """
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -42,6 +42,11 @@ class OAuthToken(Base):
     expires_at = Column(DateTime(timezone=True), nullable=True)  # When access token expires
     scope = Column(Text, nullable=True)  # OAuth scopes granted (e.g., "profile email https://www.googleapis.com/auth/business.manage")
 
+    # Provider account details captured at connect time so status checks don't hit the provider API
+    provider_email = Column(String, nullable=True)  # Email of the connected provider account
+    accounts_count = Column(Integer, nullable=True)  # Number of GBP accounts visible to the connection
+    account_info_synced_at = Column(DateTime(timezone=True), nullable=True)  # When the cached details were last fetched
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
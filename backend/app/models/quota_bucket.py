@@ -0,0 +1,27 @@
+"""
+Quota bucket model.
+Token bucket state for upstream rate limits, shared by every process
+(see app/services/rate_limiter.py).
+"""
+
+from sqlalchemy import Column, String, DateTime, Float
+from app.database import Base
+
+
+class QuotaBucket(Base):
+    """
+    One token bucket, e.g. gbp:project or gbp:account:accounts/123.
+    Rate and capacity come from settings, so only the state lives here.
+    """
+    __tablename__ = "quota_buckets"
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)  # Tokens left as of updated_at
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Adaptive backoff after 429s
+    rate_factor = Column(Float, nullable=False, default=1.0)  # Share of the configured rate currently allowed
+    blocked_until = Column(DateTime(timezone=True), nullable=True)  # Retry-After from the last 429
+
+    def __repr__(self):
+        return f"<QuotaBucket {self.key} {self.tokens:.1f} tokens>"
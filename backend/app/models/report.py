@@ -2,7 +2,7 @@
 Report model for storing generated weekly and monthly reports.
 """
 
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Text
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -35,7 +35,9 @@ class Report(Base):
 
     # Report data stored as JSON
     # Contains: metrics, agent_activity, insights, recommendations
+    # Once archived, only a summary; the full data is in report_archives
     data = Column(JSONB, nullable=False, default=dict)
+    archived_at = Column(DateTime(timezone=True), nullable=True)
 
     # Email delivery tracking
     email_sent = Column(DateTime(timezone=True), nullable=True)
@@ -46,5 +48,19 @@ class Report(Base):
     # Relationships
     location = relationship("Location", back_populates="reports")
 
+    __table_args__ = (
+        # One report per location, type and period - makes report runs safe to retry
+        UniqueConstraint("location_id", "report_type", "period_start", name="uq_reports_location_type_period"),
+        # Latest report per type and report history listings; covers the ETag
+        # columns so the latest lookup is index-only
+        Index(
+            "ix_reports_location_type_period_end",
+            "location_id",
+            "report_type",
+            period_end.desc(),
+            postgresql_include=["id", "created_at", "email_sent"]
+        ),
+    )
+
     def __repr__(self):
         return f"<Report {self.report_type.value} {self.period_start} to {self.period_end}>"
@@ -0,0 +1,27 @@
+"""
+Report archive model.
+Holds the compressed full data of reports older than REPORT_ARCHIVE_AFTER_DAYS.
+The report row stays in place with a small summary in data, so listings
+still work; get_report rehydrates the full data from here (see
+app/services/report_archive.py).
+"""
+
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ReportArchive(Base):
+    """Compressed report data, one row per archived report"""
+    __tablename__ = "report_archives"
+
+    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String(10), nullable=False)  # zstd or gzip
+    data = Column(LargeBinary, nullable=False)  # Compressed JSON of the original Report.data
+    original_size = Column(Integer, nullable=False)
+    compressed_size = Column(Integer, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ReportArchive {self.report_id} {self.codec} {self.original_size}->{self.compressed_size}>"
@@ -0,0 +1,84 @@
+"""
+Report run tracking models.
+Record the progress of each scheduled report run per location so reruns
+skip completed locations and resume where a crashed run stopped.
+"""
+
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, ForeignKey, Text, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.database import Base
+from app.models.report import ReportType
+import uuid
+from datetime import datetime
+import enum
+
+
+class ReportRunStatus(str, enum.Enum):
+    """Overall status of a report run"""
+    RUNNING = "running"  # Items still outstanding
+    COMPLETED = "completed"  # Every item completed or skipped
+    COMPLETED_WITH_ERRORS = "completed_with_errors"  # Finished, but some items failed permanently
+
+
+class ReportRunItemStatus(str, enum.Enum):
+    """Per-location status within a report run"""
+    PENDING = "pending"  # Not yet processed, or a failed attempt is awaiting retry
+    COMPLETED = "completed"  # Report created (and email handed off)
+    FAILED = "failed"  # Failed on its final attempt; picked up again by a rerun
+    SKIPPED = "skipped"  # Location no longer eligible (e.g. reporting disabled)
+
+
+class ReportRun(Base):
+    """
+    One scheduled report run for a period.
+    Unique per (report_type, period_start) so a rerun attaches to the existing run.
+    """
+    __tablename__ = "report_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    report_type = Column(SQLEnum(ReportType), nullable=False)
+    period_start = Column(DateTime(timezone=True), nullable=False)
+    period_end = Column(DateTime(timezone=True), nullable=False)
+    status = Column(SQLEnum(ReportRunStatus), nullable=False, default=ReportRunStatus.RUNNING)
+
+    started_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    items = relationship("ReportRunItem", back_populates="run", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        UniqueConstraint("report_type", "period_start", name="uq_report_runs_type_period"),
+    )
+
+    def __repr__(self):
+        return f"<ReportRun {self.report_type.value} {self.period_start} [{self.status.value}]>"
+
+
+class ReportRunItem(Base):
+    """
+    Checkpoint for one location within a report run.
+    """
+    __tablename__ = "report_run_items"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_id = Column(UUID(as_uuid=True), ForeignKey("report_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), nullable=False)
+    status = Column(SQLEnum(ReportRunItemStatus), nullable=False, default=ReportRunItemStatus.PENDING)
+
+    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id", ondelete="SET NULL"), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    error_message = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    run = relationship("ReportRun", back_populates="items")
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "location_id", name="uq_report_run_items_run_location"),
+    )
+
+    def __repr__(self):
+        return f"<ReportRunItem {self.location_id} [{self.status.value}]>"
@@ -1,8 +1,10 @@
 """
-Task model - represents background jobs executed by Celery workers (agents).
+Task model - represents background jobs in the durable job queue.
+Producers enqueue rows, workers claim them with SELECT ... FOR UPDATE SKIP LOCKED
+(see app/services/job_queue.py).
 """
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,6 +19,7 @@ class TaskStatus(str, enum.Enum):
     RUNNING = "running"  # Task currently executing
     COMPLETED = "completed"  # Task finished successfully
     FAILED = "failed"  # Task encountered an error
+    DEAD = "dead"  # Task exhausted its retries and was dead-lettered
 
 
 class TaskType(str, enum.Enum):
@@ -61,19 +64,37 @@ class Task(Base):
     task_type = Column(Enum(TaskType), nullable=False)
     status = Column(Enum(TaskStatus), default=TaskStatus.PENDING, nullable=False, index=True)
 
+    # Job input
+    payload = Column(JSONB, nullable=True)  # Arguments for the task handler
+    dedupe_key = Column(String, nullable=True, unique=True)  # Prevents the same job being enqueued twice
+
     # Scheduling
-    scheduled_at = Column(DateTime(timezone=True), nullable=False)  # When task should run
+    scheduled_at = Column(DateTime(timezone=True), nullable=False)  # When task should run (next attempt after a retry)
     started_at = Column(DateTime(timezone=True), nullable=True)  # When task actually started
     completed_at = Column(DateTime(timezone=True), nullable=True)  # When task finished
 
+    # Retries and leasing
+    attempts = Column(Integer, default=0, nullable=False)  # Number of times the task has been claimed
+    max_attempts = Column(Integer, default=5, nullable=False)  # Dead-letter after this many attempts
+    locked_by = Column(String, nullable=True)  # Worker currently holding the task
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Visibility timeout - task is reclaimable after this
+
     # Results and errors
     error_message = Column(Text, nullable=True)  # Error details if task failed
     result_data = Column(JSONB, nullable=True)  # Task output/results as JSON
 
+    # Execution history
+    job_run_id = Column(UUID(as_uuid=True), ForeignKey("job_runs.id", ondelete="SET NULL"), nullable=True, index=True)  # Scheduled run that enqueued the task
+    metrics = Column(JSONB, nullable=True)  # Duration, DB / external time and error class of the latest attempt
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     location = relationship("Location", back_populates="tasks")
 
+    __table_args__ = (
+        Index("ix_tasks_status_scheduled_at", "status", "scheduled_at"),
+    )
+
     def __repr__(self):
         return f"<Task {self.task_type} - {self.status}>"
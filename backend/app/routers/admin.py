@@ -0,0 +1,98 @@
+"""
+Admin API endpoints.
+Operational views for the team, authenticated with ADMIN_API_TOKEN rather
+than user sessions. Disabled when the token isn't set.
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import get_db
+from app.schemas.ai_usage import AIPeakRates, AIUsageGroup, AIUsageResponse
+from app.schemas.job_run import JobRunDetailResponse, JobRunItemSummary, JobRunListResponse, JobRunResponse
+from app.services.ai_telemetry import AITelemetryService
+from app.services.job_runs import JobRunService
+from app.services.report_runs import ReportRunService
+from app.services.scheduler import enqueue_report_jobs
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+import secrets
+import uuid
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+def require_admin_token(authorization: Optional[str] = Header(None)):
+    """Require "Authorization: Bearer <ADMIN_API_TOKEN>"."""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    expected = f"Bearer {settings.ADMIN_API_TOKEN}"
+    if not authorization or not secrets.compare_digest(authorization, expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+@router.get("/job-runs", response_model=JobRunListResponse, dependencies=[Depends(require_admin_token)])
+def list_job_runs(
+    job_name: Optional[str] = Query(None, description="Limit to one job, e.g. create_gbp_tasks"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Recent scheduled job runs, newest first.
+    Duration against location_count shows how a job scales.
+    """
+    runs = JobRunService.list_runs(db, job_name=job_name, limit=limit)
+    return JobRunListResponse(runs=[JobRunResponse.from_orm(run) for run in runs])
+
+
+@router.get("/job-runs/{run_id}", response_model=JobRunDetailResponse, dependencies=[Depends(require_admin_token)])
+def get_job_run(run_id: uuid.UUID, db: Session = Depends(get_db)):
+    """
+    One run with per-task latency percentiles, error classes and DB /
+    external time of the tasks it enqueued.
+    """
+    run = JobRunService.get_run(db, run_id)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job run not found")
+
+    return JobRunDetailResponse(
+        run=JobRunResponse.from_orm(run),
+        tasks=JobRunItemSummary(**JobRunService.get_item_summary(db, run.id))
+    )
+
+
+@router.post("/report-runs/{run_id}/rerun", response_model=dict, dependencies=[Depends(require_admin_token)])
+def rerun_report_run(run_id: uuid.UUID, db: Session = Depends(get_db)):
+    """
+    Retry a report run's failed locations now: re-opens the run and puts
+    their dead-lettered jobs back on the queue with fresh attempts.
+    Scheduled planning never does this on its own.
+    """
+    run = ReportRunService.get_run(db, run_id)
+    if not run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report run not found")
+
+    enqueued = enqueue_report_jobs(db, run.report_type, run.period_start, run.period_end, rerun=True)
+    return {"run_id": str(run.id), "enqueued": enqueued}
+
+
+@router.get("/ai-usage", response_model=AIUsageResponse, dependencies=[Depends(require_admin_token)])
+def get_ai_usage(
+    days: int = Query(7, ge=1, le=90),
+    group_by: Literal["location", "agent_type", "operation", "model"] = Query("location"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    AI calls, tokens, estimated cost and latency per group over the last
+    `days` days, most expensive first, plus the busiest minute for sizing
+    rate limits.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return AIUsageResponse(
+        since=since,
+        group_by=group_by,
+        groups=[AIUsageGroup(**group) for group in AITelemetryService.get_usage(db, since, group_by, limit)],
+        peak_per_minute=AIPeakRates(**AITelemetryService.get_peak_rates(db, since))
+    )
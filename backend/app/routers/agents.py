@@ -13,6 +13,7 @@ from app.schemas.agent_task import (
     AgentTaskListResponse,
     AgentTaskUpdate
 )
+from app.schemas.agent_activity import ActivityTrendResponse
 from app.schemas.agent_output import (
     AgentOutputResponse,
     AgentOutputListResponse,
@@ -21,7 +22,9 @@ from app.schemas.agent_output import (
     GBPPostGenerateResponse
 )
 from app.models.agent_output import GBPCallToAction
+from app.services.activity_rollup import ActivityRollupService, published_day
 from app.services.gbp_agent import GBPAgentService
+from datetime import datetime, timedelta
 from typing import Optional
 import logging
 import uuid
@@ -192,6 +195,8 @@ async def update_output(
     if not output:
         raise HTTPException(status_code=404, detail="Output not found")
 
+    published_before = published_day(output)
+
     try:
         # Update fields if provided
         if update.content is not None:
@@ -203,8 +208,6 @@ async def update_output(
             )
         elif update.status is not None:
             output.status = update.status
-            db.commit()
-            db.refresh(output)
 
         # Update other fields
         if update.platform_post_id is not None:
@@ -218,6 +221,8 @@ async def update_output(
         if update.scheduled_for is not None:
             output.scheduled_for = update.scheduled_for
 
+        # Status and rollup change commit together
+        ActivityRollupService.record_output_change(db, output, published_before)
         db.commit()
         db.refresh(output)
 
@@ -228,6 +233,39 @@ async def update_output(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/activity/{location_id}", response_model=ActivityTrendResponse)
+async def get_activity_trend(
+    location_id: str,
+    days: int = Query(30, ge=1, le=366),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get daily agent activity for a location over the last `days` UTC days,
+    for dashboard trend charts. Read from the daily rollup.
+    """
+    try:
+        location_uuid = uuid.UUID(location_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid location ID format")
+
+    # Verify location exists
+    location = db.query(Location).filter(Location.id == location_uuid).first()
+    if not location:
+        raise HTTPException(status_code=404, detail="Location not found")
+
+    end_day = datetime.utcnow().date()
+    start_day = end_day - timedelta(days=days - 1)
+
+    return ActivityTrendResponse(
+        location_id=location_id,
+        start_day=start_day,
+        end_day=end_day,
+        days=ActivityRollupService.get_daily_trend(db, location_uuid, start_day, end_day),
+        totals=ActivityRollupService.get_activity(db, location_uuid, start_day, end_day)
+    )
+
+
 @router.get("/tasks/{location_id}", response_model=AgentTaskListResponse)
 async def get_location_tasks(
     location_id: str,
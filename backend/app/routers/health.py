@@ -1,8 +1,11 @@
 """
-Health check endpoint for monitoring and Railway deployment verification.
+Health check endpoints for monitoring and Railway deployment verification.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.health import UNAVAILABLE, readiness
+from app.services.http_client import breaker_states
 from datetime import datetime
 
 router = APIRouter()
@@ -13,14 +16,43 @@ async def health_check():
     """
     Health check endpoint.
     Returns 200 OK if the service is running.
+    Status is "degraded" while an external dependency's circuit breaker is
+    open; work needing it is deferred until it recovers.
 
     Usage:
     - Railway uses this to verify deployment
     - Monitoring tools can ping this endpoint
     - No authentication required
     """
+    dependencies = breaker_states()
+    degraded = any(dependency["state"] != "closed" for dependency in dependencies.values())
+
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "service": "Sponte AI Backend"
+        "service": "Sponte AI Backend",
+        "dependencies": dependencies
     }
+
+
+@router.get("/health/live", tags=["Health"])
+async def liveness():
+    """
+    Liveness probe: the process is up and its event loop is responding.
+    Checks nothing else, so a database or upstream outage never gets the
+    process restarted.
+    """
+    return {"status": "alive", "timestamp": datetime.utcnow().isoformat()}
+
+
+@router.get("/health/ready", tags=["Health"])
+def readiness_check():
+    """
+    Readiness probe: database, connection pool, scheduler leader, job and
+    email backlog, and external dependency breakers.
+    Returns 503 when the database can't be reached; "degraded" results
+    still return 200. Database probes are cached for HEALTH_CACHE_SECONDS.
+    """
+    report = readiness()
+    status_code = 503 if report["status"] == UNAVAILABLE else 200
+    return JSONResponse(report, status_code=status_code)
@@ -122,4 +122,5 @@ async def get_location(
         "gbp_location_name": location.gbp_location_name,
         "gbp_cadence": location.gbp_cadence,
         "blog_cadence": location.blog_cadence,
+        "timezone": location.timezone,
     }
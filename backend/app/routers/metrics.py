@@ -0,0 +1,26 @@
+"""
+Prometheus metrics endpoint.
+"""
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from app.config import settings
+from app.services.metrics import render_metrics
+from typing import Optional
+import secrets
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["Health"], include_in_schema=False)
+def get_metrics(authorization: Optional[str] = Header(None)):
+    """
+    Metrics in Prometheus text format.
+    Requires a bearer token when METRICS_TOKEN is set.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not authorization or not secrets.compare_digest(authorization, expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -146,12 +146,16 @@ async def google_callback(
 
         user_email = GoogleOAuthService.get_user_email(credentials)
 
+        # Capture account count now so status checks can answer from the database
+        accounts = GoogleOAuthService.list_accounts(credentials)
+
         # Save tokens to database
         GoogleOAuthService.save_tokens(
             db=db,
             location_id=location_id,
             token_data=token_data,
-            provider_user_id=user_email
+            provider_user_id=user_email,
+            accounts_count=len(accounts)
         )
 
         logger.info(f"Successfully connected Google account for location {location_id}")
@@ -206,14 +210,18 @@ async def disconnect_google(
 @router.get("/google/status/{location_id}")
 async def get_google_status(
     location_id: str,
+    verify: bool = Query(False, description="Check the connection live against Google and refresh cached account info"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Check if Google OAuth is connected for a location.
+    Answers from the cached token record by default; pass verify=true
+    to refresh credentials and re-fetch account info from Google.
 
     Args:
         location_id: Location UUID
+        verify: Perform a live check against Google
 
     Returns:
         Connection status
@@ -223,25 +231,45 @@ async def get_google_status(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid location ID format")
 
-    # Try to get valid credentials
-    credentials = GoogleOAuthService.get_valid_credentials(db, str(location_uuid))
+    oauth_token = GoogleOAuthService.get_token(db, str(location_uuid))
+
+    if not oauth_token:
+        return {
+            "connected": False,
+            "location_id": location_id
+        }
+
+    if verify:
+        # Live check - refreshes the access token if needed
+        credentials = GoogleOAuthService.get_valid_credentials(db, str(location_uuid))
+        if credentials is None:
+            return {
+                "connected": False,
+                "location_id": location_id,
+                "needs_reconnection": True,
+                "verified": True
+            }
 
-    connected = credentials is not None
+        oauth_token = GoogleOAuthService.sync_account_info(db, oauth_token, credentials)
+
+    # An expired access token without a refresh token can't be renewed
+    needs_reconnection = False
+    if oauth_token.expires_at and not oauth_token.refresh_token_encrypted:
+        needs_reconnection = oauth_token.expires_at < datetime.now(timezone.utc)
 
     response = {
-        "connected": connected,
-        "location_id": location_id
+        "connected": True,
+        "location_id": location_id,
+        "needs_reconnection": needs_reconnection,
+        "verified": verify,
+        "synced_at": oauth_token.account_info_synced_at
     }
 
-    if connected:
-        # Get user email
-        user_email = GoogleOAuthService.get_user_email(credentials)
-        if user_email:
-            response["email"] = user_email
+    if oauth_token.provider_email:
+        response["email"] = oauth_token.provider_email
 
-        # Get accounts and locations
-        accounts = GoogleOAuthService.list_accounts(credentials)
-        response["accounts_count"] = len(accounts)
+    if oauth_token.accounts_count is not None:
+        response["accounts_count"] = oauth_token.accounts_count
 
     return response
 
@@ -9,7 +9,7 @@ from app.database import get_db
 from app.dependencies import get_current_user
 from app.schemas.onboarding import OnboardingSubmitRequest, OnboardingSubmitResponse
 from app.models import User, Location, AgentConfig, AgentType, AutonomyMode, SubscriptionTier
-from app.services.email_service import send_welcome_email
+from app.services.email_outbox import EmailOutboxService
 from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel
 from typing import Optional, List, Union
@@ -194,6 +194,7 @@ async def submit_onboarding(
             location.primary_goal = onboarding_data.primaryGoal
             location.report_frequency = onboarding_data.reportFrequency
             location.report_emails = onboarding_data.reportEmails
+            location.timezone = onboarding_data.timezone or location.timezone
 
             logger.info(f"Updated existing location: {location.business_name} in {location.city}, {location.state}")
         else:
@@ -219,7 +220,8 @@ async def submit_onboarding(
                 forbidden_topics=onboarding_data.forbiddenTopics,
                 primary_goal=onboarding_data.primaryGoal,
                 report_frequency=onboarding_data.reportFrequency,
-                report_emails=onboarding_data.reportEmails
+                report_emails=onboarding_data.reportEmails,
+                timezone=onboarding_data.timezone
             )
             db.add(location)
             logger.info(f"Created new location: {location.business_name} in {location.city}, {location.state}")
@@ -265,24 +267,21 @@ async def submit_onboarding(
 
         logger.info(f"Created {len(agents_to_create)} agent configs for location {location.id}")
 
+        # Queue welcome email - sent in the background once this transaction commits
+        EmailOutboxService.enqueue_welcome_email(
+            db,
+            user_email=user.email,
+            business_name=location.business_name,
+            user_id=str(user.id),
+            location_id=str(location.id)
+        )
+        logger.info(f"Welcome email queued for {user.email}")
+
         # Commit all changes
         db.commit()
         db.refresh(user)
         db.refresh(location)
 
-        # Send welcome email
-        try:
-            send_welcome_email(
-                user_email=user.email,
-                business_name=location.business_name,
-                user_id=str(user.id),
-                location_id=str(location.id)
-            )
-            logger.info(f"Welcome email queued for {user.email}")
-        except Exception as email_error:
-            # Log but don't fail the request if email fails
-            logger.error(f"Failed to send welcome email: {str(email_error)}")
-
         # Return success response
         return OnboardingSubmitResponse(
             success=True,
@@ -0,0 +1,29 @@
+"""
+Pydantic schemas for agent activity trends.
+"""
+
+from pydantic import BaseModel
+from datetime import date
+from typing import Dict
+
+
+class ActivityCounters(BaseModel):
+    """Counters for one activity type."""
+    created: int = 0  # Outputs created
+    published: int = 0  # Outputs posted to their platform
+    completed: int = 0  # Tasks completed
+
+
+class ActivityTrendDay(BaseModel):
+    """One day of activity, keyed by agent type (tasks) or output type (outputs)."""
+    day: date
+    activity: Dict[str, ActivityCounters]
+
+
+class ActivityTrendResponse(BaseModel):
+    """Daily activity for a location over a range of days."""
+    location_id: str
+    start_day: date
+    end_day: date
+    days: list[ActivityTrendDay]
+    totals: Dict[str, ActivityCounters]
@@ -0,0 +1,38 @@
+"""
+Pydantic schemas for AI call telemetry.
+"""
+
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Literal, Optional
+
+
+class AIUsageGroup(BaseModel):
+    """AI usage of one location, agent type, operation or model"""
+    key: Optional[str] = None
+    name: Optional[str] = None  # Business name when grouped by location
+    calls: int
+    errors: int  # API calls that raised
+    parse_failures: int  # Responses that weren't the JSON the prompt asked for
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cache_creation_tokens: int
+    cost_usd: Optional[float] = None  # None when no call in the group has pricing
+    avg_latency_seconds: Optional[float] = None
+    p95_latency_seconds: Optional[float] = None
+
+
+class AIPeakRates(BaseModel):
+    """Busiest minute per dimension"""
+    requests: int
+    input_tokens: int
+    output_tokens: int
+
+
+class AIUsageResponse(BaseModel):
+    """AI usage since a point in time, most expensive groups first"""
+    since: datetime
+    group_by: Literal["location", "agent_type", "operation", "model"]
+    groups: List[AIUsageGroup]
+    peak_per_minute: AIPeakRates
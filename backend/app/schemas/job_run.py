@@ -0,0 +1,66 @@
+"""
+Pydantic schemas for job run history.
+"""
+
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.models.job_run import JobRunStatus
+
+
+class JobRunResponse(BaseModel):
+    """One scheduled job invocation"""
+    id: str
+    job_name: str
+    status: JobRunStatus
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    location_count: Optional[int] = None
+    items: int
+    result: Optional[Dict[str, Any]] = None
+    db_queries: int
+    db_seconds: float
+    external_seconds: Optional[Dict[str, float]] = None
+    error_message: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+    @classmethod
+    def from_orm(cls, obj):
+        """Convert ORM model to response schema"""
+        return cls(
+            id=str(obj.id),
+            job_name=obj.job_name,
+            status=obj.status,
+            started_at=obj.started_at,
+            finished_at=obj.finished_at,
+            duration_seconds=obj.duration_seconds,
+            location_count=obj.location_count,
+            items=obj.items,
+            result=obj.result,
+            db_queries=obj.db_queries,
+            db_seconds=obj.db_seconds,
+            external_seconds=obj.external_seconds,
+            error_message=obj.error_message
+        )
+
+
+class JobRunListResponse(BaseModel):
+    """Recent runs, newest first"""
+    runs: List[JobRunResponse]
+
+
+class JobRunItemSummary(BaseModel):
+    """Queued tasks a run enqueued, from their latest attempts"""
+    status: Dict[str, int]  # Task count per status
+    latency: Dict[str, Optional[float]]  # p50 / p95 / p99 / max seconds
+    error_classes: Dict[str, int]  # Exception class -> tasks whose latest attempt raised it
+    dependency_seconds: Dict[str, float]  # db and each external service -> total seconds
+
+
+class JobRunDetailResponse(BaseModel):
+    """A run with a summary of the work it enqueued"""
+    run: JobRunResponse
+    tasks: JobRunItemSummary
@@ -44,6 +44,7 @@ class OnboardingSubmitRequest(BaseModel):
     primaryGoal: Optional[str] = None  # more_calls, more_traffic, more_reviews, etc.
     reportFrequency: Optional[str] = "weekly"  # weekly, monthly
     reportEmails: Optional[str] = None  # Comma-separated email list
+    timezone: Optional[str] = None  # IANA timezone from the browser, e.g. "America/Chicago"
 
     # User email (we'll add this to the form later, or generate from OAuth)
     email: EmailStr
@@ -57,14 +57,15 @@ class ReportResponse(BaseModel):
         from_attributes = True
 
     @classmethod
-    def from_orm(cls, obj):
+    def from_orm(cls, obj, data: Optional[Dict[str, Any]] = None):
+        """Build from a Report; pass data to use rehydrated data of an archived report."""
         return cls(
             id=str(obj.id),
             location_id=str(obj.location_id),
             report_type=obj.report_type,
             period_start=obj.period_start,
             period_end=obj.period_end,
-            data=obj.data,
+            data=data if data is not None else obj.data,
             email_sent=obj.email_sent,
             email_recipients=obj.email_recipients,
             created_at=obj.created_at
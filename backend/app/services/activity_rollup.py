@@ -0,0 +1,296 @@
+"""
+Agent activity rollups.
+Keeps agent_activity_daily in step with agent_tasks and agent_outputs.
+Call sites that change a task's or output's status record the change here,
+in the same transaction, as an upsert that adds to the day's counters.
+A batch rebuild recomputes any range of days from the source tables; it
+backfills history and runs nightly over recent days to correct drift from
+writes that bypass the services (manual SQL, bulk updates).
+
+Days are UTC calendar days of the source timestamps, which are stored as
+naive UTC.
+"""
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models import AgentActivityDaily, AgentOutput, AgentTask
+from app.models.agent_output import OutputStatus
+from app.models.agent_task import AgentTaskStatus
+from app.services.partitions import retention_cutoff
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Task statuses that count as completed work
+COMPLETED_TASK_STATUSES = (AgentTaskStatus.COMPLETED, AgentTaskStatus.APPROVED, AgentTaskStatus.POSTED)
+
+COUNTERS = ("created", "published", "completed")
+
+# Rows per INSERT when rebuilding (stays well under Postgres' bind parameter limit)
+REBUILD_INSERT_BATCH = 5000
+
+
+def completed_day(task: AgentTask) -> Optional[date]:
+    """Day a task counts as completed on, or None if it doesn't count."""
+    if task.status in COMPLETED_TASK_STATUSES and task.completed_at:
+        return task.completed_at.date()
+    return None
+
+
+def published_day(output: AgentOutput) -> Optional[date]:
+    """Day an output counts as published on, or None if it doesn't count."""
+    if output.status == OutputStatus.POSTED and output.posted_at:
+        return output.posted_at.date()
+    return None
+
+
+class ActivityRollupService:
+    """Maintains and reads the agent activity rollup"""
+
+    @staticmethod
+    def increment(
+        db: Session,
+        location_id: uuid.UUID,
+        day: date,
+        activity_type: str,
+        created: int = 0,
+        published: int = 0,
+        completed: int = 0
+    ):
+        """
+        Add to one day's counters. Does not commit.
+
+        Args:
+            db: Database session
+            location_id: Location UUID
+            day: UTC day
+            activity_type: Agent type or output type name
+            created: Change in outputs created
+            published: Change in outputs published
+            completed: Change in tasks completed
+        """
+        stmt = pg_insert(AgentActivityDaily).values(
+            location_id=location_id,
+            day=day,
+            activity_type=activity_type,
+            created=created,
+            published=published,
+            completed=completed
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AgentActivityDaily.location_id, AgentActivityDaily.day, AgentActivityDaily.activity_type],
+                set_={
+                    "created": AgentActivityDaily.created + stmt.excluded.created,
+                    "published": AgentActivityDaily.published + stmt.excluded.published,
+                    "completed": AgentActivityDaily.completed + stmt.excluded.completed,
+                }
+            )
+        )
+
+    @staticmethod
+    def record_output_created(db: Session, output: AgentOutput):
+        """Count a new output. Does not commit."""
+        ActivityRollupService.increment(
+            db,
+            output.location_id,
+            (output.created_at or datetime.utcnow()).date(),
+            output.output_type.name,
+            created=1
+        )
+
+    @staticmethod
+    def record_task_change(db: Session, task: AgentTask, before: Optional[date]):
+        """
+        Move a task's completed count after a status change. Does not commit.
+
+        Args:
+            db: Database session
+            task: Task after the change
+            before: completed_day(task) captured before the change
+        """
+        after = completed_day(task)
+        if before == after:
+            return
+        if before:
+            ActivityRollupService.increment(db, task.location_id, before, task.agent_type, completed=-1)
+        if after:
+            ActivityRollupService.increment(db, task.location_id, after, task.agent_type, completed=1)
+
+    @staticmethod
+    def record_output_change(db: Session, output: AgentOutput, before: Optional[date]):
+        """
+        Move an output's published count after a status or posted_at change.
+        Does not commit.
+
+        Args:
+            db: Database session
+            output: Output after the change
+            before: published_day(output) captured before the change
+        """
+        after = published_day(output)
+        if before == after:
+            return
+        if before:
+            ActivityRollupService.increment(db, output.location_id, before, output.output_type.name, published=-1)
+        if after:
+            ActivityRollupService.increment(db, output.location_id, after, output.output_type.name, published=1)
+
+    @staticmethod
+    def rebuild(
+        db: Session,
+        start_day: date,
+        end_day: date,
+        location_id: Optional[uuid.UUID] = None
+    ) -> int:
+        """
+        Recompute the rollup for a range of days from the source tables and
+        replace the existing rows. Commits. Days before the partition
+        retention cutoff are left alone: their source rows are detached, and
+        rebuilding them would zero their counters.
+
+        Args:
+            db: Database session
+            start_day: First UTC day (inclusive)
+            end_day: Last UTC day (inclusive)
+            location_id: Limit to one location (defaults to all)
+
+        Returns:
+            Number of rollup rows written
+        """
+        cutoff = retention_cutoff()
+        if cutoff and start_day < cutoff:
+            logger.warning(f"Not rebuilding activity rollup before {cutoff}: those partitions are detached")
+            start_day = cutoff
+            if start_day > end_day:
+                return 0
+
+        range_start = datetime.combine(start_day, time.min)
+        range_end = datetime.combine(end_day + timedelta(days=1), time.min)
+        counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+        created = db.query(
+            AgentOutput.location_id, func.date(AgentOutput.created_at), AgentOutput.output_type, func.count(AgentOutput.id)
+        ).filter(
+            AgentOutput.created_at >= range_start,
+            AgentOutput.created_at < range_end
+        ).group_by(AgentOutput.location_id, func.date(AgentOutput.created_at), AgentOutput.output_type)
+        published = db.query(
+            AgentOutput.location_id, func.date(AgentOutput.posted_at), AgentOutput.output_type, func.count(AgentOutput.id)
+        ).filter(
+            AgentOutput.status == OutputStatus.POSTED,
+            AgentOutput.posted_at >= range_start,
+            AgentOutput.posted_at < range_end
+        ).group_by(AgentOutput.location_id, func.date(AgentOutput.posted_at), AgentOutput.output_type)
+        completed = db.query(
+            AgentTask.location_id, func.date(AgentTask.completed_at), AgentTask.agent_type, func.count(AgentTask.id)
+        ).filter(
+            AgentTask.status.in_(COMPLETED_TASK_STATUSES),
+            AgentTask.completed_at >= range_start,
+            AgentTask.completed_at < range_end
+        ).group_by(AgentTask.location_id, func.date(AgentTask.completed_at), AgentTask.agent_type)
+        if location_id:
+            created = created.filter(AgentOutput.location_id == location_id)
+            published = published.filter(AgentOutput.location_id == location_id)
+            completed = completed.filter(AgentTask.location_id == location_id)
+
+        for counter, query in (("created", created), ("published", published), ("completed", completed)):
+            for row_location_id, day, activity_type, count in query.all():
+                # Output types come back as enums; task agent types are plain strings
+                key = (row_location_id, day, getattr(activity_type, "name", activity_type))
+                counters[key][counter] += count
+
+        existing = db.query(AgentActivityDaily).filter(
+            AgentActivityDaily.day >= start_day,
+            AgentActivityDaily.day <= end_day
+        )
+        if location_id:
+            existing = existing.filter(AgentActivityDaily.location_id == location_id)
+        existing.delete(synchronize_session=False)
+
+        rows = [
+            {"location_id": key[0], "day": key[1], "activity_type": key[2], **values}
+            for key, values in counters.items()
+        ]
+        for offset in range(0, len(rows), REBUILD_INSERT_BATCH):
+            db.execute(pg_insert(AgentActivityDaily).values(rows[offset:offset + REBUILD_INSERT_BATCH]))
+        db.commit()
+
+        logger.info(f"Rebuilt activity rollup for {start_day} to {end_day}: {len(counters)} rows")
+        return len(counters)
+
+    @staticmethod
+    def get_activity(
+        db: Session,
+        location_id: uuid.UUID,
+        start_day: date,
+        end_day: date
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Sum a location's counters over a range of days.
+
+        Args:
+            db: Database session
+            location_id: Location UUID
+            start_day: First UTC day (inclusive)
+            end_day: Last UTC day (inclusive)
+
+        Returns:
+            Dict of activity type -> {"created", "published", "completed"}
+        """
+        rows = db.query(
+            AgentActivityDaily.activity_type,
+            func.sum(AgentActivityDaily.created),
+            func.sum(AgentActivityDaily.published),
+            func.sum(AgentActivityDaily.completed)
+        ).filter(
+            AgentActivityDaily.location_id == location_id,
+            AgentActivityDaily.day >= start_day,
+            AgentActivityDaily.day <= end_day
+        ).group_by(AgentActivityDaily.activity_type).all()
+
+        return {
+            activity_type: dict(zip(COUNTERS, (int(created), int(published), int(completed))))
+            for activity_type, created, published, completed in rows
+        }
+
+    @staticmethod
+    def get_daily_trend(
+        db: Session,
+        location_id: uuid.UUID,
+        start_day: date,
+        end_day: date
+    ) -> List[Dict]:
+        """
+        A location's counters per day, for trend charts.
+
+        Args:
+            db: Database session
+            location_id: Location UUID
+            start_day: First UTC day (inclusive)
+            end_day: Last UTC day (inclusive)
+
+        Returns:
+            List of {"day", "activity": {activity type: counters}}, one per
+            day in the range, including days without activity
+        """
+        rows = db.query(AgentActivityDaily).filter(
+            AgentActivityDaily.location_id == location_id,
+            AgentActivityDaily.day >= start_day,
+            AgentActivityDaily.day <= end_day
+        ).all()
+
+        by_day = defaultdict(dict)
+        for row in rows:
+            by_day[row.day][row.activity_type] = {counter: getattr(row, counter) for counter in COUNTERS}
+
+        days = (end_day - start_day).days + 1
+        return [
+            {"day": day, "activity": by_day.get(day, {})}
+            for day in (start_day + timedelta(days=offset) for offset in range(days))
+        ]
@@ -1,20 +1,56 @@
 """
 AI Service using Anthropic Claude API.
 Handles all AI content generation for agents.
+Every generation is recorded in AI call telemetry (see ai_telemetry).
+The anthropic SDK is imported when the first generation needs it, not at
+startup.
 """
 
-import anthropic
 from app.config import settings
-from app.models import Location
+from app.services.ai_telemetry import ai_call
+from app.services.http_client import CircuitOpenError, httpx_client, httpx_timeout, upstream_call
+from app.models import AgentType, Location
 from app.models.agent_output import GBPCallToAction
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Type
 import logging
 import json
+import threading
+
+if TYPE_CHECKING:
+    import anthropic
 
 logger = logging.getLogger(__name__)
 
-# Initialize Anthropic client
-client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY) if settings.ANTHROPIC_API_KEY else None
+_client: Optional["anthropic.Anthropic"] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Optional["anthropic.Anthropic"]:
+    """The Anthropic client, created on first use; None without an API key."""
+    global _client
+    if _client is None and settings.ANTHROPIC_API_KEY:
+        with _client_lock:
+            if _client is None:
+                import anthropic
+
+                # Pooled keep-alive connection; the SDK retries 429 / 5xx itself, honoring Retry-After
+                _client = anthropic.Anthropic(
+                    api_key=settings.ANTHROPIC_API_KEY,
+                    http_client=httpx_client("anthropic"),
+                    timeout=httpx_timeout("anthropic"),
+                    max_retries=settings.HTTP_MAX_RETRIES
+                )
+    return _client
+
+
+def anthropic_failures() -> Tuple[Type[BaseException], ...]:
+    """Transport errors the SDK raises in place of httpx's."""
+    import anthropic
+
+    return (anthropic.APIConnectionError,)
+
+
+GENERATION_MODEL = "claude-sonnet-4-20250514"  # Latest Sonnet model
 
 
 class AIService:
@@ -36,7 +72,11 @@ class AIService:
 
         Returns:
             Dict with 'content', 'cta', and 'reasoning'
+
+        Raises:
+            CircuitOpenError: Anthropic's breaker is open (other errors fall back to mock content)
         """
+        client = get_client()
         if not client:
             logger.warning("Anthropic API key not configured, using mock data")
             return AIService._generate_mock_gbp_post(location)
@@ -45,31 +85,38 @@ class AIService:
             # Build the prompt
             prompt = AIService._build_gbp_prompt(location, context, previous_posts)
 
-            # Call Claude API
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",  # Latest Sonnet model
-                max_tokens=1024,
-                temperature=0.7,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-
-            # Extract response
-            response_text = message.content[0].text
-
-            # Parse JSON response
-            try:
-                result = json.loads(response_text)
-                logger.info(f"Generated GBP post for {location.business_name}")
-                return result
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse JSON response: {response_text}")
-                return AIService._generate_mock_gbp_post(location)
-
+            with ai_call(location.id, AgentType.GBP.value, "gbp_post", GENERATION_MODEL) as call:
+                # Call Claude API
+                with upstream_call("anthropic", anthropic_failures()):
+                    message = client.messages.create(
+                        model=GENERATION_MODEL,
+                        max_tokens=1024,
+                        temperature=0.7,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ]
+                    )
+                call.record_response(message)
+
+                # Extract response
+                response_text = message.content[0].text
+
+                # Parse JSON response
+                try:
+                    result = json.loads(response_text)
+                    call.parse_ok = True
+                    logger.info(f"Generated GBP post for {location.business_name}")
+                    return result
+                except json.JSONDecodeError:
+                    logger.error(f"Failed to parse JSON response: {response_text}")
+                    return AIService._generate_mock_gbp_post(location)
+
+        except CircuitOpenError:
+            # Anthropic is down: let the caller defer rather than publish mock content
+            raise
         except Exception as e:
             logger.error(f"Error generating GBP post: {str(e)}")
             return AIService._generate_mock_gbp_post(location)
@@ -156,7 +203,11 @@ Return ONLY a JSON object in this exact format (no markdown, no extra text):
 
         Returns:
             Dict with 'title', 'content', 'meta_description', and 'reasoning'
+
+        Raises:
+            CircuitOpenError: Anthropic's breaker is open (other errors fall back to mock content)
         """
+        client = get_client()
         if not client:
             logger.warning("Anthropic API key not configured, using mock data")
             return AIService._generate_mock_blog_post(location, topic)
@@ -164,28 +215,34 @@ Return ONLY a JSON object in this exact format (no markdown, no extra text):
         try:
             prompt = AIService._build_blog_prompt(location, topic, keywords, word_count)
 
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,  # Longer for blog posts
-                temperature=0.7,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-
-            response_text = message.content[0].text
-
-            try:
-                result = json.loads(response_text)
-                logger.info(f"Generated blog post for {location.business_name}: {topic}")
-                return result
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse JSON response: {response_text}")
-                return AIService._generate_mock_blog_post(location, topic)
-
+            with ai_call(location.id, AgentType.BLOG.value, "blog_post", GENERATION_MODEL) as call:
+                with upstream_call("anthropic", anthropic_failures()):
+                    message = client.messages.create(
+                        model=GENERATION_MODEL,
+                        max_tokens=4096,  # Longer for blog posts
+                        temperature=0.7,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ]
+                    )
+                call.record_response(message)
+
+                response_text = message.content[0].text
+
+                try:
+                    result = json.loads(response_text)
+                    call.parse_ok = True
+                    logger.info(f"Generated blog post for {location.business_name}: {topic}")
+                    return result
+                except json.JSONDecodeError:
+                    logger.error(f"Failed to parse JSON response: {response_text}")
+                    return AIService._generate_mock_blog_post(location, topic)
+
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Error generating blog post: {str(e)}")
             return AIService._generate_mock_blog_post(location, topic)
@@ -257,7 +314,11 @@ Return ONLY a JSON object in this exact format (no markdown):
 
         Returns:
             Dict with 'response' and 'reasoning'
+
+        Raises:
+            CircuitOpenError: Anthropic's breaker is open (other errors fall back to mock content)
         """
+        client = get_client()
         if not client:
             logger.warning("Anthropic API key not configured, using mock data")
             return AIService._generate_mock_review_response(location, review_rating)
@@ -287,18 +348,24 @@ Return ONLY a JSON object:
 }}
 """
 
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=512,
-                temperature=0.8,  # Slightly higher for more natural responses
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            response_text = message.content[0].text
-            result = json.loads(response_text)
-            logger.info(f"Generated review response for {location.business_name}")
-            return result
+            with ai_call(location.id, AgentType.GBP.value, "review_response", GENERATION_MODEL) as call:
+                with upstream_call("anthropic", anthropic_failures()):
+                    message = client.messages.create(
+                        model=GENERATION_MODEL,
+                        max_tokens=512,
+                        temperature=0.8,  # Slightly higher for more natural responses
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                call.record_response(message)
+
+                response_text = message.content[0].text
+                result = json.loads(response_text)
+                call.parse_ok = True
+                logger.info(f"Generated review response for {location.business_name}")
+                return result
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"Error generating review response: {str(e)}")
             return AIService._generate_mock_review_response(location, review_rating)
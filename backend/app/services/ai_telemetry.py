@@ -0,0 +1,239 @@
+"""
+AI call telemetry.
+Every Claude generation records its model, token usage (including prompt
+cache reads and writes), latency, stop reason and whether the response
+parsed as the JSON the prompt asked for, in ai_calls and in Prometheus.
+Cost is estimated from MODEL_PRICING.
+
+Aggregates per location, agent type, operation or model find expensive
+prompts and locations; the peak per-minute rates show what Anthropic rate
+limits need to allow.
+
+Rows are written from their own session, so calls are recorded even when
+the caller's transaction rolls back, and a failed write never fails the
+generation.
+"""
+
+from contextlib import contextmanager
+from sqlalchemy import case, func, text
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import AICall, Location
+from app.services.metrics import observe_ai_call
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens
+MODEL_PRICING = {
+    "claude-sonnet-4-20250514": {"input": 3.00, "output": 15.00, "cache_creation": 3.75, "cache_read": 0.30},
+}
+
+TOKEN_KINDS = ("input", "output", "cache_creation", "cache_read")
+
+GROUP_BY_COLUMNS = {
+    "location": AICall.location_id,
+    "agent_type": AICall.agent_type,
+    "operation": AICall.operation,
+    "model": AICall.model,
+}
+
+
+def estimate_cost(model: str, tokens: Dict[str, int]) -> Optional[float]:
+    """Estimated USD cost of a call, or None for a model without pricing."""
+    pricing = MODEL_PRICING.get(model)
+    if not pricing:
+        return None
+    return sum(tokens.get(kind, 0) * rate for kind, rate in pricing.items()) / 1_000_000
+
+
+class AICallRecorder:
+    """Telemetry for one generation, filled in by the caller"""
+
+    def __init__(self, location_id: Optional[uuid.UUID], agent_type: str, operation: str, model: str):
+        self.location_id = location_id
+        self.agent_type = agent_type
+        self.operation = operation
+        self.model = model
+        self.tokens = dict.fromkeys(TOKEN_KINDS, 0)
+        self.stop_reason: Optional[str] = None
+        self.parse_ok = False
+        self.latency: Optional[float] = None
+        self._start = time.perf_counter()
+
+    def record_response(self, message):
+        """Capture latency, usage and stop reason from an API response."""
+        self.latency = time.perf_counter() - self._start
+        self.model = getattr(message, "model", None) or self.model
+        self.stop_reason = message.stop_reason
+
+        usage = message.usage
+        self.tokens = {
+            "input": usage.input_tokens or 0,
+            "output": usage.output_tokens or 0,
+            "cache_creation": getattr(usage, "cache_creation_input_tokens", None) or 0,
+            "cache_read": getattr(usage, "cache_read_input_tokens", None) or 0,
+        }
+
+
+@contextmanager
+def ai_call(location_id: Optional[uuid.UUID], agent_type: str, operation: str, model: str):
+    """
+    Record one generation. Exceptions raised before record_response are
+    recorded as API errors; later ones (parsing) leave parse_ok False.
+    Exceptions are re-raised.
+
+    Usage:
+        with ai_call(location.id, AgentType.GBP.value, "gbp_post", MODEL) as call:
+            message = client.messages.create(...)
+            call.record_response(message)
+            result = json.loads(message.content[0].text)
+            call.parse_ok = True
+
+    Yields:
+        AICallRecorder
+    """
+    call = AICallRecorder(location_id, agent_type, operation, model)
+    error_class = None
+    try:
+        yield call
+    except Exception as e:
+        if call.latency is None:
+            error_class = type(e).__name__
+        raise
+    finally:
+        _record(call, error_class)
+
+
+def _record(call: AICallRecorder, error_class: Optional[str]):
+    latency = call.latency if call.latency is not None else time.perf_counter() - call._start
+    cost = estimate_cost(call.model, call.tokens) if error_class is None else None
+
+    if error_class:
+        outcome = "error"
+    elif call.parse_ok:
+        outcome = "success"
+    else:
+        outcome = "parse_error"
+    observe_ai_call(call.model, call.agent_type, call.operation, outcome, latency, call.tokens, cost)
+
+    if call.stop_reason == "max_tokens":
+        logger.warning(f"{call.operation} generation for location {call.location_id} hit max_tokens")
+
+    db = SessionLocal()
+    try:
+        db.add(AICall(
+            created_at=datetime.now(timezone.utc),
+            location_id=call.location_id,
+            agent_type=call.agent_type,
+            operation=call.operation,
+            model=call.model,
+            input_tokens=call.tokens["input"],
+            output_tokens=call.tokens["output"],
+            cache_read_tokens=call.tokens["cache_read"],
+            cache_creation_tokens=call.tokens["cache_creation"],
+            cost_usd=cost,
+            latency_seconds=latency,
+            stop_reason=call.stop_reason,
+            parse_ok=call.parse_ok,
+            error_class=error_class
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record AI call telemetry: {str(e)}")
+    finally:
+        db.close()
+
+
+class AITelemetryService:
+    """Aggregates AI call telemetry"""
+
+    @staticmethod
+    def get_usage(db: Session, since: datetime, group_by: str = "location", limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Calls, tokens, cost and latency per group, most expensive first.
+
+        Args:
+            db: Database session
+            since: Only calls made after this time
+            group_by: location, agent_type, operation or model
+            limit: Maximum groups to return
+
+        Returns:
+            List of dicts with "key" (and "name" for locations), "calls",
+            "errors", "parse_failures", token totals per kind, "cost_usd",
+            "avg_latency_seconds" and "p95_latency_seconds"
+        """
+        key = GROUP_BY_COLUMNS[group_by]
+        cost = func.sum(AICall.cost_usd)
+
+        rows = db.query(
+            key,
+            func.count(AICall.id),
+            func.count(AICall.error_class),
+            func.sum(case((AICall.error_class.is_(None) & AICall.parse_ok.is_(False), 1), else_=0)),
+            func.sum(AICall.input_tokens),
+            func.sum(AICall.output_tokens),
+            func.sum(AICall.cache_read_tokens),
+            func.sum(AICall.cache_creation_tokens),
+            cost,
+            func.avg(AICall.latency_seconds),
+            func.percentile_cont(0.95).within_group(AICall.latency_seconds)
+        ).filter(
+            AICall.created_at >= since
+        ).group_by(key).order_by(cost.desc().nullslast()).limit(limit).all()
+
+        names = {}
+        if group_by == "location":
+            location_ids = [row[0] for row in rows if row[0] is not None]
+            if location_ids:
+                names = dict(db.query(Location.id, Location.business_name).filter(Location.id.in_(location_ids)).all())
+
+        usage = []
+        for group, calls, errors, parse_failures, input_tokens, output_tokens, cache_read, cache_creation, total_cost, avg_latency, p95_latency in rows:
+            entry = {
+                "key": str(group) if group is not None else None,
+                "calls": calls,
+                "errors": errors,
+                "parse_failures": int(parse_failures or 0),
+                "input_tokens": int(input_tokens or 0),
+                "output_tokens": int(output_tokens or 0),
+                "cache_read_tokens": int(cache_read or 0),
+                "cache_creation_tokens": int(cache_creation or 0),
+                "cost_usd": float(total_cost) if total_cost is not None else None,
+                "avg_latency_seconds": avg_latency,
+                "p95_latency_seconds": p95_latency,
+            }
+            if group_by == "location":
+                entry["name"] = names.get(group)
+            usage.append(entry)
+        return usage
+
+    @staticmethod
+    def get_peak_rates(db: Session, since: datetime) -> Dict[str, int]:
+        """
+        Busiest minute for requests, input tokens and output tokens, each
+        taken independently - the figures Anthropic rate limits are set in.
+
+        Args:
+            db: Database session
+            since: Only calls made after this time
+
+        Returns:
+            Dict with "requests", "input_tokens" and "output_tokens" per minute
+        """
+        row = db.execute(text("""
+            SELECT COALESCE(MAX(requests), 0), COALESCE(MAX(input_tokens), 0), COALESCE(MAX(output_tokens), 0)
+            FROM (
+                SELECT COUNT(*) AS requests, SUM(input_tokens) AS input_tokens, SUM(output_tokens) AS output_tokens
+                FROM ai_calls
+                WHERE created_at >= :since
+                GROUP BY date_trunc('minute', created_at)
+            ) AS minutes
+        """), {"since": since}).one()
+        return {"requests": int(row[0]), "input_tokens": int(row[1]), "output_tokens": int(row[2])}
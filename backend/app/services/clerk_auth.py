@@ -4,12 +4,12 @@ Handles JWT token verification and user authentication with Clerk.
 """
 
 import jwt
-import requests
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from app.models import User
 from app.config import settings
+from app.services.http_client import request
 import logging
 
 logger = logging.getLogger(__name__)
@@ -57,7 +57,7 @@ class ClerkAuth:
             jwks_url = f"https://{clerk_frontend_api}/.well-known/jwks.json"
 
             logger.info(f"Fetching JWKS from: {jwks_url}")
-            response = requests.get(jwks_url, timeout=10)
+            response = request("clerk", "GET", jwks_url)
             response.raise_for_status()
 
             ClerkAuth._jwks_cache = response.json()
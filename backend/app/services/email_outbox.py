@@ -0,0 +1,418 @@
+"""
+Transactional email outbox.
+Callers add an outbox row in the same transaction as the data the email
+is about, so an email is queued if and only if that data is committed.
+A background sender claims due messages with SELECT ... FOR UPDATE SKIP
+LOCKED, sends them in provider batches (up to 100 emails per request),
+several batches concurrently, and retries failures with backoff.
+
+Each batch carries an idempotency key derived from its messages' keys and
+recorded on the messages before sending. Messages reclaimed after a crash
+are regrouped by that key, so the repeated request is recognised by the
+provider and not delivered twice.
+
+While the resend circuit breaker is open the sender stops claiming, and a
+batch that hits the open breaker is put back without using an attempt.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import EmailOutbox, EmailKind, EmailOutboxStatus, Report
+from app.services.email_service import RESEND_BATCH_LIMIT, build_report_email, build_welcome_email, send_batch
+from app.services.http_client import CircuitOpenError, get_breaker
+from app.services.job_queue import compute_backoff
+from app.services.report_archive import ReportArchiveService
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import logging
+import os
+import socket
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxService:
+    """Service for queueing and tracking outbox emails."""
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        kind: EmailKind,
+        idempotency_key: str,
+        payload: Dict[str, Any],
+        report_id: Optional[uuid.UUID] = None
+    ):
+        """
+        Queue an email in the caller's transaction. Does not commit.
+        Queueing the same idempotency key twice is a no-op.
+
+        Args:
+            db: Database session
+            kind: Email template
+            idempotency_key: Unique key for this logical email
+            payload: Template arguments
+            report_id: Report the email belongs to, if any
+        """
+        db.execute(
+            pg_insert(EmailOutbox).values(
+                id=uuid.uuid4(),
+                kind=kind,
+                status=EmailOutboxStatus.PENDING,
+                idempotency_key=idempotency_key,
+                payload=payload,
+                report_id=report_id,
+                attempts=0,
+                max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+                next_attempt_at=datetime.now(timezone.utc)
+            ).on_conflict_do_nothing(index_elements=[EmailOutbox.idempotency_key])
+        )
+
+    @staticmethod
+    def enqueue_report_email(db: Session, report: Report, business_name: str):
+        """
+        Queue the email for a report. Does not commit.
+
+        Args:
+            db: Database session
+            report: Report with email_recipients set (must already have an id)
+            business_name: Business name for personalization
+        """
+        EmailOutboxService.enqueue(
+            db,
+            kind=EmailKind.REPORT,
+            idempotency_key=f"report:{report.id}",
+            payload={
+                "recipient_emails": report.email_recipients,
+                "business_name": business_name,
+                "report_type": report.report_type.value,
+                "report_id": str(report.id)
+            },
+            report_id=report.id
+        )
+
+    @staticmethod
+    def enqueue_welcome_email(db: Session, user_email: str, business_name: str, user_id: str, location_id: str):
+        """Queue the onboarding welcome email. Does not commit."""
+        EmailOutboxService.enqueue(
+            db,
+            kind=EmailKind.WELCOME,
+            idempotency_key=f"welcome:{user_id}:{location_id}",
+            payload={
+                "user_email": user_email,
+                "business_name": business_name,
+                "user_id": user_id,
+                "location_id": location_id
+            }
+        )
+
+    @staticmethod
+    def claim_batch(
+        db: Session,
+        sender_id: str,
+        batch_size: int,
+        lease_seconds: int
+    ) -> List[Tuple[uuid.UUID, Optional[str]]]:
+        """
+        Lease up to batch_size due messages to this sender.
+        Due messages are PENDING messages whose next_attempt_at has passed,
+        plus SENDING messages whose lease expired.
+
+        Returns:
+            Claimed (message id, previous batch key) pairs
+        """
+        now = datetime.now(timezone.utc)
+
+        messages = db.query(EmailOutbox).filter(
+            or_(
+                and_(EmailOutbox.status == EmailOutboxStatus.PENDING, EmailOutbox.next_attempt_at <= now),
+                and_(EmailOutbox.status == EmailOutboxStatus.SENDING, EmailOutbox.locked_until < now)
+            )
+        ).order_by(EmailOutbox.next_attempt_at).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for message in messages:
+            message.status = EmailOutboxStatus.SENDING
+            message.attempts += 1
+            message.locked_by = sender_id
+            message.locked_until = now + timedelta(seconds=lease_seconds)
+            claimed.append((message.id, message.batch_key))
+
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def mark_sent(db: Session, message: EmailOutbox, provider_message_id: Optional[str] = None, commit: bool = True):
+        """Record delivery, and stamp the report's email_sent in the same transaction."""
+        now = datetime.now(timezone.utc)
+        message.status = EmailOutboxStatus.SENT
+        message.sent_at = now
+        message.provider_message_id = provider_message_id
+        message.last_error = None
+        message.locked_by = None
+        message.locked_until = None
+
+        if message.report_id:
+            db.query(Report).filter(
+                Report.id == message.report_id,
+                Report.email_sent.is_(None)
+            ).update({Report.email_sent: datetime.utcnow()}, synchronize_session=False)
+
+        if commit:
+            db.commit()
+
+    @staticmethod
+    def mark_failed(db: Session, message: EmailOutbox, error: str, commit: bool = True):
+        """Schedule a retry with backoff, or dead-letter the message."""
+        message.last_error = error
+        message.locked_by = None
+        message.locked_until = None
+
+        if message.attempts >= message.max_attempts:
+            message.status = EmailOutboxStatus.DEAD
+            logger.error(f"Dead-lettered {message.kind.value} email {message.id} after {message.attempts} attempts: {error}")
+        else:
+            message.status = EmailOutboxStatus.PENDING
+            message.next_attempt_at = datetime.now(timezone.utc) + compute_backoff(message.attempts)
+            logger.warning(f"Retrying {message.kind.value} email {message.id} at {message.next_attempt_at} (attempt {message.attempts}/{message.max_attempts}): {error}")
+
+        if commit:
+            db.commit()
+
+    @staticmethod
+    def defer(db: Session, message: EmailOutbox, delay: timedelta, reason: str, commit: bool = True):
+        """Put a claimed message back for later without counting the attempt (provider unavailable)."""
+        message.status = EmailOutboxStatus.PENDING
+        message.attempts -= 1
+        message.next_attempt_at = datetime.now(timezone.utc) + delay
+        message.last_error = reason
+        message.locked_by = None
+        message.locked_until = None
+
+        if commit:
+            db.commit()
+
+    @staticmethod
+    def render(db: Session, message: EmailOutbox) -> Optional[dict]:
+        """
+        Build the provider message for an outbox row.
+
+        Returns:
+            Message dict, or None if the email was already sent
+        """
+        payload = message.payload or {}
+
+        if message.kind == EmailKind.WELCOME:
+            return build_welcome_email(**payload)
+
+        if message.kind == EmailKind.REPORT:
+            report = db.query(Report).filter(Report.id == message.report_id).first() if message.report_id else None
+            if not report:
+                raise ValueError(f"Report {payload.get('report_id')} no longer exists")
+            if report.email_sent is not None:
+                logger.info(f"Report {report.id} email already sent, skipping")
+                return None
+
+            return build_report_email(
+                recipient_emails=payload["recipient_emails"],
+                business_name=payload["business_name"],
+                report_type=payload["report_type"],
+                report_data=ReportArchiveService.get_data(db, report),
+                report_id=payload["report_id"]
+            )
+
+        raise ValueError(f"Unknown email kind {message.kind}")
+
+
+def group_into_batches(claimed: List[Tuple[uuid.UUID, Optional[str]]]) -> List[List[uuid.UUID]]:
+    """
+    Split claimed messages into provider batches.
+    Messages that were already sent in a batch (and reclaimed because the
+    outcome was never recorded) are kept together so the retry reuses the
+    same composition and idempotency key.
+    """
+    previous: Dict[str, List[uuid.UUID]] = {}
+    fresh: List[uuid.UUID] = []
+    for message_id, batch_key in claimed:
+        if batch_key:
+            previous.setdefault(batch_key, []).append(message_id)
+        else:
+            fresh.append(message_id)
+
+    batches = list(previous.values())
+    for start in range(0, len(fresh), RESEND_BATCH_LIMIT):
+        batches.append(fresh[start:start + RESEND_BATCH_LIMIT])
+    return batches
+
+
+def compute_batch_key(messages: List[EmailOutbox]) -> str:
+    """Idempotency key for a batch - the same messages always get the same key."""
+    keys = "\n".join(sorted(message.idempotency_key for message in messages))
+    return f"batch:{hashlib.sha256(keys.encode()).hexdigest()}"
+
+
+class OutboxSender:
+    """
+    Background thread that drains the email outbox.
+    Claims a batch, sends it on a thread pool, and records each outcome.
+    """
+
+    def __init__(
+        self,
+        sender_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None
+    ):
+        self.sender_id = sender_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency or settings.EMAIL_OUTBOX_CONCURRENCY
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.EMAIL_OUTBOX_POLL_SECONDS
+        self.lease_seconds = lease_seconds or settings.EMAIL_OUTBOX_LEASE_SECONDS
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self):
+        """Start draining the outbox in a background thread."""
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="email-outbox")
+        self._thread = threading.Thread(target=self._run, name=f"email-outbox-{self.sender_id}", daemon=True)
+        self._thread.start()
+        logger.info(f"Email outbox sender {self.sender_id} started ({self.concurrency} concurrent)")
+
+    def stop(self):
+        """Stop polling; in-flight sends are allowed to finish."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.lease_seconds)
+        if self._executor:
+            self._executor.shutdown(wait=True)
+        logger.info(f"Email outbox sender {self.sender_id} stopped")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                logger.error(f"Email outbox sender {self.sender_id} error: {str(e)}")
+                claimed = 0
+
+            # Keep draining while there is work; poll when the outbox is empty
+            if claimed < self.batch_size:
+                self._stop_event.wait(self.poll_interval)
+
+    def run_once(self) -> int:
+        """
+        Claim due messages and send them as concurrent provider batches.
+
+        Returns:
+            Number of messages claimed
+        """
+        if get_breaker("resend").retry_in() > 0:
+            return 0  # Resend is down; nothing to claim until its breaker lets a call through
+
+        db = SessionLocal()
+        try:
+            claimed = EmailOutboxService.claim_batch(db, self.sender_id, self.batch_size, self.lease_seconds)
+        finally:
+            db.close()
+
+        if claimed:
+            wait([self._executor.submit(self._send_batch, batch) for batch in group_into_batches(claimed)])
+
+        return len(claimed)
+
+    def _send_batch(self, message_ids: List[uuid.UUID]):
+        """Send one provider batch in its own session and record each message's outcome."""
+        db = SessionLocal()
+        try:
+            messages = db.query(EmailOutbox).filter(
+                EmailOutbox.id.in_(message_ids),
+                EmailOutbox.locked_by == self.sender_id
+            ).all()
+
+            if len(messages) < len(message_ids):
+                logger.warning(f"{len(message_ids) - len(messages)} emails lost their lease before sending")
+
+            # Render first; a message that can't be rendered fails on its own
+            to_send: List[Tuple[EmailOutbox, dict]] = []
+            for message in messages:
+                try:
+                    rendered = EmailOutboxService.render(db, message)
+                except Exception as e:
+                    EmailOutboxService.mark_failed(db, message, f"{type(e).__name__}: {str(e)}", commit=False)
+                    continue
+
+                if rendered is None:
+                    EmailOutboxService.mark_sent(db, message, commit=False)
+                else:
+                    to_send.append((message, rendered))
+
+            if not to_send:
+                db.commit()
+                return
+
+            # Record the batch key before sending so a reclaimed batch is resent as-is
+            batch_key = compute_batch_key([message for message, _ in to_send])
+            for message, _ in to_send:
+                message.batch_key = batch_key
+            db.commit()
+
+            try:
+                results = send_batch([rendered for _, rendered in to_send], idempotency_key=batch_key)
+            except CircuitOpenError as e:
+                db.rollback()
+                for message, _ in to_send:
+                    EmailOutboxService.defer(db, message, timedelta(seconds=e.retry_in), str(e), commit=False)
+                db.commit()
+                return
+            except Exception as e:
+                db.rollback()
+                error = f"{type(e).__name__}: {str(e)}"
+                for message, _ in to_send:
+                    EmailOutboxService.mark_failed(db, message, error, commit=False)
+                db.commit()
+                return
+
+            for (message, _), result in zip(to_send, results):
+                if result["error"]:
+                    # Rejected messages get a fresh batch on retry
+                    message.batch_key = None
+                    EmailOutboxService.mark_failed(db, message, result["error"], commit=False)
+                else:
+                    EmailOutboxService.mark_sent(db, message, result["id"], commit=False)
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to record outcome of email batch {message_ids}: {str(e)}")
+
+        finally:
+            db.close()
+
+
+_sender: Optional[OutboxSender] = None
+
+
+def start_outbox_sender():
+    """Start the email outbox sender for this process."""
+    global _sender
+    if _sender is None:
+        _sender = OutboxSender()
+        _sender.start()
+
+
+def stop_outbox_sender():
+    """Stop the email outbox sender for this process."""
+    global _sender
+    if _sender is not None:
+        _sender.stop()
+        _sender = None
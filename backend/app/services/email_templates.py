@@ -0,0 +1,697 @@
+"""
+Email templates.
+Templates are split once at import into the static fragments around their
+placeholders. Values known up front (CSS, card icons and labels, colors,
+"week" / "month") are substituted first, one variant each, and non-ASCII
+characters become character references so the fragments stay ASCII
+(joining them then copies bytes instead of widening every character to
+fit one emoji). A render formats the per-email values and joins them with
+the fragments once. Values are inserted as-is - render functions escape
+untrusted text with html.escape.
+"""
+
+from typing import List, Tuple
+from html import escape
+import re
+import string
+
+_PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+
+def _fragments(text: str, names: Tuple[str, ...], **constants: str) -> Tuple[str, ...]:
+    """
+    Substitute constants into a string.Template and split what's left into
+    the static fragments around its ${placeholders}.
+
+    Args:
+        text: Template text
+        names: Remaining placeholders, in the order they appear
+        **constants: Values known at import
+
+    Returns:
+        len(names) + 1 fragments; a render joins them with the values in between
+    """
+    text = string.Template(text).safe_substitute(constants)
+    # Emoji and arrows as character references keep the markup ASCII
+    text = text.encode("ascii", "xmlcharrefreplace").decode("ascii")
+    parts = _PLACEHOLDER.split(text)
+    if tuple(parts[1::2]) != names:
+        raise ValueError(f"Template placeholders {parts[1::2]} don't match {list(names)}")
+    return tuple(parts[0::2])
+
+
+def _minify_css(css: str) -> str:
+    """Collapse whitespace in static CSS once, at import."""
+    return re.sub(r"\s*([{};:,])\s*", r"\1", re.sub(r"\s+", " ", css)).strip()
+
+
+# ---------------------------------------------------------------------------
+# Welcome email
+# ---------------------------------------------------------------------------
+
+WELCOME_CSS = _minify_css("""
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Helvetica, Arial, sans-serif;
+    line-height: 1.6;
+    color: #1A1D2E;
+    background: linear-gradient(135deg, #f5f7fa 0%, #e8eef3 100%);
+    margin: 0;
+    padding: 20px;
+}
+.container {
+    max-width: 600px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 16px;
+    overflow: hidden;
+    box-shadow: 0 10px 40px rgba(0, 0, 0, 0.12);
+}
+.header {
+    background: linear-gradient(135deg, #FF5810 0%, #FF3D00 100%);
+    color: white;
+    padding: 50px 40px;
+    text-align: center;
+    position: relative;
+}
+.header::after {
+    content: '';
+    position: absolute;
+    bottom: 0;
+    left: 0;
+    right: 0;
+    height: 4px;
+    background: linear-gradient(90deg, rgba(255,255,255,0.3) 0%, rgba(255,255,255,0) 100%);
+}
+.header h1 {
+    margin: 0 0 10px 0;
+    font-size: 36px;
+    font-weight: 700;
+    letter-spacing: -0.5px;
+}
+.header p {
+    margin: 0;
+    font-size: 16px;
+    opacity: 0.95;
+    font-weight: 400;
+}
+.content {
+    padding: 45px 40px;
+}
+.greeting {
+    font-size: 24px;
+    font-weight: 700;
+    margin-bottom: 15px;
+    color: #1A1D2E;
+    line-height: 1.3;
+}
+.intro {
+    font-size: 16px;
+    color: #4B5563;
+    margin-bottom: 35px;
+    line-height: 1.7;
+}
+.section-title {
+    font-size: 18px;
+    font-weight: 700;
+    color: #1A1D2E;
+    margin: 35px 0 20px 0;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+}
+.section-title .emoji {
+    font-size: 24px;
+}
+.agent-grid {
+    display: grid;
+    gap: 16px;
+    margin: 25px 0;
+}
+.agent-card {
+    background: linear-gradient(135deg, #f9fafb 0%, #f3f4f6 100%);
+    border: 2px solid #e5e7eb;
+    border-radius: 12px;
+    padding: 20px;
+    transition: all 0.3s ease;
+    position: relative;
+    overflow: hidden;
+}
+.agent-card::before {
+    content: '';
+    position: absolute;
+    left: 0;
+    top: 0;
+    bottom: 0;
+    width: 4px;
+    background: linear-gradient(180deg, #FF5810 0%, #FF3D00 100%);
+}
+.agent-card-header {
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+    margin-bottom: 8px;
+}
+.agent-name {
+    font-size: 16px;
+    font-weight: 700;
+    color: #1A1D2E;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+}
+.agent-icon {
+    font-size: 20px;
+}
+.agent-description {
+    font-size: 14px;
+    color: #6B7280;
+    margin: 0;
+    line-height: 1.5;
+    padding-left: 30px;
+}
+.badge {
+    display: inline-block;
+    background: #1A1D2E;
+    color: white;
+    padding: 4px 10px;
+    border-radius: 6px;
+    font-size: 11px;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.8px;
+}
+.cta-section {
+    background: linear-gradient(135deg, #fff4ed 0%, #ffe8d6 100%);
+    border: 3px solid #FF5810;
+    border-radius: 12px;
+    padding: 30px;
+    margin: 35px 0;
+    text-align: center;
+}
+.cta-section h3 {
+    margin: 0 0 10px 0;
+    font-size: 20px;
+    color: #1A1D2E;
+    font-weight: 700;
+}
+.cta-section p {
+    margin: 0 0 20px 0;
+    color: #6B7280;
+    font-size: 15px;
+}
+.cta-button {
+    display: inline-block;
+    background: linear-gradient(135deg, #FF5810 0%, #FF3D00 100%);
+    color: white;
+    padding: 16px 40px;
+    text-decoration: none;
+    border-radius: 10px;
+    font-weight: 700;
+    font-size: 16px;
+    box-shadow: 0 4px 15px rgba(255, 88, 16, 0.3);
+    transition: all 0.3s ease;
+    letter-spacing: 0.3px;
+}
+.steps-list {
+    background: white;
+    border: 2px solid #e5e7eb;
+    border-radius: 12px;
+    padding: 25px 25px 25px 45px;
+    margin: 25px 0;
+}
+.steps-list ol {
+    margin: 0;
+    padding: 0;
+    counter-reset: step-counter;
+    list-style: none;
+}
+.steps-list li {
+    margin: 18px 0;
+    color: #1A1D2E;
+    font-size: 15px;
+    line-height: 1.6;
+    position: relative;
+    padding-left: 10px;
+    counter-increment: step-counter;
+}
+.steps-list li::before {
+    content: counter(step-counter);
+    position: absolute;
+    left: -35px;
+    top: 0;
+    background: linear-gradient(135deg, #FF5810 0%, #FF3D00 100%);
+    color: white;
+    width: 26px;
+    height: 26px;
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-weight: 700;
+    font-size: 13px;
+}
+.steps-list strong {
+    color: #1A1D2E;
+    font-weight: 700;
+}
+.help-section {
+    margin-top: 40px;
+    padding-top: 30px;
+    border-top: 2px solid #e5e7eb;
+    text-align: center;
+}
+.help-section h4 {
+    margin: 0 0 8px 0;
+    font-size: 16px;
+    color: #1A1D2E;
+    font-weight: 700;
+}
+.help-section p {
+    margin: 5px 0;
+    color: #6B7280;
+    font-size: 14px;
+    line-height: 1.6;
+}
+.footer {
+    background: linear-gradient(135deg, #1A1D2E 0%, #2d3748 100%);
+    padding: 35px 40px;
+    text-align: center;
+    color: #9CA3AF;
+}
+.footer-logo {
+    font-size: 22px;
+    font-weight: 800;
+    color: white;
+    margin-bottom: 8px;
+    letter-spacing: -0.5px;
+}
+.footer-tagline {
+    font-size: 13px;
+    color: #9CA3AF;
+    margin-bottom: 20px;
+}
+.footer-ids {
+    font-size: 11px;
+    color: #6B7280;
+    margin-top: 20px;
+    padding-top: 20px;
+    border-top: 1px solid #374151;
+    font-family: 'Courier New', monospace;
+}
+@media only screen and (max-width: 600px) {
+    .content {
+        padding: 30px 25px;
+    }
+    .header {
+        padding: 40px 25px;
+    }
+    .agent-card {
+        padding: 16px;
+    }
+    .cta-section {
+        padding: 25px 20px;
+    }
+}
+""")
+
+WELCOME_EMAIL = _fragments("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>${css}</style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Welcome to Sponte AI</h1>
+            <p>Your autonomous local SEO platform</p>
+        </div>
+
+        <div class="content">
+            <p class="greeting">Hey ${business_name}! 👋</p>
+
+            <p class="intro">
+                Thanks for joining Sponte AI! Your account is live and your AI agents are ready to supercharge your local SEO.
+                Here's what we've set up for you:
+            </p>
+
+            <div class="section-title">
+                <span class="emoji">🤖</span>
+                <span>Your AI Agent Team</span>
+            </div>
+
+            <div class="agent-grid">
+                <div class="agent-card">
+                    <div class="agent-card-header">
+                        <div class="agent-name">
+                            <span class="agent-icon">🗺️</span>
+                            <span>GBP Agent</span>
+                        </div>
+                        <span class="badge">Draft</span>
+                    </div>
+                    <p class="agent-description">Managing your Google Business Profile with posts, updates, and optimizations</p>
+                </div>
+
+                <div class="agent-card">
+                    <div class="agent-card-header">
+                        <div class="agent-name">
+                            <span class="agent-icon">📍</span>
+                            <span>NAP Agent</span>
+                        </div>
+                        <span class="badge">Draft</span>
+                    </div>
+                    <p class="agent-description">Ensuring consistent listings across 50+ directories and platforms</p>
+                </div>
+
+                <div class="agent-card">
+                    <div class="agent-card-header">
+                        <div class="agent-name">
+                            <span class="agent-icon">🔍</span>
+                            <span>Keyword Agent</span>
+                        </div>
+                        <span class="badge">Draft</span>
+                    </div>
+                    <p class="agent-description">Researching high-value local search opportunities in your market</p>
+                </div>
+
+                <div class="agent-card">
+                    <div class="agent-card-header">
+                        <div class="agent-name">
+                            <span class="agent-icon">✍️</span>
+                            <span>Blog Agent</span>
+                        </div>
+                        <span class="badge">Draft</span>
+                    </div>
+                    <p class="agent-description">Creating SEO-optimized blog content tailored to your audience</p>
+                </div>
+
+                <div class="agent-card">
+                    <div class="agent-card-header">
+                        <div class="agent-name">
+                            <span class="agent-icon">📱</span>
+                            <span>Social Agent</span>
+                        </div>
+                        <span class="badge">Draft</span>
+                    </div>
+                    <p class="agent-description">Planning engaging social media posts to boost your online presence</p>
+                </div>
+
+                <div class="agent-card">
+                    <div class="agent-card-header">
+                        <div class="agent-name">
+                            <span class="agent-icon">📊</span>
+                            <span>Reporting Agent</span>
+                        </div>
+                        <span class="badge">Draft</span>
+                    </div>
+                    <p class="agent-description">Tracking performance metrics and delivering actionable insights</p>
+                </div>
+            </div>
+
+            <div class="cta-section">
+                <h3>Ready to Get Started?</h3>
+                <p>Complete your setup in 5 minutes and activate your agents</p>
+                <a href="http://localhost:3000/dashboard/setup/${user_id}" class="cta-button">
+                    Complete Setup →
+                </a>
+            </div>
+
+            <div class="section-title">
+                <span class="emoji">✅</span>
+                <span>Next Steps</span>
+            </div>
+
+            <div class="steps-list">
+                <ol>
+                    <li><strong>Connect Google Business Profile</strong> — Authorize the GBP Agent to manage your listing</li>
+                    <li><strong>Link your website</strong> — Enable content publishing and SEO tracking</li>
+                    <li><strong>Review agent drafts</strong> — Approve or edit AI-generated content before it goes live</li>
+                    <li><strong>Upgrade to Autopilot</strong> (optional) — Let agents publish automatically</li>
+                </ol>
+            </div>
+
+            <div class="help-section">
+                <h4>Need Help?</h4>
+                <p>Our team is here to help you succeed.</p>
+                <p>📧 <strong>support@sponteai.com</strong> • We typically respond within 2 hours</p>
+            </div>
+        </div>
+
+        <div class="footer">
+            <div class="footer-logo">Sponte AI</div>
+            <div class="footer-tagline">Autonomous Local SEO</div>
+            <div class="footer-ids">
+                User: ${user_id}<br/>
+                Location: ${location_id}
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+""", ("business_name", "user_id", "user_id", "location_id"), css=WELCOME_CSS)
+
+
+def render_welcome_email(business_name: str, user_id: str, location_id: str) -> str:
+    """Render the welcome email."""
+    user_id = escape(user_id)
+    email = WELCOME_EMAIL
+    return "".join((email[0], escape(business_name), email[1], user_id, email[2], user_id, email[3], escape(location_id), email[4]))
+
+
+# ---------------------------------------------------------------------------
+# Report email
+# ---------------------------------------------------------------------------
+
+METRIC_CARD_TEMPLATE = """
+<td style="width: 25%; padding: 20px; background: white; border: 2px solid #e5e7eb; border-radius: 12px;">
+    <div style="text-align: center; margin-bottom: 10px; font-size: 32px;">${icon}</div>
+    <div style="text-align: center; color: #6B7280; font-size: 12px; font-weight: 700; text-transform: uppercase; margin-bottom: 12px;">
+        ${label}
+    </div>
+    <div style="text-align: center;">
+        <div style="font-size: 36px; font-weight: 700; color: #1A1D2E; margin-bottom: 8px;">
+            ${current}
+        </div>
+        <div style="color: ${color}; font-weight: 700; font-size: 14px;">
+            ${arrow} ${change}%
+        </div>
+    </div>
+</td>
+"""
+
+INSIGHT_ITEM_TEMPLATE = """
+<div style="margin: 12px 0; padding-left: 25px; position: relative;">
+    <span style="position: absolute; left: 0; color: #10B981; font-weight: 700;">✓</span>
+    <span style="color: #4B5563; font-size: 14px; line-height: 1.6;">${text}</span>
+</div>
+"""
+
+OPPORTUNITY_ITEM_TEMPLATE = """
+<div style="margin: 12px 0; padding-left: 25px; position: relative;">
+    <span style="position: absolute; left: 0; color: #FF5810; font-weight: 700;">💡</span>
+    <span style="color: #4B5563; font-size: 14px; line-height: 1.6;">${text}</span>
+</div>
+"""
+
+REVIEWS_SECTION_TEMPLATE = """
+<div style="background: linear-gradient(135deg, #fff4ed 0%, #ffe8d6 100%); border: 2px solid #FF5810; border-radius: 12px; padding: 25px; margin-bottom: 35px;">
+    <div style="text-align: center;">
+        <div style="font-size: 32px; margin-bottom: 10px;">⭐</div>
+        <div style="font-size: 40px; font-weight: 700; color: #1A1D2E; margin-bottom: 5px;">
+            ${avg_rating}
+        </div>
+        <div style="color: #6B7280; font-size: 14px; margin-bottom: 10px;">
+            Average Rating • ${count} reviews
+        </div>
+        <div style="color: #10B981; font-weight: 700; font-size: 16px;">
+            +${new_reviews} new this ${period_noun}
+        </div>
+    </div>
+</div>
+"""
+
+LIST_SECTION_TEMPLATE = """
+<h2 style="font-size: 18px; font-weight: 700; color: #1A1D2E; margin: ${margin_top} 0 15px 0; display: flex; align-items: center; gap: 8px;">
+    <span style="font-size: 24px;">${icon}</span>
+    <span>${title}</span>
+</h2>
+<div style="background: #f9fafb; border: 2px solid #e5e7eb; border-radius: 12px; padding: 20px;">
+    ${items}
+</div>
+"""
+
+REPORT_EMAIL_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Helvetica, Arial, sans-serif; line-height: 1.6; color: #1A1D2E; background: linear-gradient(135deg, #f5f7fa 0%, #e8eef3 100%); margin: 0; padding: 20px;">
+    <div style="max-width: 600px; margin: 0 auto; background: white; border-radius: 16px; overflow: hidden; box-shadow: 0 10px 40px rgba(0, 0, 0, 0.12);">
+
+        <!-- Header -->
+        <div style="background: linear-gradient(135deg, #FF5810 0%, #FF3D00 100%); color: white; padding: 40px; text-align: center;">
+            <div style="font-size: 12px; font-weight: 700; text-transform: uppercase; letter-spacing: 1.5px; opacity: 0.9; margin-bottom: 8px;">
+                ${report_label} REPORT
+            </div>
+            <h1 style="margin: 0 0 8px 0; font-size: 28px; font-weight: 700; letter-spacing: -0.5px;">
+                ${business_name}
+            </h1>
+            <p style="margin: 0; font-size: 15px; opacity: 0.95;">
+                ${period}
+            </p>
+        </div>
+
+        <!-- Content -->
+        <div style="padding: 35px;">
+
+            <!-- Greeting -->
+            <p style="font-size: 16px; color: #4B5563; margin: 0 0 30px 0;">
+                Here's how your business performed this ${period_noun}.
+                Your AI agents have been working hard to grow your local presence! 🚀
+            </p>
+
+            <!-- Key Metrics -->
+            <h2 style="font-size: 20px; font-weight: 700; color: #1A1D2E; margin: 0 0 20px 0;">
+                📊 Key Metrics
+            </h2>
+
+            <table cellpadding="0" cellspacing="8" style="width: 100%; margin-bottom: 35px;">
+                <tr>
+                    ${metrics}
+                </tr>
+            </table>
+
+            <!-- Reviews (if available) -->
+            ${reviews}
+
+            <!-- Insights -->
+            ${insights}
+
+            <!-- Opportunities Identified -->
+            ${opportunities}
+
+            <!-- CTA Button -->
+            <div style="text-align: center; margin: 35px 0 10px 0;">
+                <a href="http://localhost:3000/dashboard/reports/${report_id}"
+                   style="display: inline-block; background: linear-gradient(135deg, #FF5810 0%, #FF3D00 100%); color: white; padding: 16px 40px; text-decoration: none; border-radius: 10px; font-weight: 700; font-size: 16px; box-shadow: 0 4px 15px rgba(255, 88, 16, 0.3);">
+                    View Full Report →
+                </a>
+            </div>
+
+            <!-- Footer Note -->
+            <div style="margin-top: 35px; padding-top: 25px; border-top: 2px solid #e5e7eb; text-align: center;">
+                <p style="margin: 0; color: #6B7280; font-size: 13px; line-height: 1.6;">
+                    Your AI agents are working 24/7 to improve your local SEO.<br/>
+                    <a href="http://localhost:3000/dashboard" style="color: #FF5810; text-decoration: none; font-weight: 600;">Visit Dashboard</a> to manage your agents.
+                </p>
+            </div>
+        </div>
+
+        <!-- Footer -->
+        <div style="background: linear-gradient(135deg, #1A1D2E 0%, #2d3748 100%); padding: 30px; text-align: center; color: #9CA3AF;">
+            <div style="font-size: 20px; font-weight: 800; color: white; margin-bottom: 6px;">
+                Sponte AI
+            </div>
+            <div style="font-size: 12px; color: #9CA3AF;">
+                Autonomous Local SEO • Every Monday
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+POSITIVE = ('#10B981', '↑')
+NEGATIVE = ('#EF4444', '↓')
+
+# (key, fragments when change >= 0, fragments when it's negative) per metric card, in display order
+METRIC_CARDS = [
+    (key, *(
+        _fragments(METRIC_CARD_TEMPLATE, ("current", "change"), icon=icon, label=label, color=color, arrow=arrow)
+        for color, arrow in (POSITIVE, NEGATIVE)
+    ))
+    for key, icon, label in (
+        ('calls', '📞', 'Calls'),
+        ('gbpViews', '👀', 'GBP Views'),
+        ('directionRequests', '🧭', 'Directions'),
+        ('websiteClicks', '🖱️', 'Website Clicks'),
+    )
+]
+
+INSIGHT_ITEM = _fragments(INSIGHT_ITEM_TEMPLATE, ("text",))
+OPPORTUNITY_ITEM = _fragments(OPPORTUNITY_ITEM_TEMPLATE, ("text",))
+INSIGHTS_SECTION = _fragments(LIST_SECTION_TEMPLATE, ("items",), margin_top="35px", icon="💡", title="Key Insights")
+OPPORTUNITIES_SECTION = _fragments(
+    LIST_SECTION_TEMPLATE, ("items",), margin_top="25px", icon="🔍", title="Opportunities Identified"
+)
+
+# Per period noun ("week" / "month")
+REVIEWS_SECTION = {
+    noun: _fragments(REVIEWS_SECTION_TEMPLATE, ("avg_rating", "count", "new_reviews"), period_noun=noun)
+    for noun in ('week', 'month')
+}
+REPORT_EMAIL = {
+    noun: _fragments(
+        REPORT_EMAIL_TEMPLATE,
+        ("report_label", "business_name", "period", "metrics", "reviews", "insights", "opportunities", "report_id"),
+        period_noun=noun
+    )
+    for noun in ('week', 'month')
+}
+
+
+def render_report_email(business_name: str, report_type: str, report_data: dict, report_id: str) -> str:
+    """Render a weekly/monthly report email."""
+    metrics = report_data.get('metrics', {})
+    insights = report_data.get('insights', [])
+    opportunities = report_data.get('opportunities', [])
+    reviews = metrics.get('reviews')
+    period_noun = 'week' if report_type == 'weekly' else 'month'
+
+    # Every fragment and value goes into one list and one join, so each character is copied once
+    email = REPORT_EMAIL[period_noun]
+    parts = [
+        email[0], escape(report_type.upper()),
+        email[1], escape(business_name),
+        email[2], escape(report_data.get('period', '')),
+        email[3]
+    ]
+
+    for key, positive, negative in METRIC_CARDS:
+        metric_data = metrics.get(key)
+        if metric_data:
+            change = metric_data.get('change', 0)
+            card = positive if change >= 0 else negative
+            parts += (card[0], f"{metric_data.get('current', 0):,}", card[1], f"{abs(change):.1f}", card[2])
+    parts.append(email[4])
+
+    if reviews:
+        section = REVIEWS_SECTION[period_noun]
+        parts += (
+            section[0], escape(str(reviews.get('avgRating', 0))),
+            section[1], escape(str(reviews.get('count', 0))),
+            section[2], escape(str(reviews.get('newReviews', 0))),
+            section[3]
+        )
+    parts.append(email[5])
+
+    if insights:
+        _add_list(parts, INSIGHTS_SECTION, INSIGHT_ITEM, insights[:4])  # Show top 4 insights
+    parts.append(email[6])
+
+    if opportunities:
+        _add_list(parts, OPPORTUNITIES_SECTION, OPPORTUNITY_ITEM, opportunities[:4])  # Show top 4 opportunities
+    parts += (email[7], escape(report_id), email[8])
+
+    return "".join(parts)
+
+
+def _add_list(parts: List[str], section: Tuple[str, ...], item: Tuple[str, ...], texts: list):
+    parts.append(section[0])
+    for text in texts:
+        parts += (item[0], escape(str(text)), item[1])
+    parts.append(section[1])
@@ -3,19 +3,34 @@ GBP Agent Service.
 Handles Google Business Profile post generation and management.
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Interval, DateTime, case, func, literal, or_
+from sqlalchemy.orm import Session, joinedload
 from app.models import Location, AgentTask, AgentOutput, AgentConfig
+from app.models.agent_config import AgentType
 from app.models.agent_task import AgentTaskStatus, AgentTaskType
 from app.models.agent_output import OutputStatus, OutputType, GBPCallToAction
-from app.services.ai_service import AIService
+from app.services.activity_rollup import ActivityRollupService, completed_day, published_day
+from app.services.ai_service import AIService, GENERATION_MODEL
 from app.services.google_business_service import GoogleBusinessService
-from datetime import datetime
+from app.services.http_client import CircuitOpenError
+from app.services.rate_limiter import QuotaExceededError
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
 import logging
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Minimum days between GBP posts for each cadence
+CADENCE_DAYS = {
+    "daily": 1,
+    "triweekly": 2,  # ~3x per week
+    "weekly": 7,
+    "biweekly": 14,
+    "monthly": 30
+}
+DEFAULT_CADENCE_DAYS = 7
+
 
 class GBPAgentService:
     """Service for GBP agent operations."""
@@ -25,7 +40,8 @@ class GBPAgentService:
         db: Session,
         location_id: uuid.UUID,
         scheduled_for: Optional[datetime] = None,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        queue_task_id: Optional[uuid.UUID] = None
     ) -> AgentTask:
         """
         Create a new GBP post generation task.
@@ -35,17 +51,24 @@ class GBPAgentService:
             location_id: Location UUID
             scheduled_for: When to execute the task
             context: Optional context for generation
+            queue_task_id: Job queue task creating it, so its retries find it again
 
         Returns:
             Created AgentTask
         """
+        metadata = {}
+        if context:
+            metadata["context"] = context
+        if queue_task_id:
+            metadata["queue_task_id"] = str(queue_task_id)
+
         task = AgentTask(
             location_id=location_id,
             agent_type="GBP",
             task_type=AgentTaskType.CREATE_GBP_POST,
             status=AgentTaskStatus.PENDING,
             scheduled_for=scheduled_for or datetime.utcnow(),
-            task_metadata={"context": context} if context else None
+            task_metadata=metadata or None
         )
 
         db.add(task)
@@ -55,6 +78,79 @@ class GBPAgentService:
         logger.info(f"Created GBP post task {task.id} for location {location_id}")
         return task
 
+    @staticmethod
+    def find_queued_post_task(
+        db: Session,
+        location_id: uuid.UUID,
+        queue_task_id: uuid.UUID,
+        since: datetime
+    ) -> Optional[AgentTask]:
+        """
+        GBP post task created by a job queue task on an earlier attempt.
+
+        Args:
+            db: Database session
+            location_id: Location UUID
+            queue_task_id: Job queue task ID
+            since: When the queue task was created (limits the partitions searched)
+
+        Returns:
+            AgentTask or None if no attempt got as far as creating one
+        """
+        # Allow for clock skew between the app and the database that stamped the queue task
+        since = since.astimezone(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+        return db.query(AgentTask).filter(
+            AgentTask.location_id == location_id,
+            AgentTask.created_at >= since,
+            AgentTask.task_type == AgentTaskType.CREATE_GBP_POST,
+            AgentTask.task_metadata["queue_task_id"].astext == str(queue_task_id)
+        ).first()
+
+    @staticmethod
+    def autopilot_post(db: Session, task_id: uuid.UUID) -> Optional[AgentOutput]:
+        """
+        Generate, approve and post a task's content, picking up where an
+        earlier attempt stopped: content already generated is not generated
+        again, and a post already made is not made again.
+
+        Args:
+            db: Database session
+            task_id: Task UUID
+
+        Returns:
+            Posted AgentOutput, or None if the task was rejected
+
+        Raises:
+            QuotaExceededError: No GBP quota token in time; the output stays approved
+            CircuitOpenError: An upstream breaker is open; nothing was posted
+        """
+        task = db.query(AgentTask).options(joinedload(AgentTask.outputs)).filter(AgentTask.id == task_id).first()
+        if not task:
+            raise ValueError(f"Task {task_id} not found")
+
+        if task.status == AgentTaskStatus.REJECTED:
+            logger.info(f"Task {task_id} was rejected; not posting")
+            return None
+
+        if not task.outputs:
+            if task.status in (AgentTaskStatus.IN_PROGRESS, AgentTaskStatus.FAILED):
+                # An earlier attempt died or failed before saving any content
+                task.status = AgentTaskStatus.PENDING
+                task.error_message = None
+                db.commit()
+            output = GBPAgentService.process_post_task(db, task.id)
+        else:
+            output = max(task.outputs, key=lambda o: o.created_at)
+
+        if output.status == OutputStatus.POSTED:
+            logger.info(f"Output {output.id} was already posted")
+            return output
+
+        if output.status == OutputStatus.DRAFT:
+            output = GBPAgentService.approve_post(db, output.id)
+
+        return GBPAgentService.mark_as_posted(db, output.id)
+
     @staticmethod
     def process_post_task(
         db: Session,
@@ -119,13 +215,15 @@ class GBPAgentService:
                 status=OutputStatus.DRAFT,  # Start as draft
                 output_metadata={
                     "reasoning": result.get("reasoning", ""),
-                    "ai_model": "claude-sonnet-4-20250514"
+                    "ai_model": GENERATION_MODEL
                 }
             )
 
             db.add(output)
+            ActivityRollupService.record_output_created(db, output)
 
             # Update task
+            completed_before = completed_day(task)
             task.status = AgentTaskStatus.COMPLETED
             task.generated_content = {
                 "content": result["content"],
@@ -133,6 +231,7 @@ class GBPAgentService:
                 "reasoning": result["reasoning"]
             }
             task.completed_at = datetime.utcnow()
+            ActivityRollupService.record_task_change(db, task, completed_before)
 
             db.commit()
             db.refresh(output)
@@ -164,7 +263,7 @@ class GBPAgentService:
         Returns:
             Updated AgentOutput
         """
-        output = db.query(AgentOutput).filter(AgentOutput.id == output_id).first()
+        output = db.query(AgentOutput).options(joinedload(AgentOutput.task)).filter(AgentOutput.id == output_id).first()
         if not output:
             raise ValueError(f"Output {output_id} not found")
 
@@ -175,9 +274,11 @@ class GBPAgentService:
         output.status = OutputStatus.APPROVED
 
         # Update related task
-        task = db.query(AgentTask).filter(AgentTask.id == output.task_id).first()
+        task = output.task
         if task:
+            completed_before = completed_day(task)
             task.status = AgentTaskStatus.APPROVED
+            ActivityRollupService.record_task_change(db, task, completed_before)
 
         db.commit()
         db.refresh(output)
@@ -202,17 +303,21 @@ class GBPAgentService:
         Returns:
             Updated AgentOutput
         """
-        output = db.query(AgentOutput).filter(AgentOutput.id == output_id).first()
+        output = db.query(AgentOutput).options(joinedload(AgentOutput.task)).filter(AgentOutput.id == output_id).first()
         if not output:
             raise ValueError(f"Output {output_id} not found")
 
         # Update output status
+        published_before = published_day(output)
         output.status = OutputStatus.FAILED
+        ActivityRollupService.record_output_change(db, output, published_before)
 
         # Update task
-        task = db.query(AgentTask).filter(AgentTask.id == output.task_id).first()
+        task = output.task
         if task:
+            completed_before = completed_day(task)
             task.status = AgentTaskStatus.REJECTED
+            ActivityRollupService.record_task_change(db, task, completed_before)
             if reason:
                 task.error_message = f"Rejected: {reason}"
 
@@ -285,13 +390,20 @@ class GBPAgentService:
 
         Returns:
             Updated AgentOutput
+
+        Raises:
+            QuotaExceededError: No GBP quota token in time; nothing was posted
+            CircuitOpenError: The google breaker is open; nothing was posted
         """
-        output = db.query(AgentOutput).filter(AgentOutput.id == output_id).first()
+        output = db.query(AgentOutput).options(
+            joinedload(AgentOutput.task),
+            joinedload(AgentOutput.location)
+        ).filter(AgentOutput.id == output_id).first()
         if not output:
             raise ValueError(f"Output {output_id} not found")
 
         # Get location to check GBP connection
-        location = db.query(Location).filter(Location.id == output.location_id).first()
+        location = output.location
         if not location:
             raise ValueError(f"Location {output.location_id} not found")
 
@@ -317,6 +429,9 @@ class GBPAgentService:
                 else:
                     logger.warning(f"GBP API returned no result for output {output_id}")
 
+            except (QuotaExceededError, CircuitOpenError):
+                # Nothing was posted; leave the output approved so the job is deferred and retried
+                raise
             except Exception as e:
                 logger.error(f"Failed to post to GBP API: {str(e)}")
                 # Don't raise - mark as posted locally even if GBP fails
@@ -326,17 +441,21 @@ class GBPAgentService:
                 output.output_metadata["gbp_error"] = str(e)
 
         # Update output
+        published_before = published_day(output)
         output.status = OutputStatus.POSTED
         output.posted_at = datetime.utcnow()
+        ActivityRollupService.record_output_change(db, output, published_before)
         if platform_post_id:
             output.platform_post_id = platform_post_id
         if platform_url:
             output.platform_url = platform_url
 
         # Update task
-        task = db.query(AgentTask).filter(AgentTask.id == output.task_id).first()
+        task = output.task
         if task:
+            completed_before = completed_day(task)
             task.status = AgentTaskStatus.POSTED
+            ActivityRollupService.record_task_change(db, task, completed_before)
 
         db.commit()
         db.refresh(output)
@@ -418,13 +537,47 @@ class GBPAgentService:
         days_since_last = (datetime.utcnow() - latest_post.created_at).days
 
         # Check cadence
-        cadence_days = {
-            "daily": 1,
-            "triweekly": 2,  # ~3x per week
-            "weekly": 7,
-            "biweekly": 14,
-            "monthly": 30
-        }
-
-        required_days = cadence_days.get(location.gbp_cadence, 7)
+        required_days = CADENCE_DAYS.get(location.gbp_cadence, DEFAULT_CADENCE_DAYS)
         return days_since_last >= required_days
+
+    @staticmethod
+    def get_locations_due_for_post(db: Session, as_of: Optional[datetime] = None) -> List[Location]:
+        """
+        Get every location that needs a GBP post today, in one query.
+        Set-based equivalent of should_create_post_today for all locations:
+        joins the active GBP config and each location's latest posted or
+        scheduled output, and applies the cadence table in SQL.
+
+        Args:
+            db: Database session
+            as_of: Naive UTC time to evaluate cadence at (defaults to now)
+
+        Returns:
+            Locations due for a post
+        """
+        # Latest posted/scheduled GBP output per location
+        latest_post = db.query(
+            AgentOutput.location_id.label("location_id"),
+            func.max(AgentOutput.created_at).label("last_posted_at")
+        ).filter(
+            AgentOutput.output_type == OutputType.GBP_POST,
+            AgentOutput.status.in_([OutputStatus.POSTED, OutputStatus.SCHEDULED])
+        ).group_by(AgentOutput.location_id).subquery()
+
+        required_days = case(CADENCE_DAYS, value=Location.gbp_cadence, else_=DEFAULT_CADENCE_DAYS)
+        due_before = literal(as_of or datetime.utcnow(), DateTime) - func.make_interval(0, 0, 0, required_days, type_=Interval)
+
+        return db.query(Location).join(
+            AgentConfig,
+            (AgentConfig.location_id == Location.id) & (AgentConfig.agent_type == AgentType.GBP)
+        ).outerjoin(
+            latest_post, latest_post.c.location_id == Location.id
+        ).filter(
+            Location.gbp_cadence.isnot(None),
+            Location.gbp_cadence != "off",
+            AgentConfig.is_active.is_(True),
+            or_(
+                latest_post.c.last_posted_at.is_(None),  # No posts yet, create one
+                latest_post.c.last_posted_at <= due_before
+            )
+        ).all()
@@ -1,12 +1,19 @@
 """
 Google Business Profile API Service.
 Handles posting to GBP and fetching metrics.
+
+Every call takes a token from the project-wide and the per-account GBP
+quota buckets first (see rate_limiter), and a 429 backs both off. Running
+out of quota or hitting the open google breaker is raised rather than
+returned as None, so queued work is deferred instead of treated as done.
 """
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from contextlib import contextmanager
 from googleapiclient.errors import HttpError
 from app.services.google_oauth_service import GoogleOAuthService
+from app.services.http_client import CircuitOpenError, build_google_service, parse_retry_after, upstream_call
+from app.services.rate_limiter import Bucket, QuotaExceededError, get_quota_manager
+from app.config import settings
 from app.models.agent_output import GBPCallToAction
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any, List
@@ -16,6 +23,42 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def gbp_buckets(location_id: str, gbp_location_name: str) -> List[Bucket]:
+    """Quota buckets a call for a GBP location counts against."""
+    # Names without the account ('locations/123') fall back to our location
+    if gbp_location_name.startswith("accounts/"):
+        account = gbp_location_name.split("/locations/")[0]
+    else:
+        account = f"location:{location_id}"
+
+    return [
+        Bucket("gbp", "project", settings.GBP_QUOTA_PROJECT_PER_MINUTE),
+        Bucket("gbp", "account", settings.GBP_QUOTA_ACCOUNT_PER_MINUTE, account),
+    ]
+
+
+@contextmanager
+def gbp_call(location_id: str, gbp_location_name: str):
+    """
+    Guard a GBP API call with its quota buckets and the google breaker.
+
+    Raises:
+        QuotaExceededError: No quota token within QUOTA_MAX_WAIT_SECONDS
+        CircuitOpenError: The google breaker is open
+    """
+    quota = get_quota_manager()
+    buckets = gbp_buckets(location_id, gbp_location_name)
+    quota.acquire(buckets)
+
+    with upstream_call("google"):
+        try:
+            yield
+        except HttpError as e:
+            if e.resp.status == 429:
+                quota.throttled(buckets, parse_retry_after(e.resp.get("retry-after")))
+            raise
+
+
 class GoogleBusinessService:
     """Service for Google My Business API operations."""
 
@@ -41,6 +84,10 @@ class GoogleBusinessService:
 
         Returns:
             Created post dict or None on failure
+
+        Raises:
+            QuotaExceededError: No GBP quota token within QUOTA_MAX_WAIT_SECONDS
+            CircuitOpenError: The google breaker is open
         """
         # Get valid credentials
         credentials = GoogleOAuthService.get_valid_credentials(db, location_id)
@@ -49,7 +96,7 @@ class GoogleBusinessService:
             return None
 
         try:
-            service = build('mybusiness', 'v4', credentials=credentials)
+            service = build_google_service('mybusiness', 'v4', credentials)
 
             # Build local post object
             local_post = {
@@ -70,14 +117,18 @@ class GoogleBusinessService:
                 ]
 
             # Create the post
-            result = service.accounts().locations().localPosts().create(
-                parent=gbp_location_name,
-                body=local_post
-            ).execute()
+            # Not retried: a create that timed out may still have been posted
+            with gbp_call(location_id, gbp_location_name):
+                result = service.accounts().locations().localPosts().create(
+                    parent=gbp_location_name,
+                    body=local_post
+                ).execute()
 
             logger.info(f"Successfully created GBP post for location {gbp_location_name}")
             return result
 
+        except (QuotaExceededError, CircuitOpenError):
+            raise
         except HttpError as e:
             logger.error(f"HTTP error creating GBP post: {e.status_code} - {e.reason}")
             logger.error(f"Error details: {e.content}")
@@ -106,6 +157,10 @@ class GoogleBusinessService:
 
         Returns:
             Insights dict or None
+
+        Raises:
+            QuotaExceededError: No GBP quota token within QUOTA_MAX_WAIT_SECONDS
+            CircuitOpenError: The google breaker is open
         """
         credentials = GoogleOAuthService.get_valid_credentials(db, location_id)
         if not credentials:
@@ -113,7 +168,7 @@ class GoogleBusinessService:
             return None
 
         try:
-            service = build('mybusiness', 'v4', credentials=credentials)
+            service = build_google_service('mybusiness', 'v4', credentials)
 
             # Format dates
             start_time = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -139,14 +194,17 @@ class GoogleBusinessService:
                 }
             }
 
-            result = service.accounts().locations().reportInsights(
-                name=gbp_location_name,
-                body=request_body
-            ).execute()
+            with gbp_call(location_id, gbp_location_name):
+                result = service.accounts().locations().reportInsights(
+                    name=gbp_location_name,
+                    body=request_body
+                ).execute(num_retries=settings.HTTP_MAX_RETRIES)
 
             logger.info(f"Successfully fetched insights for location {gbp_location_name}")
             return result
 
+        except (QuotaExceededError, CircuitOpenError):
+            raise
         except HttpError as e:
             logger.error(f"HTTP error fetching GBP insights: {e.status_code} - {e.reason}")
             return None
@@ -170,6 +228,10 @@ class GoogleBusinessService:
 
         Returns:
             List of review dicts or None
+
+        Raises:
+            QuotaExceededError: No GBP quota token within QUOTA_MAX_WAIT_SECONDS
+            CircuitOpenError: The google breaker is open
         """
         credentials = GoogleOAuthService.get_valid_credentials(db, location_id)
         if not credentials:
@@ -177,16 +239,19 @@ class GoogleBusinessService:
             return None
 
         try:
-            service = build('mybusiness', 'v4', credentials=credentials)
+            service = build_google_service('mybusiness', 'v4', credentials)
 
-            result = service.accounts().locations().reviews().list(
-                parent=gbp_location_name
-            ).execute()
+            with gbp_call(location_id, gbp_location_name):
+                result = service.accounts().locations().reviews().list(
+                    parent=gbp_location_name
+                ).execute(num_retries=settings.HTTP_MAX_RETRIES)
 
             reviews = result.get('reviews', [])
             logger.info(f"Fetched {len(reviews)} reviews for location {gbp_location_name}")
             return reviews
 
+        except (QuotaExceededError, CircuitOpenError):
+            raise
         except HttpError as e:
             logger.error(f"HTTP error fetching reviews: {e.status_code} - {e.reason}")
             return None
@@ -214,6 +279,10 @@ class GoogleBusinessService:
 
         Returns:
             Reply result or None
+
+        Raises:
+            QuotaExceededError: No GBP quota token within QUOTA_MAX_WAIT_SECONDS
+            CircuitOpenError: The google breaker is open
         """
         credentials = GoogleOAuthService.get_valid_credentials(db, location_id)
         if not credentials:
@@ -221,20 +290,23 @@ class GoogleBusinessService:
             return None
 
         try:
-            service = build('mybusiness', 'v4', credentials=credentials)
+            service = build_google_service('mybusiness', 'v4', credentials)
 
             reply_body = {
                 "comment": reply_text
             }
 
-            result = service.accounts().locations().reviews().updateReply(
-                name=review_name,
-                body=reply_body
-            ).execute()
+            with gbp_call(location_id, gbp_location_name):
+                result = service.accounts().locations().reviews().updateReply(
+                    name=review_name,
+                    body=reply_body
+                ).execute(num_retries=settings.HTTP_MAX_RETRIES)
 
             logger.info(f"Successfully replied to review {review_name}")
             return result
 
+        except (QuotaExceededError, CircuitOpenError):
+            raise
         except HttpError as e:
             logger.error(f"HTTP error replying to review: {e.status_code} - {e.reason}")
             return None
@@ -1,22 +1,25 @@
 """
 Google OAuth Service.
 Handles OAuth 2.0 authentication flow for Google My Business API.
+The Google auth libraries are imported on first use, not at startup.
 """
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from app.config import settings
+from app.services.http_client import build_google_service, google_auth_request, request, upstream_call
 from app.models import OAuthToken, Location
 from app.models.oauth_token import OAuthProvider
 from app.utils.encryption import encrypt_token, decrypt_token
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import logging
 import json
 import uuid
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import Flow
+
 logger = logging.getLogger(__name__)
 
 # Google My Business API scopes
@@ -32,7 +35,7 @@ class GoogleOAuthService:
     """Service for Google OAuth operations."""
 
     @staticmethod
-    def create_oauth_flow() -> Flow:
+    def create_oauth_flow() -> "Flow":
         """
         Create a Google OAuth flow.
 
@@ -45,6 +48,8 @@ class GoogleOAuthService:
         if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
             raise ValueError("Google OAuth credentials not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env file.")
 
+        from google_auth_oauthlib.flow import Flow
+
         client_config = {
             "web": {
                 "client_id": settings.GOOGLE_CLIENT_ID,
@@ -96,8 +101,6 @@ class GoogleOAuthService:
         Returns:
             Dict with token information
         """
-        import requests
-
         # Exchange code for tokens using direct HTTP request
         # This bypasses the scope validation issue in google-auth-oauthlib
         token_url = "https://oauth2.googleapis.com/token"
@@ -109,7 +112,8 @@ class GoogleOAuthService:
             'grant_type': 'authorization_code'
         }
 
-        response = requests.post(token_url, data=data)
+        # Codes are single-use, so the exchange is only retried if the connection never opened
+        response = request("google", "POST", token_url, data=data)
         response.raise_for_status()
         token_data = response.json()
 
@@ -132,7 +136,8 @@ class GoogleOAuthService:
         db: Session,
         location_id: str,
         token_data: Dict[str, Any],
-        provider_user_id: Optional[str] = None
+        provider_user_id: Optional[str] = None,
+        accounts_count: Optional[int] = None
     ) -> OAuthToken:
         """
         Save OAuth tokens to database.
@@ -142,6 +147,7 @@ class GoogleOAuthService:
             location_id: Location UUID
             token_data: Token data from Google
             provider_user_id: Google user ID (email)
+            accounts_count: Number of GBP accounts visible to the connection
 
         Returns:
             Created OAuthToken
@@ -169,6 +175,9 @@ class GoogleOAuthService:
                 existing_token.refresh_token_encrypted = refresh_token_encrypted
             existing_token.expires_at = token_data.get("expiry")
             existing_token.scope = ' '.join(token_data.get("scopes", []))
+            existing_token.provider_email = provider_user_id
+            existing_token.accounts_count = accounts_count
+            existing_token.account_info_synced_at = datetime.now(timezone.utc)
             existing_token.updated_at = datetime.now(timezone.utc)
 
             db.commit()
@@ -185,7 +194,10 @@ class GoogleOAuthService:
             access_token_encrypted=access_token_encrypted,
             refresh_token_encrypted=refresh_token_encrypted,
             expires_at=token_data.get("expiry"),
-            scope=' '.join(token_data.get("scopes", []))
+            scope=' '.join(token_data.get("scopes", [])),
+            provider_email=provider_user_id,
+            accounts_count=accounts_count,
+            account_info_synced_at=datetime.now(timezone.utc)
         )
 
         db.add(oauth_token)
@@ -196,7 +208,7 @@ class GoogleOAuthService:
         return oauth_token
 
     @staticmethod
-    def get_valid_credentials(db: Session, location_id: str) -> Optional[Credentials]:
+    def get_valid_credentials(db: Session, location_id: str) -> Optional["Credentials"]:
         """
         Get valid Google credentials for a location.
         Automatically refreshes if expired.
@@ -231,6 +243,8 @@ class GoogleOAuthService:
             # Convert timezone-aware to timezone-naive UTC
             expiry = expiry.replace(tzinfo=None)
 
+        from google.oauth2.credentials import Credentials
+
         # Create credentials object
         credentials = Credentials(
             token=access_token,
@@ -245,8 +259,8 @@ class GoogleOAuthService:
         # Check if expired
         if credentials.expired and credentials.refresh_token:
             try:
-                from google.auth.transport.requests import Request
-                credentials.refresh(Request())
+                with upstream_call("google"):
+                    credentials.refresh(google_auth_request())
 
                 # Update token in database with encrypted new token
                 oauth_token.access_token_encrypted = encrypt_token(credentials.token)
@@ -262,6 +276,63 @@ class GoogleOAuthService:
 
         return credentials
 
+    @staticmethod
+    def get_token(db: Session, location_id: str) -> Optional[OAuthToken]:
+        """
+        Get the stored Google OAuth token record for a location.
+        Reads from the database only - no calls to Google.
+
+        Args:
+            db: Database session
+            location_id: Location UUID
+
+        Returns:
+            OAuthToken or None
+        """
+        return db.query(OAuthToken).filter(
+            OAuthToken.location_id == location_id,
+            OAuthToken.provider == OAuthProvider.GOOGLE
+        ).first()
+
+    @staticmethod
+    def sync_account_info(
+        db: Session,
+        oauth_token: OAuthToken,
+        credentials: "Credentials"
+    ) -> OAuthToken:
+        """
+        Fetch the connected account's email and GBP account count from Google
+        and cache them on the token record. When Google can't be reached, the
+        cached values and account_info_synced_at are left as they were.
+
+        Args:
+            db: Database session
+            oauth_token: Token record to update
+            credentials: Valid Google Credentials for the token
+
+        Returns:
+            Updated OAuthToken
+        """
+        user_email = GoogleOAuthService.get_user_email(credentials)
+        if user_email:
+            oauth_token.provider_email = user_email
+
+        try:
+            accounts = GoogleOAuthService._fetch_accounts(credentials)
+        except Exception as e:
+            # A failed listing says nothing about the account count; keep the cached one
+            logger.warning(f"Failed to sync Google accounts for location {oauth_token.location_id}: {str(e)}")
+            accounts = None
+
+        if accounts is not None:
+            oauth_token.accounts_count = len(accounts)
+            oauth_token.account_info_synced_at = datetime.now(timezone.utc)
+            logger.info(f"Synced Google account info for location {oauth_token.location_id}")
+
+        db.commit()
+        db.refresh(oauth_token)
+        return oauth_token
+
     @staticmethod
     def disconnect(db: Session, location_id: str) -> bool:
         """
@@ -289,7 +360,7 @@ class GoogleOAuthService:
         return True
 
     @staticmethod
-    def get_user_email(credentials: Credentials) -> Optional[str]:
+    def get_user_email(credentials: "Credentials") -> Optional[str]:
         """
         Get user email from Google OAuth.
 
@@ -300,15 +371,16 @@ class GoogleOAuthService:
             User email or None
         """
         try:
-            service = build('oauth2', 'v2', credentials=credentials)
-            user_info = service.userinfo().get().execute()
+            service = build_google_service('oauth2', 'v2', credentials)
+            with upstream_call("google"):
+                user_info = service.userinfo().get().execute(num_retries=settings.HTTP_MAX_RETRIES)
             return user_info.get('email')
         except Exception as e:
             logger.error(f"Failed to get user email: {str(e)}")
             return None
 
     @staticmethod
-    def list_accounts(credentials: Credentials) -> List[Dict[str, Any]]:
+    def list_accounts(credentials: "Credentials") -> List[Dict[str, Any]]:
         """
         List Google My Business accounts.
 
@@ -319,15 +391,32 @@ class GoogleOAuthService:
             List of account dicts
         """
         try:
-            service = build('mybusinessaccountmanagement', 'v1', credentials=credentials)
-            accounts = service.accounts().list().execute()
-            return accounts.get('accounts', [])
+            return GoogleOAuthService._fetch_accounts(credentials)
         except Exception as e:
             logger.error(f"Failed to list Google My Business accounts: {str(e)}")
             return []
 
     @staticmethod
-    def list_locations(credentials: Credentials, account_name: str) -> List[Dict[str, Any]]:
+    def _fetch_accounts(credentials: "Credentials") -> List[Dict[str, Any]]:
+        """
+        List Google My Business accounts, raising when the listing fails.
+
+        Args:
+            credentials: Google Credentials
+
+        Returns:
+            List of account dicts
+
+        Raises:
+            Exception: Any error from the Google API call, including CircuitOpenError
+        """
+        service = build_google_service('mybusinessaccountmanagement', 'v1', credentials)
+        with upstream_call("google"):
+            accounts = service.accounts().list().execute(num_retries=settings.HTTP_MAX_RETRIES)
+        return accounts.get('accounts', [])
+
+    @staticmethod
+    def list_locations(credentials: "Credentials", account_name: str) -> List[Dict[str, Any]]:
         """
         List locations for a Google My Business account.
 
@@ -339,8 +428,9 @@ class GoogleOAuthService:
             List of location dicts
         """
         try:
-            service = build('mybusinessbusinessinformation', 'v1', credentials=credentials)
-            locations = service.locations().list(parent=account_name).execute()
+            service = build_google_service('mybusinessbusinessinformation', 'v1', credentials)
+            with upstream_call("google"):
+                locations = service.locations().list(parent=account_name).execute(num_retries=settings.HTTP_MAX_RETRIES)
             return locations.get('locations', [])
         except Exception as e:
             logger.error(f"Failed to list locations for account {account_name}: {str(e)}")
@@ -0,0 +1,163 @@
+"""
+Readiness probes.
+/health/ready reports whether this process can serve traffic and do its
+work: the database (reachability and round trip), this process's
+connection pool, scheduler leadership, job queue and email outbox backlog,
+and the external dependency circuit breakers.
+
+Probes that query the database are cached for HEALTH_CACHE_SECONDS and
+refreshed by one caller at a time while the others are answered from the
+previous result, so frequent platform health checks cost at most one
+probe per interval per process and never pile up behind a slow one. Pool and breaker state
+is in memory and always current.
+"""
+
+from sqlalchemy import func, text
+from app.config import settings
+from app.database import DB_MAX_OVERFLOW, DB_POOL_SIZE, SessionLocal, engine
+from app.models import EmailOutbox, EmailOutboxStatus, Task, TaskStatus
+from app.services.http_client import breaker_states
+from app.services import scheduler
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Probe queries give up rather than hold a health check open
+PROBE_STATEMENT_TIMEOUT_MS = 2000
+
+READY = "ready"
+DEGRADED = "degraded"  # Serving, but something needs attention
+UNAVAILABLE = "unavailable"  # Can't serve; /health/ready answers 503
+
+_cache: Optional[Dict[str, Any]] = None
+_cached_at = 0.0
+_lock = threading.Lock()
+
+
+def pool_status() -> Dict[str, Any]:
+    """Connection pool usage of this process."""
+    pool = engine.pool
+    checked_out = pool.checkedout()
+    capacity = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    return {
+        "size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "saturation": round(checked_out / capacity, 2)
+    }
+
+
+def _seconds_since(moment: Optional[datetime], now: datetime) -> Optional[float]:
+    return round((now - moment).total_seconds(), 1) if moment else None
+
+
+def _probe_database() -> Dict[str, Any]:
+    """Round trip, scheduler leader, job queue and outbox backlog, in one short transaction."""
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        db.execute(text(f"SET LOCAL statement_timeout = {PROBE_STATEMENT_TIMEOUT_MS}"))
+        db.execute(text("SELECT 1"))
+        latency = time.perf_counter() - start
+        now = datetime.now(timezone.utc)
+
+        # Whoever holds the advisory lock is the leader; its lock connection is named after it
+        leader = db.execute(text("""
+            SELECT a.application_name
+            FROM pg_locks l JOIN pg_stat_activity a ON a.pid = l.pid
+            WHERE l.locktype = 'advisory' AND l.granted
+              AND l.classid::bigint = (CAST(:lock_id AS bigint) >> 32)
+              AND l.objid::bigint = (CAST(:lock_id AS bigint) & 4294967295) AND l.objsubid = 1
+            LIMIT 1
+        """), {"lock_id": settings.SCHEDULER_LEADER_LOCK_ID}).scalar()
+
+        due_jobs, oldest_due = db.query(func.count(Task.id), func.min(Task.scheduled_at)).filter(
+            Task.status == TaskStatus.PENDING,
+            Task.scheduled_at <= now
+        ).one()
+        dead_jobs = db.query(func.count(Task.id)).filter(Task.status == TaskStatus.DEAD).scalar()
+
+        due_emails, oldest_email = db.query(func.count(EmailOutbox.id), func.min(EmailOutbox.next_attempt_at)).filter(
+            EmailOutbox.status == EmailOutboxStatus.PENDING,
+            EmailOutbox.next_attempt_at <= now
+        ).one()
+
+        db.rollback()
+        return {
+            "database": {"status": READY, "latency_ms": round(latency * 1000, 1)},
+            "scheduler": {
+                "leader": leader.removeprefix("sponte-leader-") if leader else None,
+                "this_process_is_leader": scheduler.is_scheduler_leader()
+            },
+            "job_queue": {
+                "due": due_jobs,
+                "oldest_due_seconds": _seconds_since(oldest_due, now),
+                "dead": dead_jobs
+            },
+            "email_outbox": {
+                "due": due_emails,
+                "oldest_due_seconds": _seconds_since(oldest_email, now)
+            }
+        }
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Readiness probe failed: {str(e)}")
+        return {"database": {"status": UNAVAILABLE, "error": f"{type(e).__name__}: {str(e)}"}}
+
+    finally:
+        db.close()
+
+
+def _cached_probe() -> Dict[str, Any]:
+    global _cache, _cached_at
+    if _cache is not None and time.monotonic() - _cached_at < settings.HEALTH_CACHE_SECONDS:
+        return _cache
+
+    # One caller refreshes; the rest answer from the stale result instead of
+    # queueing behind a slow probe (they only wait when there is no result yet)
+    if not _lock.acquire(blocking=_cache is None):
+        return _cache
+    try:
+        expired = _cache is None or time.monotonic() - _cached_at >= settings.HEALTH_CACHE_SECONDS
+        # With every connection checked out the probe would queue behind real work; keep the last result
+        if expired and (_cache is None or engine.pool.checkedout() < DB_POOL_SIZE + DB_MAX_OVERFLOW):
+            result = _probe_database()
+            result["checked_at"] = datetime.now(timezone.utc).isoformat()
+            _cache, _cached_at = result, time.monotonic()
+        return _cache
+    finally:
+        _lock.release()
+
+
+def readiness() -> Dict[str, Any]:
+    """
+    Readiness of this process.
+
+    Returns:
+        Dict with "status" (ready, degraded or unavailable), "checked_at"
+        (when the cached DB probes ran) and one entry per check: database,
+        pool, scheduler, job_queue, email_outbox, dependencies
+    """
+    report = dict(_cached_probe())
+    report["pool"] = pool_status()
+    report["dependencies"] = breaker_states()
+
+    if report["database"]["status"] == UNAVAILABLE:
+        status = UNAVAILABLE
+    elif (
+        report["pool"]["saturation"] >= 1
+        or report["scheduler"]["leader"] is None
+        or (report["job_queue"]["oldest_due_seconds"] or 0) > settings.HEALTH_BACKLOG_WARN_SECONDS
+        or any(dependency["state"] != "closed" for dependency in report["dependencies"].values())
+    ):
+        status = DEGRADED
+    else:
+        status = READY
+
+    return {"status": status, **report}
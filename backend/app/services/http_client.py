@@ -0,0 +1,424 @@
+"""
+Shared outbound HTTP layer.
+Calls to external services (Anthropic, Google, Clerk, Resend) go through
+here so they share the same connection handling and failure behavior:
+
+- One pooled requests.Session per upstream, so connections to each host
+  are kept alive and reused across calls and threads.
+- Explicit connect / read timeouts per upstream.
+- Retries with jittered exponential backoff on connection errors, 429 and
+  5xx, honoring Retry-After. Non-idempotent requests are only retried when
+  the caller marks them safe (they carry an idempotency key), or when the
+  connection was never established.
+- A circuit breaker per upstream: after CIRCUIT_BREAKER_FAILURE_THRESHOLD
+  consecutive failures, calls fail fast with CircuitOpenError for
+  CIRCUIT_BREAKER_RESET_SECONDS, then one trial call decides whether it
+  closes again.
+
+Breaker state doubles as degraded mode: job queue handlers declare the
+dependencies they need and are deferred, without using an attempt, while
+one of them is open (see job_queue); the email outbox pauses while resend
+is; /health reports every breaker.
+
+SDK clients use the same settings: Anthropic's httpx client (httpx_client,
+httpx_timeout; the SDK does its own Retry-After aware retries) and
+googleapiclient's httplib2 transport (build_google_service). Their calls
+are wrapped in upstream_call for the breaker and metrics. The SDK
+transports are imported on first use, not at startup.
+"""
+
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from app.config import settings
+from app.services.metrics import CIRCUIT_BREAKER_TRANSITIONS, OUTBOUND_RETRIES, track_external
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Type
+import functools
+import logging
+import random
+import requests
+import sys
+import threading
+import time
+
+if TYPE_CHECKING:
+    import httplib2
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upstreams reported by /health even before their first call
+DEPENDENCIES = ("anthropic", "google", "clerk", "resend")
+
+# Read timeout overrides per upstream (seconds); others use HTTP_READ_TIMEOUT_SECONDS
+READ_TIMEOUTS = {
+    "anthropic": 120.0,  # Long generations stream nothing until done
+    "clerk": 10.0,
+}
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Exceptions that mean the upstream couldn't be reached or didn't answer
+TRANSPORT_ERRORS: Tuple[Type[BaseException], ...] = (
+    requests.ConnectionError,
+    requests.Timeout,
+    TimeoutError,
+    ConnectionError,
+)
+
+
+def transport_errors() -> Tuple[Type[BaseException], ...]:
+    """TRANSPORT_ERRORS plus those of the SDK transports loaded so far."""
+    # A transport that was never imported can't have raised
+    errors = TRANSPORT_ERRORS
+    if "httpx" in sys.modules:
+        errors += (sys.modules["httpx"].TransportError,)
+    if "httplib2" in sys.modules:
+        errors += (sys.modules["httplib2"].HttpLib2Error,)
+    return errors
+
+
+def timeouts(service: str) -> Tuple[float, float]:
+    """(connect, read) timeouts for an upstream, in seconds."""
+    return settings.HTTP_CONNECT_TIMEOUT_SECONDS, READ_TIMEOUTS.get(service, settings.HTTP_READ_TIMEOUT_SECONDS)
+
+
+def compute_retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry number."""
+    ceiling = min(settings.HTTP_RETRY_BASE_SECONDS * (2 ** max(attempt - 1, 0)), settings.HTTP_RETRY_MAX_SECONDS)
+    return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, service: str, retry_in: float):
+        super().__init__(f"{service} circuit breaker is open (retry in {retry_in:.0f}s)")
+        self.service = service
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+    closed -> open after failure_threshold failures in a row; open -> half_open
+    after reset_seconds; half_open lets one trial call through and closes on
+    success or re-opens on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, service: str, failure_threshold: int, reset_seconds: float):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Admit a call, or raise CircuitOpenError.
+
+        Raises:
+            CircuitOpenError
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                elapsed = time.monotonic() - self.opened_at
+                if elapsed < self.reset_seconds:
+                    raise CircuitOpenError(self.service, self.reset_seconds - elapsed)
+                self._transition(self.HALF_OPEN)
+
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpenError(self.service, self.reset_seconds)
+                self._trial_in_flight = True
+
+    def record_success(self):
+        """The upstream answered."""
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        """The upstream failed (5xx or unreachable)."""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                if self.state != self.OPEN:
+                    self._transition(self.OPEN)
+
+    def release(self):
+        """The call ended without telling us anything about the upstream."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a trial call through (0 otherwise)."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(self.reset_seconds - (time.monotonic() - self.opened_at), 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State for health reporting."""
+        retry_in = self.retry_in()
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_in_seconds": round(retry_in, 1) if retry_in else None
+            }
+
+    def _transition(self, state: str):
+        self.state = state
+        CIRCUIT_BREAKER_TRANSITIONS.labels(service=self.service, state=state).inc()
+        if state == self.OPEN:
+            logger.warning(f"{self.service} circuit breaker opened after {self.failures} consecutive failures")
+        else:
+            logger.info(f"{self.service} circuit breaker {state}")
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_breaker(service: str) -> CircuitBreaker:
+    """The circuit breaker of an upstream."""
+    with _lock:
+        if service not in _breakers:
+            _breakers[service] = CircuitBreaker(
+                service,
+                settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                settings.CIRCUIT_BREAKER_RESET_SECONDS
+            )
+        return _breakers[service]
+
+
+def ensure_available(*services: str):
+    """
+    Fail fast if any of the upstreams' breakers is open, without using a
+    half-open trial call.
+
+    Raises:
+        CircuitOpenError: For the first upstream that is still cooling down
+    """
+    for service in services:
+        retry_in = get_breaker(service).retry_in()
+        if retry_in > 0:
+            raise CircuitOpenError(service, retry_in)
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Breaker state per upstream, for /health."""
+    for service in DEPENDENCIES:
+        get_breaker(service)
+    with _lock:
+        breakers = list(_breakers.values())
+    return {breaker.service: breaker.snapshot() for breaker in breakers}
+
+
+def get_session(service: str) -> requests.Session:
+    """The pooled keep-alive session of an upstream."""
+    with _lock:
+        if service not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.HTTP_POOL_MAXSIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[service] = session
+        return _sessions[service]
+
+
+def _status_of(exc: BaseException) -> Optional[int]:
+    # SDK errors carry the response status in different places
+    for status in (
+        getattr(exc, "status_code", None),
+        getattr(getattr(exc, "response", None), "status_code", None),
+        getattr(getattr(exc, "resp", None), "status", None),
+    ):
+        if status is not None:
+            try:
+                return int(status)
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+@contextmanager
+def upstream_call(service: str, failure_types: Tuple[Type[BaseException], ...] = ()):
+    """
+    Guard an SDK call to an upstream with its circuit breaker and time it.
+    5xx responses and transport errors (plus failure_types) count as
+    failures; any other response counts as success.
+
+    Usage:
+        with upstream_call("google"):
+            service.accounts().list().execute()
+
+    Raises:
+        CircuitOpenError: The breaker is open; the call was not made
+    """
+    breaker = get_breaker(service)
+    breaker.allow()
+
+    with track_external(service):
+        try:
+            yield
+        except Exception as e:
+            status = _status_of(e)
+            if status is not None:
+                if status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            elif isinstance(e, transport_errors() + failure_types):
+                breaker.record_failure()
+            else:
+                breaker.release()
+            raise
+        else:
+            breaker.record_success()
+
+
+def request(service: str, method: str, url: str, retry_unsafe: bool = False, **kwargs) -> requests.Response:
+    """
+    Make an HTTP request to an upstream through its pooled session, with
+    timeouts, retries and its circuit breaker. Responses are returned as-is
+    (including errors once retries are exhausted); call raise_for_status.
+
+    Args:
+        service: Upstream name (anthropic, google, clerk, resend)
+        method: HTTP method
+        url: Request URL
+        retry_unsafe: Retry a non-idempotent method (it carries an idempotency key)
+        **kwargs: Passed to requests (json, data, headers, ...)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        CircuitOpenError: The breaker is open
+        requests.RequestException: The upstream couldn't be reached
+    """
+    session = get_session(service)
+    breaker = get_breaker(service)
+    kwargs.setdefault("timeout", timeouts(service))
+    retryable = method.upper() in IDEMPOTENT_METHODS or retry_unsafe
+    max_attempts = settings.HTTP_MAX_RETRIES + 1
+
+    # The breaker sees one call, whatever the number of attempts
+    breaker.allow()
+    for attempt in range(1, max_attempts + 1):
+        try:
+            with track_external(service):
+                response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # A connect timeout means nothing was sent, so any method can be retried
+            if attempt == max_attempts or not (retryable or isinstance(e, requests.ConnectTimeout)):
+                breaker.record_failure()
+                raise
+            delay = compute_retry_delay(attempt)
+            reason = "timeout" if isinstance(e, requests.Timeout) else "connection"
+        else:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if (
+                response.status_code not in RETRY_STATUSES
+                or attempt == max_attempts
+                or not retryable
+                or (retry_after is not None and retry_after > settings.HTTP_RETRY_MAX_SECONDS)  # Won't block that long
+            ):
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                return response
+
+            delay = retry_after if retry_after is not None else compute_retry_delay(attempt)
+            reason = str(response.status_code)
+            response.close()
+
+        OUTBOUND_RETRIES.labels(service=service, reason=reason).inc()
+        logger.warning(f"Retrying {method} {service} request in {delay:.1f}s ({reason}, attempt {attempt}/{max_attempts})")
+        time.sleep(delay)
+
+
+def httpx_timeout(service: str) -> "httpx.Timeout":
+    """httpx timeouts for an upstream (for SDKs built on httpx)."""
+    import httpx
+
+    connect, read = timeouts(service)
+    return httpx.Timeout(read, connect=connect)
+
+
+def httpx_client(service: str) -> "httpx.Client":
+    """A pooled keep-alive httpx client for an upstream's SDK."""
+    import httpx
+
+    return httpx.Client(
+        timeout=httpx_timeout(service),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_POOL_MAXSIZE,
+            max_keepalive_connections=settings.HTTP_POOL_MAXSIZE
+        )
+    )
+
+
+def google_auth_request() -> Callable:
+    """google-auth transport (e.g. for credentials.refresh) on the pooled google session, with our timeouts."""
+    from google.auth.transport import requests as google_auth_requests
+
+    return functools.partial(google_auth_requests.Request(session=get_session("google")), timeout=timeouts("google"))
+
+
+def _google_http() -> "httplib2.Http":
+    import httplib2
+
+    # httplib2.Http isn't thread-safe; one per thread keeps its connections alive
+    http = getattr(_local, "google_http", None)
+    if http is None:
+        http = httplib2.Http(timeout=timeouts("google")[1])
+        _local.google_http = http
+    return http
+
+
+def build_google_service(api: str, version: str, credentials):
+    """
+    googleapiclient service on a per-thread keep-alive httplib2 transport
+    with our timeout (httplib2 has one socket timeout for connect and read).
+    """
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+
+    http = AuthorizedHttp(credentials, http=_google_http())
+    return build(api, version, http=http, cache_discovery=False)
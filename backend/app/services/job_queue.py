@@ -0,0 +1,618 @@
+"""
+Durable job queue built on the tasks table.
+Producers enqueue Task rows; workers claim batches with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker processes can
+drain the queue without stepping on each other.
+
+Claimed tasks are leased for a visibility timeout, and the lease is
+renewed as each task of a batch starts, so tasks waiting behind slow ones
+aren't reclaimed and run twice. A worker that dies mid-task leaves the
+lease to expire and the task is reclaimed; a worker that stops hands its
+unstarted tasks back straight away. Failed
+tasks are retried with jittered exponential backoff and dead-lettered
+once they exhaust max_attempts.
+
+Handlers declare the upstreams they need. While one of them has its
+circuit breaker open, its tasks are deferred until the breaker's
+cool-down ends instead of being run into it, and without using up an
+attempt; so is a task whose handler hits an open breaker (CircuitOpenError)
+or runs out of upstream quota (QuotaExceededError) mid-way.
+
+Jobs enqueued inside a scheduled job run are tagged with the run, and each
+attempt's duration, DB / external time and error class is stored on the
+task (see job_runs).
+"""
+
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Task, TaskStatus, TaskType
+from app.services.http_client import CircuitOpenError, ensure_available
+from app.services.job_runs import current_run, item_metrics
+from app.services.metrics import JOB_ITEM_DEFERRALS, collect_stats, observe_job_item
+from app.services.rate_limiter import QuotaExceededError
+from app.services.query_tracker import track_queries, warn_if_repeated
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Handler signature: handler(db, task) -> optional result dict stored on the task
+JobHandler = Callable[[Session, Task], Optional[Dict[str, Any]]]
+
+_handlers: Dict[TaskType, JobHandler] = {}
+_requirements: Dict[TaskType, Tuple[str, ...]] = {}
+
+# Jobs per INSERT in enqueue_many (stays well under Postgres' bind parameter limit)
+ENQUEUE_MANY_CHUNK = 1000
+
+
+def job_handler(task_type: TaskType, requires: Tuple[str, ...] = ()):
+    """
+    Register a function as the handler for a task type.
+    `requires` names the upstreams (http_client breakers) it can't run without.
+
+    Usage:
+        @job_handler(TaskType.CREATE_GBP_POST, requires=("anthropic",))
+        def handle_create_gbp_post(db, task):
+            ...
+    """
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[task_type] = func
+        _requirements[task_type] = tuple(requires)
+        return func
+
+    return decorator
+
+
+def compute_backoff(attempts: int) -> timedelta:
+    """
+    Exponential backoff with +/-20% jitter for the given attempt number.
+    Spreads retries of tasks that failed together (e.g. during an upstream outage).
+    """
+    delay = settings.JOB_QUEUE_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    delay = min(delay, settings.JOB_QUEUE_BACKOFF_MAX_SECONDS)
+    delay *= random.uniform(0.8, 1.2)
+    return timedelta(seconds=delay)
+
+
+class JobQueue:
+    """Operations on the durable job queue."""
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        location_id: uuid.UUID,
+        task_type: TaskType,
+        agent_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        scheduled_at: Optional[datetime] = None,
+        max_attempts: Optional[int] = None,
+        dedupe_key: Optional[str] = None,
+        commit: bool = True
+    ) -> Optional[uuid.UUID]:
+        """
+        Add a job to the queue.
+
+        Args:
+            db: Database session
+            location_id: Location the job belongs to
+            task_type: Type of job (selects the handler)
+            agent_type: Agent responsible for the job
+            payload: Handler arguments
+            scheduled_at: Earliest time the job may run (defaults to now)
+            max_attempts: Attempts before dead-lettering
+            dedupe_key: If set, the job is skipped when a task with the same key exists
+            commit: Commit immediately; pass False to enqueue inside a larger transaction
+
+        Returns:
+            ID of the new task, or None if a task with the same dedupe_key already exists
+        """
+        run = current_run()
+        statement = pg_insert(Task).values(
+            id=uuid.uuid4(),
+            location_id=location_id,
+            agent_type=agent_type,
+            task_type=task_type,
+            status=TaskStatus.PENDING,
+            payload=payload,
+            dedupe_key=dedupe_key,
+            scheduled_at=scheduled_at or datetime.now(timezone.utc),
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_QUEUE_MAX_ATTEMPTS,
+            job_run_id=run.id if run else None
+        ).on_conflict_do_nothing(
+            index_elements=[Task.dedupe_key]
+        ).returning(Task.id)
+
+        task_id = db.execute(statement).scalar()
+
+        if commit:
+            db.commit()
+
+        if task_id is None:
+            logger.debug(f"Skipped duplicate {task_type.value} job ({dedupe_key})")
+
+        return task_id
+
+    @staticmethod
+    def enqueue_many(
+        db: Session,
+        jobs: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> List[str]:
+        """
+        Add many deduplicated jobs with one INSERT per ENQUEUE_MANY_CHUNK jobs,
+        instead of one statement per job.
+
+        Args:
+            db: Database session
+            jobs: Dicts of enqueue() arguments; each must have a dedupe_key
+            commit: Commit immediately; pass False to enqueue inside a larger transaction
+
+        Returns:
+            Dedupe keys of the jobs that were inserted (the rest already existed)
+        """
+        now = datetime.now(timezone.utc)
+        run = current_run()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "location_id": job["location_id"],
+                "agent_type": job["agent_type"],
+                "task_type": job["task_type"],
+                "status": TaskStatus.PENDING,
+                "payload": job.get("payload"),
+                "dedupe_key": job["dedupe_key"],
+                "scheduled_at": job.get("scheduled_at") or now,
+                "attempts": 0,
+                "max_attempts": job.get("max_attempts") or settings.JOB_QUEUE_MAX_ATTEMPTS,
+                "job_run_id": run.id if run else None
+            }
+            for job in jobs
+        ]
+
+        inserted = []
+        for offset in range(0, len(rows), ENQUEUE_MANY_CHUNK):
+            statement = pg_insert(Task).values(rows[offset:offset + ENQUEUE_MANY_CHUNK]).on_conflict_do_nothing(
+                index_elements=[Task.dedupe_key]
+            ).returning(Task.dedupe_key)
+            inserted.extend(db.execute(statement).scalars().all())
+
+        if commit:
+            db.commit()
+
+        return inserted
+
+    @staticmethod
+    def claim_batch(
+        db: Session,
+        worker_id: str,
+        batch_size: int,
+        visibility_timeout: int,
+        task_types: Optional[List[TaskType]] = None
+    ) -> List[Task]:
+        """
+        Claim up to batch_size due tasks for this worker.
+
+        Due tasks are PENDING tasks whose scheduled_at has passed, plus RUNNING
+        tasks whose lease expired (their worker died or hung). Rows locked by
+        another worker's claim are skipped rather than waited on.
+
+        Args:
+            db: Database session
+            worker_id: Identity of the claiming worker
+            batch_size: Maximum number of tasks to claim
+            visibility_timeout: Lease length in seconds
+            task_types: Optionally restrict to these task types
+
+        Returns:
+            Claimed tasks, leased to worker_id
+        """
+        now = datetime.now(timezone.utc)
+
+        query = db.query(Task).filter(
+            or_(
+                and_(Task.status == TaskStatus.PENDING, Task.scheduled_at <= now),
+                and_(Task.status == TaskStatus.RUNNING, Task.locked_until < now)
+            )
+        )
+
+        if task_types:
+            query = query.filter(Task.task_type.in_(task_types))
+
+        candidates = query.order_by(Task.scheduled_at).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for task in candidates:
+            if task.status == TaskStatus.RUNNING and task.attempts >= task.max_attempts:
+                # Lease expired on the final attempt - the task keeps killing its worker
+                task.status = TaskStatus.DEAD
+                task.error_message = f"Visibility timeout expired on final attempt (worker {task.locked_by})"
+                task.locked_by = None
+                task.locked_until = None
+                task.completed_at = now
+                logger.error(f"Dead-lettered task {task.id} after lease expiry")
+                continue
+
+            task.status = TaskStatus.RUNNING
+            task.attempts += 1
+            task.locked_by = worker_id
+            task.locked_until = now + timedelta(seconds=visibility_timeout)
+            task.started_at = now
+            claimed.append(task)
+
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def renew_lease(db: Session, task_id: uuid.UUID, worker_id: str, visibility_timeout: int) -> bool:
+        """
+        Restart a claimed task's lease just before it runs.
+        Fails if the lease expired meanwhile and another worker reclaimed the task.
+
+        Returns:
+            True if worker_id still holds the task
+        """
+        now = datetime.now(timezone.utc)
+        updated = db.query(Task).filter(
+            Task.id == task_id,
+            Task.status == TaskStatus.RUNNING,
+            Task.locked_by == worker_id
+        ).update({
+            Task.locked_until: now + timedelta(seconds=visibility_timeout),
+            Task.started_at: now
+        }, synchronize_session=False)
+        db.commit()
+        return bool(updated)
+
+    @staticmethod
+    def release(db: Session, task_ids: List[uuid.UUID], worker_id: str) -> int:
+        """
+        Hand claimed but unstarted tasks back to the queue, without counting
+        the attempt (e.g. when the worker is stopping).
+
+        Returns:
+            Number of tasks released
+        """
+        if not task_ids:
+            return 0
+
+        count = db.query(Task).filter(
+            Task.id.in_(task_ids),
+            Task.status == TaskStatus.RUNNING,
+            Task.locked_by == worker_id
+        ).update({
+            Task.status: TaskStatus.PENDING,
+            Task.attempts: Task.attempts - 1,
+            Task.locked_by: None,
+            Task.locked_until: None
+        }, synchronize_session=False)
+        db.commit()
+        return count
+
+    @staticmethod
+    def complete(
+        db: Session,
+        task_id: uuid.UUID,
+        worker_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Mark a claimed task as completed.
+        Only succeeds while worker_id still holds the lease.
+        metrics, if given, records the attempt's timing (see job_runs.item_metrics).
+
+        Returns:
+            True if the task was updated
+        """
+        updated = db.query(Task).filter(
+            Task.id == task_id,
+            Task.locked_by == worker_id
+        ).update({
+            Task.status: TaskStatus.COMPLETED,
+            Task.completed_at: datetime.now(timezone.utc),
+            Task.result_data: result,
+            Task.metrics: metrics,
+            Task.error_message: None,
+            Task.locked_by: None,
+            Task.locked_until: None
+        }, synchronize_session=False)
+        db.commit()
+
+        if not updated:
+            logger.warning(f"Task {task_id} completed after its lease was lost by {worker_id}")
+
+        return bool(updated)
+
+    @staticmethod
+    def fail(
+        db: Session,
+        task_id: uuid.UUID,
+        worker_id: str,
+        error: str,
+        metrics: Optional[Dict[str, Any]] = None
+    ) -> Optional[TaskStatus]:
+        """
+        Record a failed attempt: schedule a retry with backoff, or dead-letter
+        the task once it has used all its attempts.
+        Only succeeds while worker_id still holds the lease.
+        metrics, if given, records the attempt's timing (see job_runs.item_metrics).
+
+        Returns:
+            New task status, or None if the lease was lost
+        """
+        task = db.query(Task).filter(
+            Task.id == task_id,
+            Task.locked_by == worker_id
+        ).with_for_update().first()
+
+        if not task:
+            db.rollback()
+            logger.warning(f"Task {task_id} failed after its lease was lost by {worker_id}")
+            return None
+
+        now = datetime.now(timezone.utc)
+        task.error_message = error
+        task.metrics = metrics
+        task.locked_by = None
+        task.locked_until = None
+
+        if task.attempts >= task.max_attempts:
+            task.status = TaskStatus.DEAD
+            task.completed_at = now
+            logger.error(f"Dead-lettered {task.task_type.value} task {task.id} after {task.attempts} attempts: {error}")
+        else:
+            task.status = TaskStatus.PENDING
+            task.scheduled_at = now + compute_backoff(task.attempts)
+            logger.warning(f"Retrying {task.task_type.value} task {task.id} at {task.scheduled_at} (attempt {task.attempts}/{task.max_attempts}): {error}")
+
+        db.commit()
+        return task.status
+
+    @staticmethod
+    def defer(db: Session, task_id: uuid.UUID, worker_id: str, delay: timedelta, reason: str) -> bool:
+        """
+        Put a claimed task back for later without counting the attempt,
+        because an upstream it needs is unavailable.
+        Only succeeds while worker_id still holds the lease.
+
+        Returns:
+            True if the task was deferred
+        """
+        updated = db.query(Task).filter(
+            Task.id == task_id,
+            Task.locked_by == worker_id
+        ).update({
+            Task.status: TaskStatus.PENDING,
+            Task.attempts: Task.attempts - 1,
+            Task.scheduled_at: datetime.now(timezone.utc) + delay,
+            Task.error_message: reason,
+            Task.locked_by: None,
+            Task.locked_until: None
+        }, synchronize_session=False)
+        db.commit()
+        return bool(updated)
+
+    @staticmethod
+    def requeue(db: Session, dedupe_key: str, commit: bool = True) -> bool:
+        """
+        Put a dead-lettered task back on the queue by its dedupe key.
+        Pending, running and completed tasks are left untouched.
+
+        Returns:
+            True if a dead task was requeued
+        """
+        return bool(JobQueue.requeue_many(db, [dedupe_key], commit=commit))
+
+    @staticmethod
+    def requeue_many(db: Session, dedupe_keys: List[str], commit: bool = True) -> int:
+        """
+        requeue() for many dedupe keys in one UPDATE.
+
+        Returns:
+            Number of dead tasks requeued
+        """
+        if not dedupe_keys:
+            return 0
+
+        count = db.query(Task).filter(
+            Task.dedupe_key.in_(dedupe_keys),
+            Task.status == TaskStatus.DEAD
+        ).update({
+            Task.status: TaskStatus.PENDING,
+            Task.attempts: 0,
+            Task.scheduled_at: datetime.now(timezone.utc),
+            Task.completed_at: None
+        }, synchronize_session=False)
+
+        if commit:
+            db.commit()
+
+        return count
+
+    @staticmethod
+    def requeue_dead(db: Session, task_type: Optional[TaskType] = None) -> int:
+        """
+        Move dead-lettered tasks back to the queue with a fresh set of attempts.
+
+        Returns:
+            Number of tasks requeued
+        """
+        query = db.query(Task).filter(Task.status == TaskStatus.DEAD)
+        if task_type:
+            query = query.filter(Task.task_type == task_type)
+
+        count = query.update({
+            Task.status: TaskStatus.PENDING,
+            Task.attempts: 0,
+            Task.scheduled_at: datetime.now(timezone.utc),
+            Task.completed_at: None
+        }, synchronize_session=False)
+        db.commit()
+
+        logger.info(f"Requeued {count} dead-lettered tasks")
+        return count
+
+
+class JobQueueWorker:
+    """
+    Background thread that claims and executes queued tasks.
+    Several workers (threads or processes) can run side by side.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        visibility_timeout: Optional[int] = None
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size or settings.JOB_QUEUE_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.JOB_QUEUE_POLL_SECONDS
+        self.visibility_timeout = visibility_timeout or settings.JOB_QUEUE_VISIBILITY_TIMEOUT_SECONDS
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start polling the queue in a background thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"job-worker-{self.worker_id}", daemon=True)
+        self._thread.start()
+        logger.info(f"Job queue worker {self.worker_id} started")
+
+    def stop(self):
+        """Stop polling; the running task is allowed to finish and the rest of its batch is released."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.visibility_timeout)
+        logger.info(f"Job queue worker {self.worker_id} stopped")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error(f"Job queue worker {self.worker_id} error: {str(e)}")
+                processed = 0
+
+            # Keep draining while there is work; poll when the queue is empty
+            if processed < self.batch_size:
+                self._stop_event.wait(self.poll_interval)
+
+    def run_once(self) -> int:
+        """
+        Claim one batch and execute it.
+
+        Returns:
+            Number of tasks claimed
+        """
+        if not _handlers:
+            return 0
+
+        db = SessionLocal()
+        try:
+            tasks = JobQueue.claim_batch(
+                db,
+                worker_id=self.worker_id,
+                batch_size=self.batch_size,
+                visibility_timeout=self.visibility_timeout,
+                task_types=list(_handlers.keys())
+            )
+
+            for index, task in enumerate(tasks):
+                if self._stop_event.is_set():
+                    released = JobQueue.release(db, [t.id for t in tasks[index:]], self.worker_id)
+                    logger.info(f"Job queue worker {self.worker_id} released {released} unstarted tasks")
+                    break
+                # The batch's lease started at claim time; restart it so this task gets a full timeout
+                if not JobQueue.renew_lease(db, task.id, self.worker_id, self.visibility_timeout):
+                    logger.warning(f"Skipping task {task.id}: lease lost to another worker")
+                    continue
+                self._execute(db, task)
+
+            return len(tasks)
+
+        finally:
+            db.close()
+
+    def _execute(self, db: Session, task: Task):
+        """Run the handler for one task and record the outcome."""
+        task_id = task.id
+        task_type = task.task_type
+        handler = _handlers.get(task_type)
+        start = time.perf_counter()
+
+        try:
+            ensure_available(*_requirements.get(task_type, ()))
+        except CircuitOpenError as e:
+            self._defer(db, task, e.service, e.retry_in, str(e))
+            return
+
+        with collect_stats() as stats:
+            try:
+                if settings.query_tracking_enabled:
+                    with track_queries(f"{task_type.value} task {task_id}") as tracker:
+                        result = handler(db, task)
+                    warn_if_repeated(tracker)
+                else:
+                    result = handler(db, task)
+                item = item_metrics(time.perf_counter() - start, stats)
+                JobQueue.complete(db, task_id, self.worker_id, result, item)
+                logger.info(f"Completed {task_type.value} task {task_id}")
+
+            except CircuitOpenError as e:
+                db.rollback()
+                self._defer(db, task, e.service, e.retry_in, str(e))
+                return
+
+            except QuotaExceededError as e:
+                db.rollback()
+                self._defer(db, task, e.upstream, e.wait, str(e))
+                return
+
+            except Exception as e:
+                db.rollback()
+                item = item_metrics(time.perf_counter() - start, stats, e)
+                logger.error(f"{task_type.value} task {task_id} failed: {str(e)}")
+                JobQueue.fail(db, task_id, self.worker_id, f"{type(e).__name__}: {str(e)}", item)
+
+        observe_job_item(task_type.value, item)
+
+    def _defer(self, db: Session, task: Task, service: str, retry_in: float, reason: str):
+        """Defer a task until an upstream should be back, spread out with jitter."""
+        delay = timedelta(seconds=retry_in + random.uniform(0, settings.JOB_QUEUE_BACKOFF_BASE_SECONDS))
+        if JobQueue.defer(db, task.id, self.worker_id, delay, reason):
+            JOB_ITEM_DEFERRALS.labels(task_type=task.task_type.value, service=service).inc()
+            logger.info(f"Deferred {task.task_type.value} task {task.id} by {delay.total_seconds():.0f}s: {reason}")
+
+
+_workers: List[JobQueueWorker] = []
+
+
+def start_job_workers(count: Optional[int] = None):
+    """Start job queue worker threads for this process."""
+    for _ in range(count or settings.JOB_QUEUE_WORKER_THREADS):
+        worker = JobQueueWorker()
+        worker.start()
+        _workers.append(worker)
+
+
+def stop_job_workers():
+    """Stop all job queue worker threads in this process."""
+    for worker in _workers:
+        worker._stop_event.set()
+    for worker in _workers:
+        worker.stop()
+    _workers.clear()
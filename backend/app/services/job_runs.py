@@ -0,0 +1,212 @@
+"""
+Job run history.
+Every scheduled job invocation is recorded in job_runs with its duration,
+the number of locations it considered, the items it produced and the time
+it spent in the DB and each external service, so job duration can be
+tracked against location count.
+
+Planners do their heavy work through the job queue. Tasks enqueued inside
+a run are tagged with the run's id, and workers store each attempt's
+duration, DB / external time and error class on the task, so a run's
+summary covers the work it fanned out as well as the planning itself.
+
+Runs and task attempts are also exported to Prometheus (see metrics).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import Float, func, text
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import JobRun, JobRunStatus, Task
+from app.services.metrics import RequestStats, collect_stats, observe_job_run
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class JobRunContext:
+    """Results of a run in progress, filled in by the job"""
+
+    def __init__(self, job_name: str):
+        self.id = uuid.uuid4()
+        self.job_name = job_name
+        self.location_count: Optional[int] = None
+        self.items = 0
+        self.result: Dict[str, Any] = {}
+
+
+_current_run: ContextVar[Optional[JobRunContext]] = ContextVar("job_run", default=None)
+
+
+def current_run() -> Optional[JobRunContext]:
+    """Run being recorded in this context, or None."""
+    return _current_run.get()
+
+
+def _write(job_name: str, apply):
+    # History is best effort: a failed write is logged, never raised into the job
+    db = SessionLocal()
+    try:
+        apply(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record {job_name} run: {str(e)}")
+    finally:
+        db.close()
+
+
+@contextmanager
+def job_run(job_name: str):
+    """
+    Record a scheduled job invocation. Exceptions are recorded and re-raised.
+
+    Usage:
+        with job_run("create_gbp_tasks") as run:
+            run.location_count = len(locations)
+            run.items = enqueued
+
+    Yields:
+        JobRunContext
+    """
+    run = JobRunContext(job_name)
+    _write(job_name, lambda db: db.add(JobRun(
+        id=run.id,
+        job_name=job_name,
+        status=JobRunStatus.RUNNING,
+        started_at=datetime.now(timezone.utc),
+        items=0,
+        db_queries=0,
+        db_seconds=0.0
+    )))
+
+    token = _current_run.set(run)
+    start = time.perf_counter()
+    stats = RequestStats()
+    run_status = JobRunStatus.FAILED
+    error = None
+
+    try:
+        with collect_stats() as stats:
+            yield run
+        run_status = JobRunStatus.SUCCEEDED
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_run.reset(token)
+
+        observe_job_run(job_name, run_status.value, duration, run.items, run.location_count, stats)
+        _write(job_name, lambda db: db.query(JobRun).filter(JobRun.id == run.id).update({
+            JobRun.status: run_status,
+            JobRun.finished_at: datetime.now(timezone.utc),
+            JobRun.duration_seconds: duration,
+            JobRun.location_count: run.location_count,
+            JobRun.items: run.items,
+            JobRun.result: run.result or None,
+            JobRun.db_queries: stats.db_queries,
+            JobRun.db_seconds: stats.db_seconds,
+            JobRun.external_seconds: dict(stats.external_seconds) or None,
+            JobRun.error_message: error
+        }, synchronize_session=False))
+
+
+def item_metrics(duration: float, stats: RequestStats, error: Optional[Exception] = None) -> Dict[str, Any]:
+    """Metrics of one queued task attempt, as stored on Task.metrics."""
+    item = {
+        "duration": round(duration, 4),
+        "db_queries": stats.db_queries,
+        "db_seconds": round(stats.db_seconds, 4),
+        "external": {service: round(seconds, 4) for service, seconds in stats.external_seconds.items()}
+    }
+    if error is not None:
+        item["error_class"] = type(error).__name__
+    return item
+
+
+class JobRunService:
+    """Reads job run history"""
+
+    @staticmethod
+    def list_runs(db: Session, job_name: Optional[str] = None, limit: int = 50) -> List[JobRun]:
+        """
+        Most recent runs, newest first.
+
+        Args:
+            db: Database session
+            job_name: Limit to one job
+            limit: Maximum runs to return
+
+        Returns:
+            List of JobRun
+        """
+        query = db.query(JobRun)
+        if job_name:
+            query = query.filter(JobRun.job_name == job_name)
+        return query.order_by(JobRun.started_at.desc()).limit(limit).all()
+
+    @staticmethod
+    def get_run(db: Session, run_id: uuid.UUID) -> Optional[JobRun]:
+        """Get a run by id."""
+        return db.query(JobRun).filter(JobRun.id == run_id).first()
+
+    @staticmethod
+    def get_item_summary(db: Session, run_id: uuid.UUID) -> Dict[str, Any]:
+        """
+        Summarize the queued tasks a run enqueued, from their latest attempts.
+
+        Args:
+            db: Database session
+            run_id: Run UUID
+
+        Returns:
+            Dict with "status" (task count per status), "latency" (p50 / p95 /
+            p99 / max seconds), "error_classes" (count per exception class)
+            and "dependency_seconds" (total per dependency: db and each
+            external service)
+        """
+        statuses = db.query(Task.status, func.count(Task.id)).filter(
+            Task.job_run_id == run_id
+        ).group_by(Task.status).all()
+
+        duration = Task.metrics["duration"].astext.cast(Float)
+        latency_row = db.query(
+            *[func.percentile_cont(p).within_group(duration) for p in PERCENTILES],
+            func.max(duration),
+            func.sum(Task.metrics["db_seconds"].astext.cast(Float))
+        ).filter(
+            Task.job_run_id == run_id,
+            Task.metrics.isnot(None)
+        ).one()
+
+        error_class = Task.metrics["error_class"].astext
+        error_classes = db.query(error_class, func.count(Task.id)).filter(
+            Task.job_run_id == run_id,
+            error_class.isnot(None)
+        ).group_by(error_class).all()
+
+        external = db.execute(text("""
+            SELECT service.key, SUM(service.value::float)
+            FROM tasks, jsonb_each_text(tasks.metrics -> 'external') AS service
+            WHERE tasks.job_run_id = :run_id
+            GROUP BY service.key
+        """), {"run_id": run_id}).all()
+
+        *percentiles, max_duration, db_seconds = latency_row
+        latency = {f"p{int(p * 100)}": value for p, value in zip(PERCENTILES, percentiles)}
+        latency["max"] = max_duration
+
+        return {
+            "status": {task_status.value: count for task_status, count in statuses},
+            "latency": latency,
+            "error_classes": dict(error_classes),
+            "dependency_seconds": {"db": db_seconds or 0.0, **{service: seconds for service, seconds in external}}
+        }
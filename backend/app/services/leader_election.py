@@ -0,0 +1,159 @@
+"""
+Leader election using Postgres session-level advisory locks.
+Ensures exactly one process runs scheduled jobs when the API is scaled
+to several uvicorn workers or replicas.
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from typing import Callable, Optional
+import logging
+import os
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElector:
+    """
+    Campaigns for leadership by taking a Postgres advisory lock on a
+    dedicated connection and holding it for as long as the process lives.
+
+    The lock is released automatically by Postgres when the connection
+    drops, so a crashed leader is replaced by the next process that
+    retries. A heartbeat on the lock connection detects a lost session
+    and demotes this process.
+    """
+
+    def __init__(
+        self,
+        lock_id: int,
+        heartbeat_interval: float,
+        on_elected: Optional[Callable[[], None]] = None,
+        on_demoted: Optional[Callable[[], None]] = None,
+        database_url: Optional[str] = None
+    ):
+        self.lock_id = lock_id
+        self.heartbeat_interval = heartbeat_interval
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Dedicated engine without pooling so a dropped connection is really closed
+        # (and the lock released) instead of being returned to a pool
+        self._engine = create_engine(
+            database_url or settings.DATABASE_URL,
+            poolclass=NullPool,
+            connect_args={
+                "keepalives": 1,
+                "keepalives_idle": 30,
+                "keepalives_interval": 10,
+                "keepalives_count": 3,
+                "application_name": f"sponte-leader-{self.identity}",
+            }
+        )
+        self._connection: Optional[Connection] = None
+        self._is_leader = False
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """True while this process holds the leadership lock."""
+        return self._is_leader
+
+    def start(self):
+        """Start campaigning for leadership in a background thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="leader-election",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Leader election started for {self.identity} (lock {self.lock_id})")
+
+    def stop(self):
+        """Stop campaigning and release leadership if held."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.heartbeat_interval + 5)
+        self._release()
+        self._engine.dispose()
+        logger.info(f"Leader election stopped for {self.identity}")
+
+    def _run(self):
+        """Election loop: try to acquire when follower, heartbeat when leader."""
+        while not self._stop_event.is_set():
+            try:
+                if self._is_leader:
+                    self._heartbeat()
+                else:
+                    self._try_acquire()
+            except Exception as e:
+                logger.error(f"Leader election error on {self.identity}: {str(e)}")
+                self._demote()
+
+            self._stop_event.wait(self.heartbeat_interval)
+
+    def _try_acquire(self):
+        """Attempt to take the advisory lock without blocking."""
+        if self._connection is None:
+            self._connection = self._engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+        acquired = self._connection.execute(
+            text("SELECT pg_try_advisory_lock(:lock_id)"),
+            {"lock_id": self.lock_id}
+        ).scalar()
+
+        if acquired:
+            self._is_leader = True
+            logger.info(f"{self.identity} elected scheduler leader")
+            if self.on_elected:
+                self.on_elected()
+
+    def _heartbeat(self):
+        """Verify the lock session is still alive; demote if not."""
+        try:
+            self._connection.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning(f"Leader heartbeat failed on {self.identity}: {str(e)}")
+            self._demote()
+
+    def _demote(self):
+        """Drop leadership and discard the lock connection."""
+        was_leader = self._is_leader
+        self._is_leader = False
+        self._close_connection()
+
+        if was_leader:
+            logger.warning(f"{self.identity} lost scheduler leadership")
+            if self.on_demoted:
+                try:
+                    self.on_demoted()
+                except Exception as e:
+                    logger.error(f"Leader demotion callback failed: {str(e)}")
+
+    def _release(self):
+        """Explicitly unlock before closing so a follower can take over immediately."""
+        if self._connection is not None and self._is_leader:
+            try:
+                self._connection.execute(
+                    text("SELECT pg_advisory_unlock(:lock_id)"),
+                    {"lock_id": self.lock_id}
+                )
+            except Exception as e:
+                logger.warning(f"Failed to release leader lock: {str(e)}")
+        self._demote()
+
+    def _close_connection(self):
+        if self._connection is not None:
+            try:
+                self._connection.invalidate()
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
@@ -0,0 +1,270 @@
+"""
+Prometheus metrics.
+Records per-route request latency, DB query count and DB time per request
+(from SQLAlchemy cursor events), and outbound call time per external
+service, exposed in Prometheus text format on /metrics.
+
+Per-request DB and external totals are accumulated on a RequestStats object
+held in a context variable set by the middleware. Sync dependencies and
+endpoints run in a threadpool with a copy of the context, which still
+points at the same object. Scheduled job runs and queued tasks collect
+their own totals the same way (see job_runs); other background work
+(outbox sender) is counted in the global DB and external metrics only.
+
+With several worker processes, PROMETHEUS_MULTIPROC_DIR must point at a
+shared empty directory so /metrics aggregates every worker (start.py sets
+it for its workers).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi import Request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+JOB_DURATION_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+ITEM_COUNT_BUCKETS = (0, 1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "DB queries per HTTP request", ["method", "route"], buckets=QUERY_COUNT_BUCKETS
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "DB time per HTTP request", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUEST_EXTERNAL_SECONDS = Histogram(
+    "http_request_external_seconds", "Outbound call time per HTTP request", ["method", "route", "service"], buckets=LATENCY_BUCKETS
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "DB query latency", buckets=LATENCY_BUCKETS
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds", "Outbound call latency", ["service", "outcome"], buckets=LATENCY_BUCKETS
+)
+OUTBOUND_RETRIES = Counter(
+    "outbound_retries_total", "Outbound HTTP request retries", ["service", "reason"]
+)
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes", ["service", "state"]
+)
+QUOTA_WAIT_SECONDS = Histogram(
+    "quota_wait_seconds", "Time spent waiting for an upstream quota token", ["upstream"], buckets=LATENCY_BUCKETS
+)
+QUOTA_REJECTIONS = Counter(
+    "quota_rejections_total", "Calls given up on because no quota token came in time", ["upstream"]
+)
+QUOTA_THROTTLES = Counter(
+    "quota_throttles_total", "429 responses that backed off a quota bucket", ["upstream", "scope"]
+)
+AI_CALL_DURATION = Histogram(
+    "ai_call_duration_seconds", "AI generation latency", ["model", "operation", "outcome"], buckets=LATENCY_BUCKETS
+)
+AI_TOKENS = Counter(
+    "ai_tokens_total", "AI tokens used", ["model", "agent_type", "kind"]
+)
+AI_COST = Counter(
+    "ai_cost_usd_total", "Estimated AI spend in USD", ["model", "agent_type"]
+)
+JOB_RUN_DURATION = Histogram(
+    "job_run_duration_seconds", "Scheduled job run duration", ["job", "status"], buckets=JOB_DURATION_BUCKETS
+)
+JOB_RUN_ITEMS = Histogram(
+    "job_run_items", "Items produced or processed per scheduled job run", ["job"], buckets=ITEM_COUNT_BUCKETS
+)
+JOB_RUN_LOCATIONS = Histogram(
+    "job_run_locations", "Locations considered per scheduled job run", ["job"], buckets=ITEM_COUNT_BUCKETS
+)
+JOB_RUN_DEPENDENCY_SECONDS = Histogram(
+    "job_run_dependency_seconds", "Time per scheduled job run spent in the DB or an external service", ["job", "dependency"], buckets=JOB_DURATION_BUCKETS
+)
+JOB_ITEM_DURATION = Histogram(
+    "job_item_duration_seconds", "Queued task execution time", ["task_type", "outcome"], buckets=JOB_DURATION_BUCKETS
+)
+JOB_ITEM_DEPENDENCY_SECONDS = Histogram(
+    "job_item_dependency_seconds", "Time per queued task spent in the DB or an external service", ["task_type", "dependency"], buckets=LATENCY_BUCKETS
+)
+JOB_ITEM_ERRORS = Counter(
+    "job_item_errors_total", "Failed queued task attempts", ["task_type", "error_class"]
+)
+JOB_ITEM_DEFERRALS = Counter(
+    "job_item_deferrals_total", "Queued tasks deferred because an upstream was unavailable", ["task_type", "service"]
+)
+
+
+class RequestStats:
+    """DB and outbound call totals for one request"""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.external_seconds: Dict[str, float] = defaultdict(float)
+
+    def breakdown(self) -> Dict[str, float]:
+        """Seconds per dependency: "db" plus one entry per external service."""
+        return {"db": self.db_seconds, **self.external_seconds}
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def get_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled, or None outside a request."""
+    return _request_stats.get()
+
+
+@contextmanager
+def collect_stats():
+    """
+    Accumulate DB and outbound call totals for a block of work outside a
+    request, in this context.
+
+    Yields:
+        RequestStats
+    """
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_DURATION.observe(elapsed)
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement executed through an engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def track_external(service: str):
+    """
+    Time an outbound call to an external service.
+
+    Usage:
+        with track_external("anthropic"):
+            client.messages.create(...)
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - start
+        EXTERNAL_CALL_DURATION.labels(service=service, outcome=outcome).observe(elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.external_seconds[service] += elapsed
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Record latency, DB and outbound call totals per route."""
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    start = time.perf_counter()
+    status_code = 500
+
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        _request_stats.reset(token)
+
+        # Label by route template, not raw path, to bound cardinality
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        method = request.method
+
+        HTTP_REQUESTS.labels(method=method, route=route_path, status=str(status_code)).inc()
+        HTTP_REQUEST_DURATION.labels(method=method, route=route_path).observe(elapsed)
+        HTTP_REQUEST_DB_QUERIES.labels(method=method, route=route_path).observe(stats.db_queries)
+        HTTP_REQUEST_DB_SECONDS.labels(method=method, route=route_path).observe(stats.db_seconds)
+        for service, seconds in stats.external_seconds.items():
+            HTTP_REQUEST_EXTERNAL_SECONDS.labels(method=method, route=route_path, service=service).observe(seconds)
+
+
+def observe_ai_call(model: str, agent_type: str, operation: str, outcome: str, latency: float, tokens: Dict[str, int], cost: Optional[float]):
+    """Record one AI generation (outcome is success, parse_error or error)."""
+    AI_CALL_DURATION.labels(model=model, operation=operation, outcome=outcome).observe(latency)
+    for kind, count in tokens.items():
+        if count:
+            AI_TOKENS.labels(model=model, agent_type=agent_type, kind=kind).inc(count)
+    if cost:
+        AI_COST.labels(model=model, agent_type=agent_type).inc(cost)
+
+
+def observe_job_run(job: str, status: str, duration: float, items: int, location_count: Optional[int], stats: RequestStats):
+    """Record a finished scheduled job run."""
+    JOB_RUN_DURATION.labels(job=job, status=status).observe(duration)
+    JOB_RUN_ITEMS.labels(job=job).observe(items)
+    if location_count is not None:
+        JOB_RUN_LOCATIONS.labels(job=job).observe(location_count)
+    for dependency, seconds in stats.breakdown().items():
+        JOB_RUN_DEPENDENCY_SECONDS.labels(job=job, dependency=dependency).observe(seconds)
+
+
+def observe_job_item(task_type: str, item: Dict[str, Any]):
+    """Record one queued task attempt (a dict built by job_runs.item_metrics)."""
+    error_class = item.get("error_class")
+    outcome = "error" if error_class else "success"
+    JOB_ITEM_DURATION.labels(task_type=task_type, outcome=outcome).observe(item["duration"])
+    JOB_ITEM_DEPENDENCY_SECONDS.labels(task_type=task_type, dependency="db").observe(item["db_seconds"])
+    for service, seconds in item["external"].items():
+        JOB_ITEM_DEPENDENCY_SECONDS.labels(task_type=task_type, dependency=service).observe(seconds)
+    if error_class:
+        JOB_ITEM_ERRORS.labels(task_type=task_type, error_class=error_class).inc()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Current metrics in Prometheus text format.
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
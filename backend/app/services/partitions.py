@@ -0,0 +1,212 @@
+"""
+Partition maintenance.
+agent_tasks and agent_outputs are range-partitioned by month on created_at
+(partitions named <table>_pYYYY_MM, plus a <table>_default catch-all).
+Time-bounded and most-recent queries prune to the months they touch, and
+vacuum and index maintenance work on one month at a time.
+
+A daily job keeps PARTITION_PREMAKE_MONTHS of future partitions in place
+so inserts don't land in the default partition (rows that did are moved
+out when their month's partition is created), and detaches partitions
+older than PARTITION_RETENTION_MONTHS. A month's agent_tasks and
+agent_outputs partitions are detached together, in one transaction, so
+attached outputs don't point at detached tasks (agent_outputs.task_id has
+no foreign key to stop it). Detached partitions are left as standalone
+tables to be archived or dropped. Rollup rebuilds don't reach below the
+retention cutoff, where the source rows are gone (see retention_cutoff).
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.config import settings
+from collections import defaultdict
+from datetime import date, datetime
+from typing import List, Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("agent_tasks", "agent_outputs")
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    """First day of a date's month."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """First day of the month `months` after value's month."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of a table's partition for a month."""
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month a partition covers, from its name (None for the default partition)."""
+    match = _PARTITION_SUFFIX.search(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def retention_cutoff(today: Optional[date] = None, retention_months: Optional[int] = None) -> Optional[date]:
+    """
+    First month still attached after retention; rows created before it
+    have been (or are about to be) detached.
+
+    Args:
+        today: Current date (defaults to today, UTC)
+        retention_months: Override PARTITION_RETENTION_MONTHS
+
+    Returns:
+        First day of the oldest retained month, or None if nothing is detached
+    """
+    retention_months = retention_months if retention_months is not None else settings.PARTITION_RETENTION_MONTHS
+    if retention_months <= 0:
+        return None
+    return add_months(month_start(today or datetime.utcnow().date()), -retention_months)
+
+
+class PartitionManager:
+    """Creates and detaches monthly partitions"""
+
+    @staticmethod
+    def list_partitions(db: Session, table: str) -> List[str]:
+        """
+        Attached partitions of a table.
+
+        Args:
+            db: Database session
+            table: Partitioned parent table
+
+        Returns:
+            Partition table names
+        """
+        rows = db.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            ORDER BY child.relname
+        """), {"table": table}).all()
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def create_partition(db: Session, table: str, month: date) -> bool:
+        """
+        Create a table's partition for a month if it doesn't exist. Does not commit.
+
+        Postgres refuses to create a partition while the default partition
+        holds rows in its range (after a gap in maintenance, or rows with a
+        back-dated created_at). Those rows are moved into the new partition:
+        the default is detached, the partition created and filled, and the
+        default re-attached, all in the caller's transaction.
+
+        Args:
+            db: Database session
+            table: Partitioned parent table
+            month: Any date in the month
+
+        Returns:
+            True if the partition was created
+        """
+        month = month_start(month)
+        name = partition_name(table, month)
+        if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+            return False
+
+        default = f"{table}_default"
+        bounds = {"start": month, "end": add_months(month, 1)}
+        in_range = "created_at >= :start AND created_at < :end"
+        create = (
+            f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+
+        stranded = db.execute(text(f'SELECT count(*) FROM "{default}" WHERE {in_range}'), bounds).scalar()
+        if not stranded:
+            db.execute(text(create))
+            logger.info(f"Created partition {name}")
+            return True
+
+        db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"'))
+        db.execute(text(create))
+        db.execute(text(f'INSERT INTO "{name}" SELECT * FROM "{default}" WHERE {in_range}'), bounds)
+        db.execute(text(f'DELETE FROM "{default}" WHERE {in_range}'), bounds)
+        db.execute(text(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT'))
+        logger.info(f"Created partition {name} and moved {stranded} rows into it from {default}")
+        return True
+
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: Optional[int] = None, today: Optional[date] = None) -> int:
+        """
+        Create partitions from the current month through `months_ahead` months
+        ahead for every partitioned table. Each partition is committed on its
+        own; one that fails is logged and skipped, and the rest still go ahead.
+
+        Args:
+            db: Database session
+            months_ahead: Override PARTITION_PREMAKE_MONTHS
+            today: Current date (defaults to today, UTC)
+
+        Returns:
+            Number of partitions created
+        """
+        months_ahead = months_ahead if months_ahead is not None else settings.PARTITION_PREMAKE_MONTHS
+        current = month_start(today or datetime.utcnow().date())
+
+        created = 0
+        for table in PARTITIONED_TABLES:
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                try:
+                    if PartitionManager.create_partition(db, table, month):
+                        created += 1
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Failed to create partition {partition_name(table, month)}: {str(e)}")
+        return created
+
+    @staticmethod
+    def detach_old_partitions(db: Session, retention_months: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+        """
+        Detach partitions whose whole month is older than the retention period.
+        Each month's partitions of every table are detached in one
+        transaction. A retention of 0 disables detaching.
+
+        Args:
+            db: Database session
+            retention_months: Override PARTITION_RETENTION_MONTHS
+            today: Current date (defaults to today, UTC)
+
+        Returns:
+            Names of the detached partitions
+        """
+        cutoff = retention_cutoff(today, retention_months)
+        if cutoff is None:
+            return []
+
+        # Month -> attached partitions of that month, across tables
+        expired = defaultdict(list)
+        for table in PARTITIONED_TABLES:
+            for name in PartitionManager.list_partitions(db, table):
+                month = partition_month(name)
+                if month is not None and month < cutoff:
+                    expired[month].append((table, name))
+
+        detached = []
+        for month in sorted(expired):
+            for table, name in expired[month]:
+                db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            db.commit()
+            names = [name for _, name in expired[month]]
+            detached.extend(names)
+            logger.info(f"Detached partitions {', '.join(names)} (older than {cutoff})")
+        return detached
@@ -0,0 +1,137 @@
+"""
+Query tracking.
+Counts the statements executed within a block of work (a request, a job,
+a test) and groups them by shape - the SQL text with parameters left as
+placeholders - so N+1 patterns show up as the same shape repeated.
+
+In development the middleware and job queue worker track every request
+and job, logging a warning (and setting X-Query-Count / X-Query-Repeats
+response headers) when a shape repeats QUERY_REPEAT_THRESHOLD times or
+more. In tests, assert_max_queries fails when a budget is exceeded:
+
+    def test_approve_post(db, output):
+        with assert_max_queries(3):
+            GBPAgentService.approve_post(db, output.id)
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from collections import Counter
+from typing import List, Optional, Tuple
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by assert_max_queries when a block runs too many statements"""
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions that differ only in parameters match."""
+    # Expanded IN lists vary in length with their parameters
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryTracker:
+    """Statements executed within one tracked block"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.shapes: Counter = Counter()
+
+    @property
+    def count(self) -> int:
+        return sum(self.shapes.values())
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Shapes executed at least `threshold` times, most repeated first."""
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self, threshold: Optional[int] = None) -> str:
+        """Human-readable summary of shapes executed at least `threshold` times."""
+        lines = [f"{self.label}: {self.count} queries"]
+        for shape, n in self.repeated(threshold):
+            lines.append(f"  {n}x {shape[:300]}")
+        return "\n".join(lines)
+
+
+_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _tracker.get()
+    if tracker is not None:
+        tracker.shapes[statement_shape(statement)] += 1
+
+
+def instrument_engine(engine: Engine):
+    """Record statements executed through an engine in the active tracker."""
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(label: str):
+    """
+    Track statements executed in a block, in this context.
+    Nested blocks are tracked separately.
+
+    Yields:
+        QueryTracker
+    """
+    tracker = QueryTracker(label)
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int, label: str = "block", max_repeats: Optional[int] = None):
+    """
+    Fail if a block executes more than `budget` statements, or (when
+    max_repeats is given) any one statement shape more than max_repeats times.
+
+    Raises:
+        QueryBudgetExceeded
+    """
+    with track_queries(label) as tracker:
+        yield tracker
+
+    if tracker.count > budget:
+        raise QueryBudgetExceeded(f"Query budget of {budget} exceeded\n{tracker.report(threshold=1)}")
+    if max_repeats is not None:
+        over = [(shape, n) for shape, n in tracker.shapes.most_common() if n > max_repeats]
+        if over:
+            raise QueryBudgetExceeded(
+                f"Statement repeated more than {max_repeats} times\n{tracker.report(threshold=max_repeats + 1)}"
+            )
+
+
+def warn_if_repeated(tracker: QueryTracker):
+    """Log a warning when a tracked block repeated a statement shape."""
+    if tracker.repeated():
+        logger.warning(f"Possible N+1 queries in {tracker.report()}")
+
+
+async def query_tracking_middleware(request: Request, call_next):
+    """Flag repeated statement shapes per request (development only)."""
+    with track_queries(f"{request.method} {request.url.path}") as tracker:
+        response = await call_next(request)
+
+    response.headers["X-Query-Count"] = str(tracker.count)
+    repeats = tracker.repeated()
+    if repeats:
+        response.headers["X-Query-Repeats"] = str(max(n for _, n in repeats))
+        warn_if_repeated(tracker)
+    return response
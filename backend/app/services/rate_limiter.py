@@ -0,0 +1,273 @@
+"""
+Upstream rate limiting.
+Token buckets that callers acquire from before each request to an upstream
+with quotas, so scheduled bursts (insight fetches, posting, review sync)
+are spread out instead of all hitting a per-minute limit and failing
+together.
+
+A call usually takes a token from several buckets at once - e.g. the
+Google Cloud project and the GBP account - and only goes ahead when all
+of them have one. Callers wait for tokens up to QUOTA_MAX_WAIT_SECONDS,
+then get QuotaExceededError.
+
+When the upstream answers 429 anyway, the buckets involved back off
+adaptively: their rate is multiplied by QUOTA_BACKOFF_FACTOR (down to
+QUOTA_MIN_RATE_FACTOR), they stop handing out tokens until Retry-After
+has passed, and the rate climbs back to full over QUOTA_RECOVERY_SECONDS.
+
+Bucket state lives in quota_buckets (QUOTA_BACKEND=postgres), so API and
+worker processes share it; rows are locked in key order while tokens are
+taken. QUOTA_BACKEND=memory keeps it in the process, for tests and single
+process setups:
+
+    set_quota_store(MemoryQuotaStore())
+"""
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.config import settings
+from app.database import SessionLocal
+from app.models import QuotaBucket
+from app.services.metrics import QUOTA_REJECTIONS, QUOTA_THROTTLES, QUOTA_WAIT_SECONDS
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Bucket:
+    """A token bucket: a per-minute rate for one upstream scope"""
+
+    def __init__(self, upstream: str, scope: str, per_minute: float, identity: Optional[str] = None):
+        self.upstream = upstream
+        self.scope = scope
+        self.key = f"{upstream}:{scope}:{identity}" if identity else f"{upstream}:{scope}"
+        self.per_second = per_minute / 60
+        self.capacity = max(self.per_second * settings.QUOTA_BURST_SECONDS, 1.0)
+
+    def __repr__(self):
+        return f"<Bucket {self.key} {self.per_second * 60:g}/min>"
+
+
+class BucketState:
+    """In-process bucket state, with the same fields as QuotaBucket"""
+
+    def __init__(self, tokens: float, updated_at: datetime):
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.rate_factor = 1.0
+        self.blocked_until: Optional[datetime] = None
+
+
+class QuotaExceededError(Exception):
+    """Raised when no quota token became available within the allowed wait"""
+
+    def __init__(self, upstream: str, wait: float):
+        super().__init__(f"{upstream} quota exhausted (next token in {wait:.1f}s)")
+        self.upstream = upstream
+        self.wait = wait
+
+
+def _refill(state, bucket: Bucket, now: datetime):
+    # Rate recovers linearly after a backoff; tokens accrue at the current rate
+    elapsed = max((now - state.updated_at).total_seconds(), 0.0)
+    state.rate_factor = min(1.0, state.rate_factor + elapsed / settings.QUOTA_RECOVERY_SECONDS)
+    state.tokens = min(bucket.capacity, state.tokens + elapsed * bucket.per_second * state.rate_factor)
+    state.updated_at = now
+
+
+def take(states: Sequence, buckets: Sequence[Bucket], cost: float, now: datetime) -> float:
+    """
+    Take `cost` tokens from every bucket, or none.
+
+    Args:
+        states: Bucket state per bucket (QuotaBucket rows or BucketState)
+        buckets: The buckets, in the same order
+        cost: Tokens the call needs
+        now: Current time
+
+    Returns:
+        0 when taken, otherwise seconds until all buckets can cover it
+    """
+    wait = 0.0
+    for state, bucket in zip(states, buckets):
+        _refill(state, bucket, now)
+        if state.blocked_until is not None and state.blocked_until > now:
+            wait = max(wait, (state.blocked_until - now).total_seconds())
+        if state.tokens < cost:
+            wait = max(wait, (cost - state.tokens) / (bucket.per_second * state.rate_factor))
+
+    if wait > 0:
+        return wait
+    for state in states:
+        state.tokens -= cost
+    return 0.0
+
+
+def throttle(state, bucket: Bucket, retry_after: Optional[float], now: datetime):
+    """Back a bucket off after a 429."""
+    _refill(state, bucket, now)
+    state.rate_factor = max(state.rate_factor * settings.QUOTA_BACKOFF_FACTOR, settings.QUOTA_MIN_RATE_FACTOR)
+    state.tokens = min(state.tokens, 0.0)
+    if retry_after:
+        state.blocked_until = now + timedelta(seconds=retry_after)
+
+
+class MemoryQuotaStore:
+    """Bucket state in this process only"""
+
+    def __init__(self):
+        self._states: Dict[str, BucketState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, bucket: Bucket, now: datetime) -> BucketState:
+        if bucket.key not in self._states:
+            self._states[bucket.key] = BucketState(bucket.capacity, now)
+        return self._states[bucket.key]
+
+    def try_acquire(self, buckets: Sequence[Bucket], cost: float) -> float:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            return take([self._state(bucket, now) for bucket in buckets], buckets, cost, now)
+
+    def throttle(self, buckets: Sequence[Bucket], retry_after: Optional[float]):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for bucket in buckets:
+                throttle(self._state(bucket, now), bucket, retry_after, now)
+
+
+class PostgresQuotaStore:
+    """Bucket state in quota_buckets, shared by every process"""
+
+    def __init__(self):
+        self._known_keys = set()
+
+    def _locked_rows(self, db, buckets: Sequence[Bucket], now: datetime) -> List[QuotaBucket]:
+        new = [bucket for bucket in buckets if bucket.key not in self._known_keys]
+        if new:
+            db.execute(pg_insert(QuotaBucket).values([
+                {"key": bucket.key, "tokens": bucket.capacity, "updated_at": now, "rate_factor": 1.0}
+                for bucket in new
+            ]).on_conflict_do_nothing(index_elements=[QuotaBucket.key]))
+
+        # Lock in key order so callers sharing buckets can't deadlock
+        rows = db.query(QuotaBucket).filter(
+            QuotaBucket.key.in_([bucket.key for bucket in buckets])
+        ).order_by(QuotaBucket.key).with_for_update().all()
+        by_key = {row.key: row for row in rows}
+        return [by_key[bucket.key] for bucket in buckets]
+
+    def try_acquire(self, buckets: Sequence[Bucket], cost: float) -> float:
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            wait = take(self._locked_rows(db, buckets, now), buckets, cost, now)
+            db.commit()
+            self._known_keys.update(bucket.key for bucket in buckets)
+            return wait
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def throttle(self, buckets: Sequence[Bucket], retry_after: Optional[float]):
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            for row, bucket in zip(self._locked_rows(db, buckets, now), buckets):
+                throttle(row, bucket, retry_after, now)
+            db.commit()
+            self._known_keys.update(bucket.key for bucket in buckets)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class QuotaManager:
+    """Hands out upstream quota tokens from a store"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def acquire(self, buckets: Sequence[Bucket], cost: float = 1.0, max_wait: Optional[float] = None) -> float:
+        """
+        Wait until every bucket has `cost` tokens and take them.
+        If the store itself fails, the call is let through.
+
+        Args:
+            buckets: Buckets the call counts against (same upstream)
+            cost: Tokens the call needs
+            max_wait: Longest to wait (defaults to QUOTA_MAX_WAIT_SECONDS)
+
+        Returns:
+            Seconds waited
+
+        Raises:
+            QuotaExceededError: No tokens within max_wait
+        """
+        upstream = buckets[0].upstream
+        max_wait = settings.QUOTA_MAX_WAIT_SECONDS if max_wait is None else max_wait
+        start = time.monotonic()
+
+        while True:
+            try:
+                wait = self.store.try_acquire(buckets, cost)
+            except Exception as e:
+                # Rate limiting protects the upstream; it shouldn't take calls down with it
+                logger.error(f"Quota store failed, not limiting {upstream} call: {str(e)}")
+                return time.monotonic() - start
+
+            waited = time.monotonic() - start
+            if wait <= 0:
+                QUOTA_WAIT_SECONDS.labels(upstream=upstream).observe(waited)
+                return waited
+            if waited + wait > max_wait:
+                QUOTA_REJECTIONS.labels(upstream=upstream).inc()
+                raise QuotaExceededError(upstream, wait)
+
+            # Jitter so waiting callers don't all retry the same row at once
+            time.sleep(wait + random.uniform(0, min(wait, 0.25)))
+
+    def throttled(self, buckets: Sequence[Bucket], retry_after: Optional[float] = None):
+        """
+        Back the buckets off after the upstream answered 429.
+
+        Args:
+            buckets: Buckets the call counted against
+            retry_after: Seconds from the Retry-After header, if any
+        """
+        for bucket in buckets:
+            QUOTA_THROTTLES.labels(upstream=bucket.upstream, scope=bucket.scope).inc()
+        logger.warning(f"{buckets[0].upstream} answered 429; backing off {', '.join(bucket.key for bucket in buckets)}")
+        try:
+            self.store.throttle(buckets, retry_after)
+        except Exception as e:
+            logger.error(f"Failed to back off {buckets[0].upstream} quota: {str(e)}")
+
+
+_manager: Optional[QuotaManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_quota_manager() -> QuotaManager:
+    """The process-wide quota manager, on the store QUOTA_BACKEND selects."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            store = MemoryQuotaStore() if settings.QUOTA_BACKEND == "memory" else PostgresQuotaStore()
+            _manager = QuotaManager(store)
+        return _manager
+
+
+def set_quota_store(store):
+    """Swap the store behind the quota manager (e.g. MemoryQuotaStore in tests)."""
+    global _manager
+    with _manager_lock:
+        _manager = QuotaManager(store)
@@ -0,0 +1,167 @@
+"""
+Report archival.
+Reports older than REPORT_ARCHIVE_AFTER_DAYS have their full data
+compressed into report_archives, and Report.data is replaced with a small
+summary (period and metrics) that listings use. That keeps the hot reports
+table and its indexes small; the freed JSONB space is reclaimed by
+autovacuum. Readers that need the full data call get_data, which
+rehydrates archived reports transparently.
+
+zstd is used when the zstandard package is installed, gzip otherwise.
+Each archive row records its codec, so both can be read back.
+"""
+
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Report, ReportArchive
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import gzip
+import json
+import logging
+
+try:
+    import zstandard
+except ImportError:  # Optional - falls back to gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Keys of Report.data kept on archived reports for listings
+SUMMARY_KEYS = ("period", "metrics")
+
+
+def get_codec() -> str:
+    """Codec new archives are written with."""
+    if settings.REPORT_ARCHIVE_CODEC == "zstd" and zstandard is None:
+        return "gzip"
+    return settings.REPORT_ARCHIVE_CODEC
+
+
+def compress(data: Dict[str, Any], codec: str) -> bytes:
+    """Compress report data as compact JSON."""
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    if codec == "gzip":
+        return gzip.compress(raw, compresslevel=9)
+    raise ValueError(f"Unknown report archive codec {codec}")
+
+
+def decompress(blob: bytes, codec: str) -> Dict[str, Any]:
+    """Inverse of compress."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archived report uses zstd but the zstandard package is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    elif codec == "gzip":
+        raw = gzip.decompress(blob)
+    else:
+        raise ValueError(f"Unknown report archive codec {codec}")
+    return json.loads(raw)
+
+
+def summarize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Summary kept in Report.data once a report is archived."""
+    return {key: data[key] for key in SUMMARY_KEYS if key in data}
+
+
+class ReportArchiveService:
+    """Moves old report data into compressed archives and reads it back"""
+
+    @staticmethod
+    def get_data(db: Session, report: Report) -> Dict[str, Any]:
+        """
+        Full data of a report, rehydrated from its archive if archived.
+
+        Args:
+            db: Database session
+            report: Report
+
+        Returns:
+            Report data dict
+        """
+        if report.archived_at is None:
+            return report.data
+
+        archive = db.query(ReportArchive).filter(ReportArchive.report_id == report.id).first()
+        if not archive:
+            logger.error(f"Report {report.id} is marked archived but has no archive row")
+            return report.data
+        return decompress(archive.data, archive.codec)
+
+    @staticmethod
+    def archive_batch(db: Session, older_than: datetime, limit: int) -> Tuple[int, int, int]:
+        """
+        Archive one batch of reports created before a cutoff. Commits.
+        Rows are locked with SKIP LOCKED, so concurrent runs don't collide.
+
+        Args:
+            db: Database session
+            older_than: Archive reports created before this time
+            limit: Maximum reports to archive
+
+        Returns:
+            Tuple of (reports archived, original bytes, compressed bytes)
+        """
+        codec = get_codec()
+        reports = db.query(Report).filter(
+            Report.archived_at.is_(None),
+            Report.created_at < older_than
+        ).order_by(Report.created_at).limit(limit).with_for_update(skip_locked=True).all()
+
+        original_total = compressed_total = 0
+        now = datetime.now(timezone.utc)
+
+        for report in reports:
+            original_size = len(json.dumps(report.data, separators=(",", ":")).encode())
+            blob = compress(report.data, codec)
+            db.add(ReportArchive(
+                report_id=report.id,
+                codec=codec,
+                data=blob,
+                original_size=original_size,
+                compressed_size=len(blob),
+                archived_at=now
+            ))
+            report.data = summarize(report.data)
+            report.archived_at = now
+
+            original_total += original_size
+            compressed_total += len(blob)
+
+        db.commit()
+        return len(reports), original_total, compressed_total
+
+    @staticmethod
+    def archive_old_reports(db: Session, max_age_days: Optional[int] = None) -> int:
+        """
+        Archive every report older than the configured age, batch by batch.
+
+        Args:
+            db: Database session
+            max_age_days: Override REPORT_ARCHIVE_AFTER_DAYS
+
+        Returns:
+            Number of reports archived
+        """
+        age = max_age_days if max_age_days is not None else settings.REPORT_ARCHIVE_AFTER_DAYS
+        older_than = datetime.now(timezone.utc) - timedelta(days=age)
+
+        archived = original_total = compressed_total = 0
+        while True:
+            count, original_size, compressed_size = ReportArchiveService.archive_batch(
+                db, older_than, settings.REPORT_ARCHIVE_BATCH_SIZE
+            )
+            archived += count
+            original_total += original_size
+            compressed_total += compressed_size
+            if count < settings.REPORT_ARCHIVE_BATCH_SIZE:
+                break
+
+        if archived:
+            logger.info(
+                f"Archived {archived} reports older than {age} days with {get_codec()}: "
+                f"{original_total} -> {compressed_total} bytes"
+            )
+        return archived
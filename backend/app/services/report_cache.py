@@ -0,0 +1,181 @@
+"""
+Report response cache.
+Report data never changes after a report is created, so the serialized
+JSON for GET /report/{id} and /latest is kept in an in-process LRU keyed by
+report id. The only mutable field is email_sent, which the outbox sender
+stamps from another process, so each entry carries a strong ETag derived
+from id + created_at + email_sent. Reads validate against those three
+columns (a primary key lookup that never touches the JSONB data) and reuse
+the cached bytes - or answer 304 - when the ETag still matches.
+(email_recipients is set at most once, on a report created without them,
+and its email is queued at the same time; other workers may serve the old
+body until the send stamps email_sent.)
+"""
+
+from app.config import settings
+from app.models import Report, ReportType
+from app.schemas.report import ReportResponse
+from app.services.report_archive import ReportArchiveService
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import desc, select, union_all
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+import hashlib
+import logging
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_cache: "OrderedDict[uuid.UUID, Tuple[str, bytes]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compute_etag(report_id: uuid.UUID, created_at: datetime, email_sent: Optional[datetime]) -> str:
+    """
+    Strong ETag for a report response.
+
+    Args:
+        report_id: Report UUID
+        created_at: Report creation time
+        email_sent: When the report email was delivered, if it has been
+
+    Returns:
+        Quoted ETag header value
+    """
+    version = f"{report_id}:{created_at.isoformat()}:{email_sent.isoformat() if email_sent else ''}"
+    return f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"'
+
+
+def combine_etags(*etags: Optional[str]) -> str:
+    """ETag for a response built from several reports (missing reports count too)."""
+    version = ",".join(etag or "-" for etag in etags)
+    return f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag.
+    Uses the weak comparison RFC 9110 specifies for If-None-Match, so a
+    W/ prefix added by a proxy still matches. Pass etag=None when there is
+    no current representation; then nothing matches, not even "*".
+    """
+    if not if_none_match or etag is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def cache_control() -> str:
+    """Cache-Control for report responses (per-user data, revalidate when stale)."""
+    return f"private, max-age={settings.REPORT_CACHE_MAX_AGE_SECONDS}, must-revalidate"
+
+
+def _get(report_id: uuid.UUID, etag: str) -> Optional[bytes]:
+    with _cache_lock:
+        entry = _cache.get(report_id)
+        if entry is None or entry[0] != etag:
+            return None
+        _cache.move_to_end(report_id)
+        return entry[1]
+
+
+def _put(report_id: uuid.UUID, etag: str, body: bytes):
+    with _cache_lock:
+        _cache[report_id] = (etag, body)
+        _cache.move_to_end(report_id)
+        while len(_cache) > settings.REPORT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def invalidate(report_id: uuid.UUID):
+    """Drop a report's cached response."""
+    with _cache_lock:
+        _cache.pop(report_id, None)
+
+
+class ReportCacheService:
+    """Serves report responses from the LRU, loading full rows only on a miss"""
+
+    @staticmethod
+    def get_report_version(db: Session, report_id: uuid.UUID) -> Optional[str]:
+        """
+        Current ETag of a report, without loading its data.
+
+        Args:
+            db: Database session
+            report_id: Report UUID
+
+        Returns:
+            ETag, or None if the report doesn't exist
+        """
+        row = db.query(Report.id, Report.created_at, Report.email_sent).filter(
+            Report.id == report_id
+        ).first()
+        return compute_etag(*row) if row else None
+
+    @staticmethod
+    def get_latest_versions(db: Session, location_id: uuid.UUID) -> Dict[ReportType, Tuple[uuid.UUID, str]]:
+        """
+        Latest weekly and monthly report of a location, without loading data.
+        One query of two LIMIT 1 branches, each reading a single entry of
+        ix_reports_location_type_period_end - unlike DISTINCT ON, which would
+        scan every report of the location (Postgres has no skip scan).
+
+        Args:
+            db: Database session
+            location_id: Location UUID
+
+        Returns:
+            Dict of report type -> (report id, ETag), for types that have a report
+        """
+        latest = [
+            select(Report.report_type, Report.id, Report.created_at, Report.email_sent).where(
+                Report.location_id == location_id,
+                Report.report_type == report_type
+            ).order_by(desc(Report.period_end)).limit(1)
+            for report_type in (ReportType.WEEKLY, ReportType.MONTHLY)
+        ]
+        rows = db.execute(union_all(*latest)).all()
+
+        return {
+            row.report_type: (row.id, compute_etag(row.id, row.created_at, row.email_sent))
+            for row in rows
+        }
+
+    @staticmethod
+    def get_report_body(db: Session, report_id: uuid.UUID, etag: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Serialized ReportResponse JSON for a report.
+        Served from the cache when the cached ETag matches; otherwise the
+        row is loaded (rehydrating archived data), serialized and cached
+        under its current ETag.
+
+        Args:
+            db: Database session
+            report_id: Report UUID
+            etag: ETag from get_report_version / get_latest_versions
+
+        Returns:
+            Tuple of (ETag of the body, JSON bytes), or None if the report
+            was deleted in the meantime
+        """
+        body = _get(report_id, etag)
+        if body is not None:
+            return etag, body
+
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if not report:
+            invalidate(report_id)
+            return None
+
+        # Use the loaded row's version so an email_sent stamped between the
+        # version check and this load is never served under the older ETag
+        etag = compute_etag(report.id, report.created_at, report.email_sent)
+        data = ReportArchiveService.get_data(db, report)
+        body = ReportResponse.from_orm(report, data=data).model_dump_json().encode()
+        _put(report_id, etag, body)
+        return etag, body
@@ -0,0 +1,168 @@
+"""
+Report data assembly.
+Combines a location's agent activity (from the daily rollup) and its GBP
+insights, where connected, with placeholder metrics for what isn't
+measured yet.
+"""
+
+from sqlalchemy.orm import Session
+from app.models import Location
+from app.models.agent_output import OutputType
+from app.services.activity_rollup import ActivityRollupService
+from app.services.google_business_service import GoogleBusinessService
+from datetime import datetime
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def generate_mock_report_data(location: Location, period_start: datetime, period_end: datetime, db: Optional[Session] = None):
+    """
+    Generate report data combining real agent activity with mock metrics.
+    Real agent data pulled from database when available.
+    """
+    # Get real agent activity if db session provided
+    agent_activity = {}
+    if db:
+        # Agent activity from the daily rollup (a few rows per day, not a history scan)
+        activity = ActivityRollupService.get_activity(db, location.id, period_start.date(), period_end.date())
+        gbp_outputs = activity.get(OutputType.GBP_POST.name, {})
+        blog_outputs = activity.get(OutputType.BLOG_POST.name, {})
+
+        gbp_tasks_completed = activity.get("GBP", {}).get("completed", 0)
+        gbp_posts_created = gbp_outputs.get("created", 0)
+        gbp_posts_published = gbp_outputs.get("published", 0)
+        blog_drafts = blog_outputs.get("created", 0)
+        blog_published = blog_outputs.get("published", 0)
+
+        # Build agent activity dict with real data
+        agent_activity = {
+            "gbp": {
+                "postsCreated": gbp_posts_created,
+                "postsPublished": gbp_posts_published,
+                "tasksCompleted": gbp_tasks_completed
+            },
+            "nap": {
+                "citationsChecked": 0,  # Not implemented yet
+                "citationsFixed": 0,
+                "tasksCompleted": 0
+            },
+            "keyword": {
+                "keywordsTracked": 0,  # Not implemented yet
+                "rankingImprovements": 0,
+                "tasksCompleted": 0
+            },
+            "blog": {
+                "draftsCreated": blog_drafts,
+                "articlesPublished": blog_published,
+                "tasksCompleted": blog_drafts + blog_published
+            },
+            "social": {
+                "postsCreated": 0,  # Not implemented yet
+                "postsPublished": 0,
+                "tasksCompleted": 0
+            },
+            "reporting": {
+                "reportsGenerated": 1,  # This current report
+                "emailsSent": 1,
+                "tasksCompleted": 2
+            }
+        }
+    else:
+        # Fallback to mock data if no db session
+        agent_activity = {
+            "gbp": {"postsCreated": 3, "postsPublished": 3, "tasksCompleted": 5},
+            "nap": {"citationsChecked": 15, "citationsFixed": 2, "tasksCompleted": 3},
+            "keyword": {"keywordsTracked": 25, "rankingImprovements": 7, "tasksCompleted": 4},
+            "blog": {"draftsCreated": 2, "articlesPublished": 1, "tasksCompleted": 3},
+            "social": {"postsCreated": 4, "postsPublished": 4, "tasksCompleted": 4},
+            "reporting": {"reportsGenerated": 1, "emailsSent": 1, "tasksCompleted": 2}
+        }
+
+    # Fetch real GBP metrics if location has GBP connected
+    metrics_data = {
+        "calls": {"current": 127, "previous": 98, "change": 29.6},
+        "gbpViews": {"current": 3421, "previous": 2974, "change": 15.2},
+        "directionRequests": {"current": 89, "previous": 82, "change": 8.5},
+        "websiteClicks": {"current": 234, "previous": 208, "change": 12.5},
+        "reviews": {"count": 47, "avgRating": 4.8, "newReviews": 3}
+    }
+
+    if db and location.gbp_location_name:
+        try:
+            # Fetch real GBP insights
+            insights = GoogleBusinessService.get_location_insights(
+                db=db,
+                location_id=str(location.id),
+                gbp_location_name=location.gbp_location_name,
+                start_date=period_start,
+                end_date=period_end
+            )
+
+            if insights:
+                parsed_insights = GoogleBusinessService.parse_insights_response(insights)
+
+                # Update metrics with real data
+                if parsed_insights.get("calls_current") is not None:
+                    prev_calls = parsed_insights.get("calls_previous", metrics_data["calls"]["previous"])
+                    current_calls = parsed_insights["calls_current"]
+                    change = ((current_calls - prev_calls) / prev_calls * 100) if prev_calls > 0 else 0
+                    metrics_data["calls"] = {
+                        "current": current_calls,
+                        "previous": prev_calls,
+                        "change": round(change, 1)
+                    }
+
+                if parsed_insights.get("views_current") is not None:
+                    prev_views = parsed_insights.get("views_previous", metrics_data["gbpViews"]["previous"])
+                    current_views = parsed_insights["views_current"]
+                    change = ((current_views - prev_views) / prev_views * 100) if prev_views > 0 else 0
+                    metrics_data["gbpViews"] = {
+                        "current": current_views,
+                        "previous": prev_views,
+                        "change": round(change, 1)
+                    }
+
+                if parsed_insights.get("directions_current") is not None:
+                    prev_directions = parsed_insights.get("directions_previous", metrics_data["directionRequests"]["previous"])
+                    current_directions = parsed_insights["directions_current"]
+                    change = ((current_directions - prev_directions) / prev_directions * 100) if prev_directions > 0 else 0
+                    metrics_data["directionRequests"] = {
+                        "current": current_directions,
+                        "previous": prev_directions,
+                        "change": round(change, 1)
+                    }
+
+                if parsed_insights.get("website_clicks_current") is not None:
+                    prev_clicks = parsed_insights.get("website_clicks_previous", metrics_data["websiteClicks"]["previous"])
+                    current_clicks = parsed_insights["website_clicks_current"]
+                    change = ((current_clicks - prev_clicks) / prev_clicks * 100) if prev_clicks > 0 else 0
+                    metrics_data["websiteClicks"] = {
+                        "current": current_clicks,
+                        "previous": prev_clicks,
+                        "change": round(change, 1)
+                    }
+
+                logger.info(f"Successfully fetched real GBP insights for location {location.id}")
+
+        except Exception as e:
+            logger.warning(f"Failed to fetch GBP insights: {str(e)}. Using mock data.")
+
+    return {
+        "period": f"{period_start.strftime('%b %d, %Y')} to {period_end.strftime('%b %d, %Y')}",
+        "metrics": metrics_data,
+        "agentActivity": agent_activity,
+        "insights": [
+            f"Your calls increased 29.6% this period - excellent work!",
+            f"GBP profile views are up 15.2%, showing strong local visibility",
+            f"Direction requests increased 8.5%, indicating more foot traffic potential",
+            f"You've received 3 new reviews, maintaining a stellar 4.8-star rating"
+        ],
+        "opportunities": [
+            "Peak engagement detected Tue-Thu 10am-2pm → Optimizing GBP posting schedule to match audience activity",
+            "7 high-performing keywords identified → Creating targeted content pipeline to capitalize on momentum",
+            "Strong review engagement rate maintained → Continuing current response strategy (avoiding over-automation)",
+            "Social media performance trending up → Monitoring for optimal posting frequency (preventing market saturation)"
+        ]
+    }
@@ -0,0 +1,270 @@
+"""
+Report Run Service.
+Tracks scheduled report runs per location so they are idempotent and
+resumable: planning the same period again attaches to the existing run
+and only enqueues locations that have no job yet. Retrying permanently
+failed locations takes an explicit rerun (see enqueue_report_jobs).
+"""
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import Location, Report, ReportType, ReportRun, ReportRunItem, ReportRunStatus, ReportRunItemStatus
+from app.services.email_outbox import EmailOutboxService
+from app.services.report_cache import invalidate
+from app.services.report_data import generate_mock_report_data
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class ReportRunService:
+    """Service for report run tracking and idempotent report creation."""
+
+    @staticmethod
+    def start_run(
+        db: Session,
+        report_type: ReportType,
+        period_start: datetime,
+        period_end: datetime,
+        reopen: bool = False
+    ) -> ReportRun:
+        """
+        Get or create the run for a report type and period.
+
+        Args:
+            db: Database session
+            report_type: Weekly or monthly
+            period_start: Start of the reporting period
+            period_end: End of the reporting period
+            reopen: Re-open a finished run so a rerun can pick up failed locations
+
+        Returns:
+            ReportRun
+        """
+        db.execute(
+            pg_insert(ReportRun).values(
+                id=uuid.uuid4(),
+                report_type=report_type,
+                period_start=period_start,
+                period_end=period_end,
+                status=ReportRunStatus.RUNNING,
+                started_at=datetime.utcnow()
+            ).on_conflict_do_nothing(constraint="uq_report_runs_type_period")
+        )
+
+        run = db.query(ReportRun).filter(
+            ReportRun.report_type == report_type,
+            ReportRun.period_start == period_start
+        ).one()
+
+        if reopen and run.status != ReportRunStatus.RUNNING:
+            logger.info(f"Re-opening {report_type.value} report run {run.id}")
+            run.status = ReportRunStatus.RUNNING
+            run.finished_at = None
+
+        db.commit()
+        return run
+
+    @staticmethod
+    def get_run(db: Session, run_id: uuid.UUID) -> Optional[ReportRun]:
+        """Get a run by ID."""
+        return db.query(ReportRun).filter(ReportRun.id == run_id).first()
+
+    @staticmethod
+    def add_items(db: Session, run_id: uuid.UUID, location_ids: List[uuid.UUID]):
+        """
+        Add a checkpoint row for each location; existing rows are kept as-is.
+
+        Args:
+            db: Database session
+            run_id: Run UUID
+            location_ids: Locations included in the run
+        """
+        if not location_ids:
+            return
+
+        db.execute(
+            pg_insert(ReportRunItem).values([
+                {
+                    "id": uuid.uuid4(),
+                    "run_id": run_id,
+                    "location_id": location_id,
+                    "status": ReportRunItemStatus.PENDING,
+                    "attempts": 0,
+                    "updated_at": datetime.utcnow()
+                }
+                for location_id in location_ids
+            ]).on_conflict_do_nothing(constraint="uq_report_run_items_run_location")
+        )
+        db.commit()
+
+    @staticmethod
+    def get_outstanding_items(db: Session, run_id: uuid.UUID, include_failed: bool = False) -> List[ReportRunItem]:
+        """Get items that still need processing (pending, and permanently failed for a rerun)."""
+        statuses = [ReportRunItemStatus.PENDING]
+        if include_failed:
+            statuses.append(ReportRunItemStatus.FAILED)
+
+        return db.query(ReportRunItem).filter(
+            ReportRunItem.run_id == run_id,
+            ReportRunItem.status.in_(statuses)
+        ).all()
+
+    @staticmethod
+    def get_progress(db: Session, run_id: uuid.UUID) -> Dict[str, int]:
+        """Count a run's items by status."""
+        rows = db.query(ReportRunItem.status, func.count(ReportRunItem.id)).filter(
+            ReportRunItem.run_id == run_id
+        ).group_by(ReportRunItem.status).all()
+
+        progress = {item_status.value: 0 for item_status in ReportRunItemStatus}
+        for item_status, count in rows:
+            progress[item_status.value] = count
+        return progress
+
+    @staticmethod
+    def mark_item(
+        db: Session,
+        run_id: uuid.UUID,
+        location_id: uuid.UUID,
+        status: ReportRunItemStatus,
+        report_id: Optional[uuid.UUID] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Record the outcome of processing one location and finish the run
+        when no items are left pending.
+
+        Args:
+            db: Database session
+            run_id: Run UUID
+            location_id: Location UUID
+            status: New item status (PENDING records a retryable failure)
+            report_id: Report created for the location
+            error: Error message for a failed attempt
+        """
+        item = db.query(ReportRunItem).filter(
+            ReportRunItem.run_id == run_id,
+            ReportRunItem.location_id == location_id
+        ).first()
+
+        if not item:
+            logger.warning(f"No run item for location {location_id} in run {run_id}")
+            return
+
+        item.status = status
+        item.attempts += 1
+        if report_id:
+            item.report_id = report_id
+        item.error_message = error
+        db.commit()
+
+        ReportRunService.finish_if_done(db, run_id)
+
+    @staticmethod
+    def finish_if_done(db: Session, run_id: uuid.UUID):
+        """Mark the run finished once no items are pending."""
+        progress = ReportRunService.get_progress(db, run_id)
+        if progress[ReportRunItemStatus.PENDING.value] > 0:
+            return
+
+        run = db.query(ReportRun).filter(ReportRun.id == run_id).with_for_update().first()
+        if not run or run.status != ReportRunStatus.RUNNING:
+            db.rollback()
+            return
+
+        if progress[ReportRunItemStatus.FAILED.value] > 0:
+            run.status = ReportRunStatus.COMPLETED_WITH_ERRORS
+        else:
+            run.status = ReportRunStatus.COMPLETED
+        run.finished_at = datetime.utcnow()
+        db.commit()
+
+        logger.info(f"{run.report_type.value.capitalize()} report run {run.id} finished: {progress}")
+
+    @staticmethod
+    def find_report(
+        db: Session,
+        location_id: uuid.UUID,
+        report_type: ReportType,
+        period_start: datetime
+    ) -> Optional[Report]:
+        """Find the report for a location, type and period if it exists."""
+        return db.query(Report).filter(
+            Report.location_id == location_id,
+            Report.report_type == report_type,
+            Report.period_start == period_start
+        ).first()
+
+    @staticmethod
+    def get_or_create_report(
+        db: Session,
+        location: Location,
+        report_type: ReportType,
+        period_start: datetime,
+        period_end: datetime,
+        email_recipients: Optional[str]
+    ) -> Tuple[Report, bool]:
+        """
+        Create the report for a location and period unless it already exists.
+        When the report has recipients, its email is queued in the outbox in
+        the same transaction, so a committed report always gets its email.
+        An existing report created without recipients takes these and has its
+        email queued; a report is never emailed twice.
+        Safe against concurrent workers: a unique violation means another
+        worker won the race, and its report is returned.
+
+        Args:
+            db: Database session
+            location: Location to report on
+            report_type: Report type
+            period_start: Start of the reporting period
+            period_end: End of the reporting period
+            email_recipients: Recipients to email the report to, if any
+
+        Returns:
+            Tuple of (report, created)
+        """
+        existing = ReportRunService.find_report(db, location.id, report_type, period_start)
+        if existing:
+            if email_recipients and not existing.email_recipients:
+                # Created without an email; this caller wants it sent
+                existing.email_recipients = email_recipients
+                invalidate(existing.id)
+            # Reports created before the outbox may never have had their email queued
+            if existing.email_recipients and existing.email_sent is None:
+                EmailOutboxService.enqueue_report_email(db, existing, location.business_name)
+                db.commit()
+            return existing, False
+
+        # Generate report data with real agent activity
+        report_data = generate_mock_report_data(location, period_start, period_end, db)
+
+        report = Report(
+            location_id=location.id,
+            report_type=report_type,
+            period_start=period_start,
+            period_end=period_end,
+            data=report_data,
+            email_recipients=email_recipients,
+            email_sent=None  # Set by the outbox sender once delivered
+        )
+
+        db.add(report)
+        try:
+            db.flush()  # Get report.id for the outbox row
+            if email_recipients:
+                EmailOutboxService.enqueue_report_email(db, report, location.business_name)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.info(f"{report_type.value} report for location {location.id} created concurrently, reusing it")
+            return ReportRunService.find_report(db, location.id, report_type, period_start), False
+
+        db.refresh(report)
+        return report, True
@@ -1,23 +1,94 @@
 """
 Scheduled jobs for automated report generation.
 Handles weekly (every Monday) and monthly (first Monday) report generation.
+
+Scheduled jobs are producers: they enqueue one durable job per location
+and return. The per-location work runs in job queue handlers registered
+here, so runs are resumable and spread across every worker.
+
+Producers run hourly as planners: each location gets a slot in its own
+local time (see slot_scheduler), and jobs are enqueued with scheduled_at
+set to that slot, so load is spread across the day instead of spiking at
+a single server-time cron tick.
+
+Each job invocation is recorded in job_runs (see job_runs), and the
+tasks it enqueues are linked to the run.
+
+Every process starts the scheduler paused; only the process elected leader
+through a Postgres advisory lock resumes it, so jobs run exactly once no
+matter how many workers or replicas are running. APScheduler is only
+imported when the scheduler starts.
 """
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta, timezone
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app.models import Location, Report, ReportType, AgentConfig
+from app.models import Location, ReportType, ReportRunItemStatus, ReportRunStatus, AgentConfig, AgentType, Task, TaskType
 from app.models.agent_config import AutonomyMode
-from app.routers.reports import generate_mock_report_data
-from app.services.email_service import send_report_email
+from app.services.activity_rollup import ActivityRollupService
+from app.services.report_archive import ReportArchiveService
 from app.services.gbp_agent import GBPAgentService
+from app.services.job_queue import JobQueue, job_handler
+from app.services.job_runs import current_run, job_run
+from app.services.leader_election import LeaderElector
+from app.services.partitions import PartitionManager
+from app.services.report_runs import ReportRunService
+from app.services.slot_scheduler import (
+    SlotWindow,
+    GBP_POST_WINDOW,
+    WEEKLY_REPORT_WINDOW,
+    MONTHLY_REPORT_WINDOW,
+    find_plannable_slot,
+    get_timezone,
+)
+from app.config import settings
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+import uuid
 import logging
 
+if TYPE_CHECKING:
+    from apscheduler.schedulers.background import BackgroundScheduler
+
 logger = logging.getLogger(__name__)
 
-scheduler = BackgroundScheduler()
+# Created by start_scheduler
+scheduler: Optional["BackgroundScheduler"] = None
+
+leader_elector: Optional[LeaderElector] = None
+
+
+def is_scheduler_leader() -> bool:
+    """Check whether this process currently runs scheduled jobs."""
+    return leader_elector is not None and leader_elector.is_leader
+
+
+def leader_only(job):
+    """
+    Guard a scheduled job so it only executes on the elected leader.
+    Protects against a job firing in the window between losing the lock
+    and the scheduler being paused.
+    """
+    @wraps(job)
+    def wrapper(*args, **kwargs):
+        if not is_scheduler_leader():
+            logger.info(f"Skipping {job.__name__} - this process is not the scheduler leader")
+            return None
+        return job(*args, **kwargs)
+
+    return wrapper
+
+
+def _on_elected():
+    """Resume job execution when this process becomes leader."""
+    scheduler.resume()
+    logger.info("Scheduler resumed - this process is the leader")
+
+
+def _on_demoted():
+    """Pause job execution when this process loses leadership."""
+    scheduler.pause()
+    logger.info("Scheduler paused - this process is no longer the leader")
 
 
 def get_db_session():
@@ -29,96 +100,168 @@ def get_db_session():
         pass  # Don't close here, caller will close
 
 
-def is_first_monday_of_month() -> bool:
-    """Check if today is the first Monday of the month."""
-    today = datetime.now()
-    if today.weekday() != 0:  # Not Monday
-        return False
+def get_weekly_period(today: datetime) -> Tuple[datetime, datetime]:
+    """Previous Monday 00:00 to Sunday 23:59:59 relative to today."""
+    days_since_monday = today.weekday()
+    last_monday = today - timedelta(days=days_since_monday + 7)
+    last_sunday = last_monday + timedelta(days=6)
+
+    # Set to start/end of day
+    period_start = last_monday.replace(hour=0, minute=0, second=0, microsecond=0)
+    period_end = last_sunday.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return period_start, period_end
+
+
+def get_monthly_period(today: datetime) -> Tuple[datetime, datetime]:
+    """First to last day of the previous month relative to today."""
+    first_of_this_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_month_end = first_of_this_month - timedelta(days=1)
+    last_month_start = last_month_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-    # Check if this is the first Monday (day 1-7)
-    return 1 <= today.day <= 7
+    period_start = last_month_start
+    period_end = last_month_end.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return period_start, period_end
 
 
+def enqueue_report_jobs(
+    db: Session,
+    report_type: ReportType,
+    period_start: datetime,
+    period_end: datetime,
+    schedule: Optional[Dict[uuid.UUID, datetime]] = None,
+    rerun: bool = False
+) -> int:
+    """
+    Enqueue one GENERATE_REPORT job per location with email reporting enabled.
+    The run is checkpointed per location, so running the producer again for
+    the same period only adds jobs for locations that don't have one yet.
+    Failed locations and dead-lettered jobs stay that way unless rerun is set -
+    the planner re-plans a window every hour and must not revive them.
+
+    Args:
+        db: Database session
+        report_type: Weekly or monthly
+        period_start: Start of the reporting period
+        period_end: End of the reporting period
+        schedule: Slot per location; when given, only these locations are
+            enqueued now, each to run at its slot
+        rerun: Re-open a finished run and requeue its failed locations'
+            dead-lettered jobs with fresh attempts
+
+    Returns:
+        Number of jobs enqueued
+    """
+    run = ReportRunService.start_run(db, report_type, period_start, period_end, reopen=rerun)
+    if run.status != ReportRunStatus.RUNNING:
+        logger.info(f"{report_type.value.capitalize()} report run {run.id} already finished ({run.status.value})")
+        return 0
+
+    # Get all locations with report_emails configured
+    location_ids = db.query(Location.id).filter(
+        Location.report_emails.isnot(None),
+        Location.report_emails != ""
+    ).all()
+    ReportRunService.add_items(db, run.id, [location_id for (location_id,) in location_ids])
+
+    items = ReportRunService.get_outstanding_items(db, run.id, include_failed=rerun)
+    logger.info(
+        f"Found {len(location_ids)} locations for {report_type.value} reporting, "
+        f"{len(items)} outstanding in run {run.id}"
+    )
+
+    payload = {
+        "run_id": str(run.id),
+        "report_type": report_type.value,
+        "period_start": period_start.isoformat(),
+        "period_end": period_end.isoformat()
+    }
+    jobs = [
+        {
+            "location_id": item.location_id,
+            "task_type": TaskType.GENERATE_REPORT,
+            "agent_type": AgentType.REPORTING.value,
+            "payload": payload,
+            "scheduled_at": schedule.get(item.location_id) if schedule else None,
+            "dedupe_key": f"report:{report_type.value}:{item.location_id}:{period_start.date().isoformat()}"
+        }
+        for item in items
+        # Without a slot yet, a later planner run enqueues it
+        if schedule is None or item.location_id in schedule
+    ]
+
+    inserted = JobQueue.enqueue_many(db, jobs, commit=False)
+    enqueued = len(inserted)
+
+    if rerun:
+        # A job that already exists is either in flight or dead-lettered;
+        # only the dead ones need to go back on the queue
+        inserted_keys = set(inserted)
+        existing_keys = [job["dedupe_key"] for job in jobs if job["dedupe_key"] not in inserted_keys]
+        enqueued += JobQueue.requeue_many(db, existing_keys, commit=False)
+
+    db.commit()
+    ReportRunService.finish_if_done(db, run.id)
+    return enqueued
+
+
+def plan_report_jobs(
+    db: Session,
+    report_type: ReportType,
+    window: SlotWindow,
+    get_period: Callable[[datetime], Tuple[datetime, datetime]],
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Enqueue report jobs for locations whose local slot is coming up.
+    The reporting period is derived from the slot's local date, so every
+    location reports on the same period regardless of timezone.
+
+    Returns:
+        Number of jobs enqueued
+    """
+    now = now or datetime.now(timezone.utc)
+
+    locations = db.query(Location.id, Location.timezone).filter(
+        Location.report_emails.isnot(None),
+        Location.report_emails != ""
+    ).all()
+
+    run = current_run()
+    if run:
+        run.location_count = len(locations)
+
+    # Group slots by period - near midnight UTC, locations can be on different local dates
+    schedules: Dict[Tuple[datetime, datetime], Dict[uuid.UUID, datetime]] = {}
+    for location_id, tz_name in locations:
+        found = find_plannable_slot(location_id, get_timezone(tz_name), window, now)
+        if not found:
+            continue
+        local_date, slot = found
+        period = get_period(datetime.combine(local_date, time()))
+        schedules.setdefault(period, {})[location_id] = slot
+
+    enqueued = 0
+    for (period_start, period_end), schedule in schedules.items():
+        enqueued += enqueue_report_jobs(db, report_type, period_start, period_end, schedule)
+    return enqueued
+
+
+@leader_only
 def generate_weekly_reports():
     """
-    Generate weekly reports for all locations.
-    Runs every Monday at 8:00 AM.
+    Enqueue weekly reports for locations whose Monday slot is coming up.
+    Runs hourly; each location's report runs at its slot in its local
+    Monday morning window.
     """
-    logger.info("Starting weekly report generation job...")
+    logger.info("Starting weekly report planning job...")
     db = SessionLocal()
 
     try:
-        # Get all locations with report_emails configured
-        locations = db.query(Location).filter(
-            Location.report_emails.isnot(None),
-            Location.report_emails != ""
-        ).all()
-
-        logger.info(f"Found {len(locations)} locations with email reporting enabled")
-
-        # Calculate date range (previous Monday to Sunday)
-        today = datetime.now()
-        days_since_monday = today.weekday()
-        last_monday = today - timedelta(days=days_since_monday + 7)
-        last_sunday = last_monday + timedelta(days=6)
-
-        # Set to start/end of day
-        period_start = last_monday.replace(hour=0, minute=0, second=0, microsecond=0)
-        period_end = last_sunday.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-        success_count = 0
-        error_count = 0
-
-        for location in locations:
-            try:
-                # Generate report data
-                report_data = generate_mock_report_data(location, period_start, period_end, db)
-
-                # Create report in database
-                report = Report(
-                    location_id=location.id,
-                    report_type=ReportType.WEEKLY,
-                    period_start=period_start,
-                    period_end=period_end,
-                    data=report_data,
-                    email_recipients=location.report_emails,
-                    email_sent=None
-                )
-
-                db.add(report)
-                db.commit()
-                db.refresh(report)
-
-                logger.info(f"Created weekly report for location {location.business_name} ({location.id})")
-
-                # Send email
-                try:
-                    send_report_email(
-                        recipient_emails=location.report_emails,
-                        business_name=location.business_name,
-                        report_type='weekly',
-                        report_data=report_data,
-                        report_id=str(report.id)
-                    )
-
-                    # Update email_sent timestamp
-                    report.email_sent = datetime.utcnow()
-                    db.commit()
-
-                    logger.info(f"Sent weekly report email to {location.report_emails}")
-                    success_count += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to send weekly report email for {location.business_name}: {str(e)}")
-                    error_count += 1
-                    # Report is still created, just email failed
-
-            except Exception as e:
-                logger.error(f"Failed to generate weekly report for {location.business_name}: {str(e)}")
-                error_count += 1
-                db.rollback()
-
-        logger.info(f"Weekly report job completed. Success: {success_count}, Errors: {error_count}")
+        with job_run("generate_weekly_reports") as run:
+            # Reporting period: previous Monday to Sunday, relative to each location's Monday
+            enqueued = plan_report_jobs(db, ReportType.WEEKLY, WEEKLY_REPORT_WINDOW, get_weekly_period)
+            run.items = enqueued
+        logger.info(f"Weekly report planning job completed. Enqueued: {enqueued}")
 
     except Exception as e:
         logger.error(f"Weekly report job failed: {str(e)}")
@@ -127,90 +270,22 @@ def generate_weekly_reports():
         db.close()
 
 
+@leader_only
 def generate_monthly_reports():
     """
-    Generate monthly reports for all locations.
-    Runs on the first Monday of each month at 9:00 AM.
+    Enqueue monthly reports for locations whose first-Monday slot is coming up.
+    Runs hourly; each location's report runs at its slot in its local
+    first-Monday-of-the-month morning window.
     """
-    logger.info("Starting monthly report generation job...")
-
-    # Double-check we're on first Monday
-    if not is_first_monday_of_month():
-        logger.info("Not the first Monday of the month, skipping monthly reports")
-        return
-
+    logger.info("Starting monthly report planning job...")
     db = SessionLocal()
 
     try:
-        # Get all locations with report_emails configured
-        locations = db.query(Location).filter(
-            Location.report_emails.isnot(None),
-            Location.report_emails != ""
-        ).all()
-
-        logger.info(f"Found {len(locations)} locations for monthly reporting")
-
-        # Calculate date range (previous month)
-        today = datetime.now()
-        first_of_this_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_end = first_of_this_month - timedelta(days=1)
-        last_month_start = last_month_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        period_start = last_month_start
-        period_end = last_month_end.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-        success_count = 0
-        error_count = 0
-
-        for location in locations:
-            try:
-                # Generate report data
-                report_data = generate_mock_report_data(location, period_start, period_end, db)
-
-                # Create report in database
-                report = Report(
-                    location_id=location.id,
-                    report_type=ReportType.MONTHLY,
-                    period_start=period_start,
-                    period_end=period_end,
-                    data=report_data,
-                    email_recipients=location.report_emails,
-                    email_sent=None
-                )
-
-                db.add(report)
-                db.commit()
-                db.refresh(report)
-
-                logger.info(f"Created monthly report for location {location.business_name} ({location.id})")
-
-                # Send email
-                try:
-                    send_report_email(
-                        recipient_emails=location.report_emails,
-                        business_name=location.business_name,
-                        report_type='monthly',
-                        report_data=report_data,
-                        report_id=str(report.id)
-                    )
-
-                    # Update email_sent timestamp
-                    report.email_sent = datetime.utcnow()
-                    db.commit()
-
-                    logger.info(f"Sent monthly report email to {location.report_emails}")
-                    success_count += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to send monthly report email for {location.business_name}: {str(e)}")
-                    error_count += 1
-
-            except Exception as e:
-                logger.error(f"Failed to generate monthly report for {location.business_name}: {str(e)}")
-                error_count += 1
-                db.rollback()
-
-        logger.info(f"Monthly report job completed. Success: {success_count}, Errors: {error_count}")
+        with job_run("generate_monthly_reports") as run:
+            # Reporting period: previous month, relative to each location's first Monday
+            enqueued = plan_report_jobs(db, ReportType.MONTHLY, MONTHLY_REPORT_WINDOW, get_monthly_period)
+            run.items = enqueued
+        logger.info(f"Monthly report planning job completed. Enqueued: {enqueued}")
 
     except Exception as e:
         logger.error(f"Monthly report job failed: {str(e)}")
@@ -219,83 +294,110 @@ def generate_monthly_reports():
         db.close()
 
 
+@job_handler(TaskType.GENERATE_REPORT)
+def handle_generate_report(db: Session, task: Task) -> Dict[str, Any]:
+    """
+    Generate one location's report and queue its email.
+    Reuses a report already created for the period, so a retried or rerun
+    job never produces a duplicate or re-sends an email.
+    Raises on failure so the job queue retries with backoff.
+    """
+    run_id = task.payload.get("run_id")
+    location_id = task.location_id
+
+    try:
+        result = _generate_location_report(db, task)
+    except Exception as e:
+        db.rollback()
+        if run_id:
+            # Attempts are counted by the queue; the last one fails the item permanently
+            final = task.attempts >= task.max_attempts
+            ReportRunService.mark_item(
+                db, run_id, location_id,
+                ReportRunItemStatus.FAILED if final else ReportRunItemStatus.PENDING,
+                error=str(e)
+            )
+        raise
+
+    if run_id:
+        ReportRunService.mark_item(
+            db, run_id, location_id,
+            ReportRunItemStatus.SKIPPED if "skipped" in result else ReportRunItemStatus.COMPLETED,
+            report_id=result.get("report_id")
+        )
+
+    return result
+
+
+def _generate_location_report(db: Session, task: Task) -> Dict[str, Any]:
+    """Create (or reuse) the report for a GENERATE_REPORT job; its email goes through the outbox."""
+    location = db.query(Location).filter(Location.id == task.location_id).first()
+    if not location:
+        raise ValueError(f"Location {task.location_id} not found")
+
+    if not location.report_emails:
+        return {"skipped": "Email reporting disabled"}
+
+    report_type = ReportType(task.payload["report_type"])
+    period_start = datetime.fromisoformat(task.payload["period_start"])
+    period_end = datetime.fromisoformat(task.payload["period_end"])
+
+    report, created = ReportRunService.get_or_create_report(
+        db, location, report_type, period_start, period_end, location.report_emails
+    )
+
+    if created:
+        logger.info(f"Created {report_type.value} report for location {location.business_name} ({location.id}), email queued")
+    else:
+        logger.info(f"Reusing {report_type.value} report {report.id} for location {location.business_name}")
+
+    return {"report_id": str(report.id), "email_sent": report.email_sent is not None}
+
+
+@leader_only
 def create_gbp_tasks():
     """
-    Create GBP post tasks for locations based on their cadence.
-    Runs daily at 6:00 AM.
-    If location is in AUTOPILOT mode, immediately processes and posts the content.
+    Enqueue GBP post jobs for locations that are due based on their cadence.
+    Runs hourly; each location's post runs at its slot in its local morning
+    window, and job queue workers create the posts.
     """
-    logger.info("Starting GBP task creation job...")
+    logger.info("Starting GBP task planning job...")
     db = SessionLocal()
 
     try:
-        # Get all locations with GBP cadence configured
-        locations = db.query(Location).filter(
-            Location.gbp_cadence.isnot(None),
-            Location.gbp_cadence != "off"
-        ).all()
-
-        logger.info(f"Found {len(locations)} locations with GBP posting enabled")
-
-        tasks_created = 0
-        posts_auto_generated = 0
-        errors = 0
-
-        for location in locations:
-            try:
-                # Check if post should be created today
-                should_create = GBPAgentService.should_create_post_today(db, location)
-
-                if not should_create:
-                    logger.debug(f"Skipping {location.business_name} - not due for post yet")
-                    continue
-
-                # Get agent config for this location
-                gbp_config = db.query(AgentConfig).filter(
-                    AgentConfig.location_id == location.id,
-                    AgentConfig.agent_type == "GBP"
-                ).first()
-
-                if not gbp_config or not gbp_config.is_active:
-                    logger.info(f"Skipping {location.business_name} - GBP agent not active")
-                    continue
-
-                # Create task
-                task = GBPAgentService.create_post_task(
-                    db=db,
-                    location_id=location.id,
-                    context=f"Scheduled {location.gbp_cadence} post"
-                )
-                tasks_created += 1
-                logger.info(f"Created GBP task for {location.business_name}")
-
-                # If AUTOPILOT mode, process immediately
-                if gbp_config.autonomy_mode == AutonomyMode.AUTOPILOT:
-                    try:
-                        # Process task (generate content)
-                        output = GBPAgentService.process_post_task(db, task.id)
-
-                        # Auto-approve
-                        output = GBPAgentService.approve_post(db, output.id)
-
-                        # Post to Google Business Profile
-                        output = GBPAgentService.mark_as_posted(db, output.id)
-
-                        posts_auto_generated += 1
-                        logger.info(f"AUTOPILOT: Auto-generated and posted content for {location.business_name}")
-
-                    except Exception as e:
-                        logger.error(f"Failed to auto-process task for {location.business_name}: {str(e)}")
-                        errors += 1
-
-                else:
-                    logger.info(f"DRAFT MODE: Task created for {location.business_name}, awaiting human approval")
-
-            except Exception as e:
-                logger.error(f"Failed to create GBP task for {location.business_name}: {str(e)}")
-                errors += 1
-
-        logger.info(f"GBP task creation job completed. Tasks: {tasks_created}, Auto-posted: {posts_auto_generated}, Errors: {errors}")
+        with job_run("create_gbp_tasks") as run:
+            now = datetime.now(timezone.utc)
+
+            # Locations with an active GBP agent whose cadence says a post is due.
+            # Cadence is checked as of the end of the planning horizon, with a
+            # half-day tolerance: slots recur at the same local time, so the
+            # previous post must count as a whole number of days old.
+            as_of = now + timedelta(minutes=settings.SCHEDULE_LOOKAHEAD_MINUTES, hours=12)
+            locations = GBPAgentService.get_locations_due_for_post(db, as_of=as_of.replace(tzinfo=None))
+            run.location_count = len(locations)
+
+            logger.info(f"Found {len(locations)} locations due for a GBP post")
+
+            jobs = []
+            for location in locations:
+                found = find_plannable_slot(location.id, get_timezone(location.timezone), GBP_POST_WINDOW, now)
+                if not found:
+                    continue  # Slot not coming up yet; a later planner run enqueues it
+                local_date, slot = found
+
+                jobs.append({
+                    "location_id": location.id,
+                    "task_type": TaskType.CREATE_GBP_POST,
+                    "agent_type": AgentType.GBP.value,
+                    "payload": {"context": f"Scheduled {location.gbp_cadence} post"},
+                    "scheduled_at": slot,
+                    "dedupe_key": f"gbp_post:{location.id}:{local_date.isoformat()}"
+                })
+
+            enqueued = len(JobQueue.enqueue_many(db, jobs, commit=False))
+            db.commit()
+            run.items = enqueued
+        logger.info(f"GBP task planning job completed. Enqueued: {enqueued}")
 
     except Exception as e:
         logger.error(f"GBP task creation job failed: {str(e)}")
@@ -304,45 +406,219 @@ def create_gbp_tasks():
         db.close()
 
 
+@leader_only
+def reconcile_activity_rollup():
+    """
+    Rebuild the agent activity rollup for recent days from the source tables.
+    Incremental updates keep it current; this corrects drift from writes that
+    bypass the services before it reaches a report.
+    """
+    logger.info("Starting activity rollup reconcile job...")
+    db = SessionLocal()
+
+    try:
+        with job_run("reconcile_activity_rollup") as run:
+            today = datetime.now(timezone.utc).date()
+            start_day = today - timedelta(days=settings.ACTIVITY_ROLLUP_RECONCILE_DAYS)
+            rows = ActivityRollupService.rebuild(db, start_day, today - timedelta(days=1))
+            run.items = rows
+        logger.info(f"Activity rollup reconcile job completed. Rows: {rows}")
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Activity rollup reconcile job failed: {str(e)}")
+
+    finally:
+        db.close()
+
+
+@leader_only
+def maintain_partitions():
+    """
+    Create upcoming monthly partitions of agent_tasks / agent_outputs and
+    detach partitions past the retention period.
+    """
+    logger.info("Starting partition maintenance job...")
+    db = SessionLocal()
+
+    try:
+        with job_run("maintain_partitions") as run:
+            created = PartitionManager.ensure_partitions(db)
+            detached = PartitionManager.detach_old_partitions(db)
+            run.items = created + len(detached)
+            run.result = {"created": created, "detached": detached}
+        logger.info(f"Partition maintenance job completed. Created: {created}, detached: {len(detached)}")
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Partition maintenance job failed: {str(e)}")
+
+    finally:
+        db.close()
+
+
+@leader_only
+def archive_old_reports():
+    """
+    Compress reports older than REPORT_ARCHIVE_AFTER_DAYS into report_archives,
+    leaving a summary on the report row.
+    """
+    logger.info("Starting report archival job...")
+    db = SessionLocal()
+
+    try:
+        with job_run("archive_old_reports") as run:
+            archived = ReportArchiveService.archive_old_reports(db)
+            run.items = archived
+        logger.info(f"Report archival job completed. Archived: {archived}")
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Report archival job failed: {str(e)}")
+
+    finally:
+        db.close()
+
+
+@job_handler(TaskType.CREATE_GBP_POST, requires=("anthropic", "google"))
+def handle_create_gbp_post(db: Session, task: Task) -> Dict[str, Any]:
+    """
+    Create one location's scheduled GBP post task.
+    If location is in AUTOPILOT mode, immediately processes and posts the content.
+    Deferred while Anthropic's or Google's breaker is open, rather than falling
+    back to mock content or recording a post Google never received.
+    Safe to retry: the AgentTask is keyed on this queue task, so a retry
+    resumes it instead of creating another or posting twice.
+    """
+    location = db.query(Location).filter(Location.id == task.location_id).first()
+    if not location:
+        raise ValueError(f"Location {task.location_id} not found")
+
+    # Get agent config for this location
+    gbp_config = db.query(AgentConfig).filter(
+        AgentConfig.location_id == location.id,
+        AgentConfig.agent_type == "GBP"
+    ).first()
+
+    if not gbp_config or not gbp_config.is_active:
+        logger.info(f"Skipping {location.business_name} - GBP agent not active")
+        return {"skipped": "GBP agent not active"}
+
+    # Retries and deferrals pick up the AgentTask an earlier attempt created
+    agent_task = GBPAgentService.find_queued_post_task(db, location.id, task.id, since=task.created_at)
+    if agent_task:
+        logger.info(f"Resuming GBP task {agent_task.id} for {location.business_name} ({agent_task.status.value})")
+    else:
+        agent_task = GBPAgentService.create_post_task(
+            db=db,
+            location_id=location.id,
+            context=(task.payload or {}).get("context"),
+            queue_task_id=task.id
+        )
+        logger.info(f"Created GBP task for {location.business_name}")
+
+    # If AUTOPILOT mode, generate, approve and post (skipping steps already done)
+    if gbp_config.autonomy_mode == AutonomyMode.AUTOPILOT:
+        output = GBPAgentService.autopilot_post(db, agent_task.id)
+        if output is None:
+            return {"agent_task_id": str(agent_task.id), "skipped": "Task rejected"}
+
+        logger.info(f"AUTOPILOT: Auto-generated and posted content for {location.business_name}")
+        return {"agent_task_id": str(agent_task.id), "output_id": str(output.id), "posted": True}
+
+    logger.info(f"DRAFT MODE: Task created for {location.business_name}, awaiting human approval")
+    return {"agent_task_id": str(agent_task.id), "posted": False}
+
+
 def start_scheduler():
     """
     Start the scheduler with all scheduled jobs.
     Called when the FastAPI application starts.
+    The scheduler starts paused and is resumed only if this process wins
+    leader election.
     """
+    global scheduler, leader_elector
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.cron import CronTrigger
+
     logger.info("Starting report scheduler...")
 
-    # Weekly reports: Every Monday at 8:00 AM
+    scheduler = BackgroundScheduler(job_defaults={
+        "coalesce": True,  # Collapse missed runs into one after a failover
+        "misfire_grace_time": 300  # A newly elected leader still runs jobs missed by up to 5 minutes
+    })
+
+    # Weekly reports: planned hourly, run at each location's local Monday slot
     scheduler.add_job(
         generate_weekly_reports,
-        trigger=CronTrigger(day_of_week='mon', hour=8, minute=0),
+        trigger=CronTrigger(minute=5),
         id='weekly_reports',
-        name='Generate Weekly Reports',
+        name='Plan Weekly Reports',
         replace_existing=True
     )
-    logger.info("Scheduled weekly reports job: Every Monday at 8:00 AM")
+    logger.info("Scheduled weekly report planner: Every hour (slots on local Monday mornings)")
 
-    # Monthly reports: Every Monday at 9:00 AM (will check if it's first Monday)
+    # Monthly reports: planned hourly, run at each location's local first-Monday slot
     scheduler.add_job(
         generate_monthly_reports,
-        trigger=CronTrigger(day_of_week='mon', hour=9, minute=0),
+        trigger=CronTrigger(minute=10),
         id='monthly_reports',
-        name='Generate Monthly Reports',
+        name='Plan Monthly Reports',
         replace_existing=True
     )
-    logger.info("Scheduled monthly reports job: First Monday of each month at 9:00 AM")
+    logger.info("Scheduled monthly report planner: Every hour (slots on local first-Monday mornings)")
 
-    # GBP task creation: Every day at 6:00 AM
+    # GBP task creation: planned hourly, run at each location's local morning slot
     scheduler.add_job(
         create_gbp_tasks,
-        trigger=CronTrigger(hour=6, minute=0),
+        trigger=CronTrigger(minute=0),
         id='gbp_task_creation',
-        name='Create GBP Tasks',
+        name='Plan GBP Tasks',
         replace_existing=True
     )
-    logger.info("Scheduled GBP task creation job: Every day at 6:00 AM")
+    logger.info("Scheduled GBP task planner: Every hour (slots in local morning window)")
 
-    scheduler.start()
-    logger.info("Report scheduler started successfully")
+    # Activity rollup reconcile: nightly, after the UTC day it covers has closed
+    scheduler.add_job(
+        reconcile_activity_rollup,
+        trigger=CronTrigger(hour=2, minute=30, timezone="UTC"),
+        id='activity_rollup_reconcile',
+        name='Reconcile Activity Rollup',
+        replace_existing=True
+    )
+    logger.info("Scheduled activity rollup reconcile: Daily at 02:30 UTC")
+
+    # Partition maintenance: daily, so a missed run never leaves a month without a partition
+    scheduler.add_job(
+        maintain_partitions,
+        trigger=CronTrigger(hour=1, minute=45, timezone="UTC"),
+        id='partition_maintenance',
+        name='Maintain Table Partitions',
+        replace_existing=True
+    )
+    logger.info("Scheduled partition maintenance: Daily at 01:45 UTC")
+
+    # Report archival: nightly, off-peak
+    scheduler.add_job(
+        archive_old_reports,
+        trigger=CronTrigger(hour=3, minute=15, timezone="UTC"),
+        id='report_archival',
+        name='Archive Old Reports',
+        replace_existing=True
+    )
+    logger.info("Scheduled report archival: Daily at 03:15 UTC")
+
+    scheduler.start(paused=True)
+
+    leader_elector = LeaderElector(
+        lock_id=settings.SCHEDULER_LEADER_LOCK_ID,
+        heartbeat_interval=settings.SCHEDULER_HEARTBEAT_SECONDS,
+        on_elected=_on_elected,
+        on_demoted=_on_demoted
+    )
+    leader_elector.start()
+
+    logger.info("Report scheduler started successfully (awaiting leader election)")
 
 
 def stop_scheduler():
@@ -350,6 +626,16 @@ def stop_scheduler():
     Stop the scheduler gracefully.
     Called when the FastAPI application shuts down.
     """
+    global scheduler, leader_elector
+
     logger.info("Stopping report scheduler...")
-    scheduler.shutdown()
+
+    # Release the leader lock first so another process can take over immediately
+    if leader_elector is not None:
+        leader_elector.stop()
+        leader_elector = None
+
+    if scheduler is not None:
+        scheduler.shutdown()
+        scheduler = None
     logger.info("Report scheduler stopped")
@@ -0,0 +1,148 @@
+"""
+Slot scheduling.
+Assigns each location a stable slot for each kind of scheduled work: a
+window in the location's local time plus an offset derived from a hash of
+the location id. Spreading locations across timezones and window offsets
+turns the old global cron spikes (every GBP post at 6:00, every report at
+Monday 8:00) into an even stream of due jobs.
+
+The planner enqueues jobs with scheduled_at set to the slot; the tasks
+table, ordered by scheduled_at, is the time-ordered due queue that job
+queue workers drain.
+"""
+
+from app.config import settings
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import hashlib
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class SlotWindow:
+    """
+    Local-time window that one kind of scheduled work is spread across.
+
+    Args:
+        kind: Name mixed into the hash so different kinds get different offsets
+        start_hour: Local hour the window opens
+        hours: Window length in hours
+        day_filter: Optional predicate for local dates that have a slot
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        start_hour: int,
+        hours: int,
+        day_filter: Optional[Callable[[date], bool]] = None
+    ):
+        self.kind = kind
+        self.start_hour = start_hour
+        self.length = timedelta(hours=hours)
+        self.day_filter = day_filter
+
+    def has_slot_on(self, local_date: date) -> bool:
+        """Whether the window opens on a local date."""
+        return self.day_filter is None or self.day_filter(local_date)
+
+
+def is_monday(local_date: date) -> bool:
+    """Weekly reports go out on Mondays."""
+    return local_date.weekday() == 0
+
+
+def is_first_monday(local_date: date) -> bool:
+    """Monthly reports go out on the first Monday of the month."""
+    return local_date.weekday() == 0 and local_date.day <= 7
+
+
+GBP_POST_WINDOW = SlotWindow("gbp_post", settings.GBP_POST_WINDOW_START_HOUR, settings.GBP_POST_WINDOW_HOURS)
+WEEKLY_REPORT_WINDOW = SlotWindow("weekly_report", settings.REPORT_WINDOW_START_HOUR, settings.REPORT_WINDOW_HOURS, is_monday)
+MONTHLY_REPORT_WINDOW = SlotWindow("monthly_report", settings.REPORT_WINDOW_START_HOUR, settings.REPORT_WINDOW_HOURS, is_first_monday)
+
+
+def get_timezone(name: Optional[str]) -> ZoneInfo:
+    """
+    Resolve a location's IANA timezone, falling back to the default.
+
+    Args:
+        name: Timezone name stored on the location
+
+    Returns:
+        ZoneInfo
+    """
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"Unknown timezone '{name}', using {settings.DEFAULT_LOCATION_TIMEZONE}")
+    return ZoneInfo(settings.DEFAULT_LOCATION_TIMEZONE)
+
+
+def slot_offset(location_id: uuid.UUID, window: SlotWindow) -> timedelta:
+    """
+    Stable offset of a location within a window.
+    Uses a hash rather than random so a location keeps the same slot across
+    planner runs and processes.
+    """
+    digest = hashlib.sha256(f"{window.kind}:{location_id}".encode()).digest()
+    window_seconds = int(window.length.total_seconds())
+    return timedelta(seconds=int.from_bytes(digest[:8], "big") % window_seconds)
+
+
+def get_slot(location_id: uuid.UUID, tz: ZoneInfo, local_date: date, window: SlotWindow) -> datetime:
+    """
+    Slot for a location on a local date, in UTC.
+
+    Args:
+        location_id: Location UUID
+        tz: Location timezone
+        local_date: Date in the location's timezone
+        window: Window to place the slot in
+
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    window_start = datetime.combine(local_date, time(hour=window.start_hour), tzinfo=tz)
+    return (window_start + slot_offset(location_id, window)).astimezone(timezone.utc)
+
+
+def find_plannable_slot(
+    location_id: uuid.UUID,
+    tz: ZoneInfo,
+    window: SlotWindow,
+    now: Optional[datetime] = None,
+    lookahead: Optional[timedelta] = None
+) -> Optional[Tuple[date, datetime]]:
+    """
+    Find the slot the planner should enqueue now, if any.
+    A slot is plannable from `lookahead` before it opens until the end of
+    its window, so an hourly planner never misses one and a leader failover
+    still catches up on slots that just passed.
+
+    Args:
+        location_id: Location UUID
+        tz: Location timezone
+        window: Window to look for slots in
+        now: Current time (defaults to now, UTC)
+        lookahead: How far ahead to plan (defaults to SCHEDULE_LOOKAHEAD_MINUTES)
+
+    Returns:
+        Tuple of (local date, UTC slot time), or None if nothing is due
+    """
+    now = now or datetime.now(timezone.utc)
+    lookahead = lookahead if lookahead is not None else timedelta(minutes=settings.SCHEDULE_LOOKAHEAD_MINUTES)
+    local_today = now.astimezone(tz).date()
+
+    for local_date in (local_today - timedelta(days=1), local_today, local_today + timedelta(days=1)):
+        if not window.has_slot_on(local_date):
+            continue
+        slot = get_slot(location_id, tz, local_date, window)
+        if now - window.length <= slot < now + lookahead:
+            return local_date, slot
+
+    return None
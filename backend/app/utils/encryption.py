@@ -1,9 +1,9 @@
 """
 Encryption utilities for securing sensitive data like OAuth tokens.
-Uses Fernet symmetric encryption from cryptography library.
+Uses Fernet symmetric encryption from cryptography library, imported on
+first use rather than at startup.
 """
 
-from cryptography.fernet import Fernet
 from app.config import settings
 import base64
 import hashlib
@@ -29,6 +29,8 @@ def encrypt_token(token: str) -> str:
     Returns:
         Encrypted token as string
     """
+    from cryptography.fernet import Fernet
+
     fernet = Fernet(get_fernet_key())
     encrypted = fernet.encrypt(token.encode())
     return encrypted.decode()
@@ -44,6 +46,8 @@ def decrypt_token(encrypted_token: str) -> str:
     Returns:
         Decrypted plain text token
     """
+    from cryptography.fernet import Fernet
+
     fernet = Fernet(get_fernet_key())
     decrypted = fernet.decrypt(encrypted_token.encode())
     return decrypted.decode()
@@ -0,0 +1,71 @@
+"""
+Standalone worker process.
+Runs the scheduler, job queue workers and email outbox sender outside the
+API process so heavy scheduled work doesn't compete with user requests.
+Run as many worker processes as needed - only the elected leader schedules
+jobs, but every worker drains the job queue and the email outbox.
+
+Usage:
+    python -m app.worker
+
+Set RUN_SCHEDULER_IN_API=false on the API service when a worker is deployed.
+"""
+
+from app.config import settings
+from app.database import engine
+from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.job_queue import start_job_workers, stop_job_workers
+from app.services.email_outbox import start_outbox_sender, stop_outbox_sender
+from sqlalchemy import text
+import logging
+import signal
+import threading
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run the scheduler, job queue workers and email outbox sender until SIGTERM/SIGINT."""
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}, shutting down worker")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    logger.info(f"Starting Sponte AI worker in {settings.ENVIRONMENT} mode")
+
+    # Test database connection
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        logger.info("✅ Database connection successful")
+    except Exception as e:
+        logger.error(f"❌ Database connection failed: {str(e)}")
+        raise
+
+    start_scheduler()
+    start_job_workers()
+    start_outbox_sender()
+    logger.info("✅ Worker started")
+
+    try:
+        while not stop_event.wait(1):
+            pass
+    finally:
+        stop_scheduler()
+        stop_job_workers()
+        stop_outbox_sender()
+        engine.dispose()
+        logger.info("✅ Worker stopped")
+
+
+if __name__ == "__main__":
+    main()
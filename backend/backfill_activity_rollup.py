@@ -0,0 +1,64 @@
+"""
+Activity rollup backfill.
+Rebuilds agent_activity_daily from agent_tasks / agent_outputs, a month of
+days per transaction, from the earliest activity (or --since) to today.
+Safe to re-run: each chunk replaces the rollup rows for its days.
+Starts no earlier than the partition retention cutoff; older rollup rows
+are kept as they are, since their source rows have been detached.
+
+Usage:
+    python backfill_activity_rollup.py [--since 2026-01-01] [--location <uuid>]
+"""
+
+from app.database import SessionLocal
+from app.models import AgentOutput, AgentTask
+from app.services.activity_rollup import ActivityRollupService
+from app.services.partitions import retention_cutoff
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+import argparse
+import uuid
+
+
+def earliest_activity_day(db) -> date:
+    """First UTC day with an output or a completed task, or today if none."""
+    candidates = [
+        db.query(func.min(AgentOutput.created_at)).scalar(),
+        db.query(func.min(AgentTask.completed_at)).scalar(),
+    ]
+    candidates = [value for value in candidates if value]
+    return min(candidates).date() if candidates else datetime.utcnow().date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the agent activity rollup")
+    parser.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (ISO date)")
+    parser.add_argument("--location", type=uuid.UUID, help="Only rebuild one location")
+    parser.add_argument("--chunk-days", type=int, default=31, help="Days rebuilt per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        start_day = args.since or earliest_activity_day(db)
+        cutoff = retention_cutoff()
+        if cutoff and start_day < cutoff:
+            print(f"Starting at {cutoff}: earlier partitions are detached (PARTITION_RETENTION_MONTHS)")
+            start_day = cutoff
+        today = datetime.utcnow().date()
+        print(f"Rebuilding activity rollup from {start_day} to {today}")
+
+        total = 0
+        while start_day <= today:
+            end_day = min(start_day + timedelta(days=args.chunk_days - 1), today)
+            rows = ActivityRollupService.rebuild(db, start_day, end_day, location_id=args.location)
+            print(f"  {start_day} to {end_day}: {rows} rows")
+            total += rows
+            start_day = end_day + timedelta(days=1)
+
+        print(f"Done. {total} rollup rows written")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Multi-worker load test.
+Starts the production launcher (start.py) with each worker count in turn,
+drives it with keep-alive HTTP clients for a fixed time, and reports
+throughput, latency and speedup over the first run, showing how the API
+scales across cores.
+
+The clients run on the same machine, so leave them cores of their own:
+with 8 cores, compare --workers 1,2,4 rather than 1,2,4,8.
+
+Usage:
+    python load_test.py --workers 1,2,4 --duration 15 --clients 4 --path /health
+
+Needs DATABASE_URL (the app checks the database on startup). Pass --url to
+load an already running server instead of starting one.
+"""
+
+from multiprocessing import Pool
+from typing import List, Tuple
+from urllib.parse import urlsplit
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+
+def run_client(args: Tuple[str, str, int, float]) -> Tuple[int, int, List[float]]:
+    """One client process: keep-alive connections in threads, each sending requests back to back."""
+    base_url, path, connections, duration = args
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + duration
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def loop():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+        local: List[float] = []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    raise http.client.HTTPException(response.status)
+                local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=loop) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), errors[0], latencies
+
+
+def load(base_url: str, path: str, clients: int, connections: int, duration: float) -> dict:
+    """Drive base_url for duration seconds and summarize the results."""
+    with Pool(clients) as pool:
+        results = pool.map(run_client, [(base_url, path, connections, duration)] * clients)
+
+    latencies = sorted(latency for _, _, client_latencies in results for latency in client_latencies)
+    if not latencies:
+        sys.exit(f"No successful requests to {base_url}{path}")
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors, _ in results),
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    """Run start.py with a fixed worker count and wait until every worker answers."""
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        WEB_CONCURRENCY=str(workers),
+        ENVIRONMENT="production",  # No SQL echo; always the multi-worker supervisor
+        RUN_SCHEDULER_IN_API="false",  # Keep background jobs out of the measurement
+    )
+    server = subprocess.Popen(
+        [sys.executable, "start.py"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"start.py exited with {server.returncode}; run it directly to see why")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health/live", timeout=1).read()
+            time.sleep(1 + workers * 0.5)  # The first worker is up; give the rest time to finish importing
+            return server
+        except OSError:
+            time.sleep(0.5)
+
+    server.terminate()
+    sys.exit("start.py didn't come up within 60s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the multi-worker launcher")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to compare")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds of load per run")
+    parser.add_argument("--clients", type=int, default=4, help="Client processes")
+    parser.add_argument("--connections", type=int, default=8, help="Keep-alive connections per client process")
+    parser.add_argument("--path", default="/health", help="Path to request")
+    parser.add_argument("--url", help="Load this running server once instead of starting start.py")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients x {args.connections} connections, {args.duration:.0f}s per run, GET {args.path}")
+
+    if args.url:
+        result = load(args.url.rstrip("/"), args.path, args.clients, args.connections, args.duration)
+        print(f"{result['rps']:>9.0f} req/s  p50 {result['p50_ms']:.1f} ms  p99 {result['p99_ms']:.1f} ms  errors {result['errors']}")
+        return
+
+    print(f"{'workers':>7}  {'req/s':>9}  {'speedup':>7}  {'p50 ms':>7}  {'p99 ms':>7}  {'errors':>6}")
+    baseline = None
+    for workers in [int(count) for count in args.workers.split(",")]:
+        port = free_port()
+        server = start_server(workers, port)
+        try:
+            result = load(f"http://127.0.0.1:{port}", args.path, args.clients, args.connections, args.duration)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+        baseline = baseline or result["rps"]
+        print(
+            f"{workers:>7}  {result['rps']:>9.0f}  {result['rps'] / baseline:>6.2f}x  "
+            f"{result['p50_ms']:>7.1f}  {result['p99_ms']:>7.1f}  {result['errors']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Startup import profile.
+Imports app.main in fresh interpreters under `python -X importtime` and
+summarizes where cold-start time goes: the slowest modules (cumulative),
+self time per top-level package, and the total against a budget.
+
+Also checks that the heavy client libraries stay lazy - they are imported
+on first use, so none of them may be loaded by `import app.main`.
+
+Usage:
+    python profile_startup.py --runs 5 --budget-ms 2500
+
+Exits non-zero when the median import time exceeds the budget or a lazy
+library is imported at startup (used as a CI benchmark).
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Default cold-start budget for `import app.main`; leaves headroom for slower CI runners
+IMPORT_BUDGET_MS = 2500
+
+# Libraries only loaded when first used (see ai_service, http_client, google_oauth_service, scheduler)
+LAZY_MODULES = (
+    "anthropic",
+    "googleapiclient.discovery",
+    "google_auth_oauthlib",
+    "google_auth_httplib2",
+    "google.oauth2.credentials",
+    "httplib2",
+    "apscheduler",
+    "cryptography.fernet",
+)
+
+# (module, self microseconds, cumulative microseconds, nesting depth)
+ImportRecord = Tuple[str, int, int, int]
+
+
+def profile_once(target: str) -> List[ImportRecord]:
+    """Import target in a fresh interpreter and parse its -X importtime output."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {target} failed:\n{result.stderr[-2000:]}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def total_ms(records: List[ImportRecord], target: str) -> float:
+    """Cumulative import time of target."""
+    return next(cumulative for name, _, cumulative, _ in records if name == target) / 1000
+
+
+def package_totals(records: List[ImportRecord]) -> Dict[str, float]:
+    """Self time per top-level package, in ms."""
+    totals: Dict[str, float] = defaultdict(float)
+    for name, self_us, _, _ in records:
+        totals[name.split(".")[0]] += self_us / 1000
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile app startup imports")
+    parser.add_argument("--target", default="app.main", help="Module to import")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to time (median is reported)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Fail above this median import time")
+    args = parser.parse_args()
+
+    runs = [profile_once(args.target) for _ in range(args.runs)]
+    totals = [total_ms(records, args.target) for records in runs]
+    median = statistics.median(totals)
+    records = runs[totals.index(min(totals))]  # Least noisy run for the breakdown
+
+    print(f"Slowest modules by cumulative time (fastest of {args.runs} runs)")
+    for name, _, cumulative, depth in sorted(records, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {'  ' * min(depth, 6)}{name}")
+
+    print("\nSelf time per top-level package")
+    for package, ms in sorted(package_totals(records).items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:>8.1f} ms  {package}")
+
+    failed = False
+    loaded = {name for name, _, _, _ in records}
+    eager = [module for module in LAZY_MODULES if module in loaded]
+    if eager:
+        failed = True
+        print(f"\nFAIL: imported at startup but should be lazy: {', '.join(eager)}")
+
+    runs_ms = ", ".join(f"{ms:.0f}" for ms in totals)
+    print(f"\nimport {args.target}: median {median:.0f} ms over {args.runs} runs ({runs_ms}); budget {args.budget_ms:.0f} ms")
+    if median > args.budget_ms:
+        failed = True
+        print(f"FAIL: over the cold-start budget by {median - args.budget_ms:.0f} ms")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Local stand-in for the Resend API.
+Accepts single and batch sends, honours Idempotency-Key, and can reject a
+fraction of batch messages to exercise retries. Nothing is delivered.
+
+Usage:
+    python resend_stub.py --port 8025 [--reject-rate 0.05]
+
+Then run the API or worker with RESEND_API_URL=http://localhost:8025
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import random
+import threading
+import uuid
+
+_lock = threading.Lock()
+_idempotent_responses = {}
+_stats = {"requests": 0, "emails": 0, "rejected": 0, "replayed": 0}
+
+
+class ResendStubHandler(BaseHTTPRequestHandler):
+    """Handles POST /emails and POST /emails/batch."""
+
+    reject_rate = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except json.JSONDecodeError:
+            return self._respond(422, {"name": "validation_error", "message": "Invalid JSON"})
+
+        if self.path == "/emails":
+            return self._idempotent(lambda: self._send_one(body))
+        if self.path == "/emails/batch":
+            if not isinstance(body, list) or not 1 <= len(body) <= 100:
+                return self._respond(422, {"name": "validation_error", "message": "Batch must contain 1-100 emails"})
+            return self._idempotent(lambda: self._send_batch(body))
+
+        self._respond(404, {"name": "not_found", "message": f"Unknown path {self.path}"})
+
+    def _idempotent(self, handler):
+        key = self.headers.get("Idempotency-Key")
+        with _lock:
+            _stats["requests"] += 1
+            if key and key in _idempotent_responses:
+                _stats["replayed"] += 1
+                return self._respond(200, _idempotent_responses[key])
+
+            response = handler()
+            if key:
+                _idempotent_responses[key] = response
+        self._respond(200, response)
+
+    def _send_one(self, message):
+        _stats["emails"] += 1
+        return {"id": str(uuid.uuid4())}
+
+    def _send_batch(self, messages):
+        permissive = self.headers.get("x-batch-validation") == "permissive"
+        data, errors = [], []
+        for index, message in enumerate(messages):
+            if permissive and random.random() < self.reject_rate:
+                errors.append({"index": index, "message": "Rejected by stub"})
+                _stats["rejected"] += 1
+            else:
+                data.append({"id": str(uuid.uuid4())})
+                _stats["emails"] += 1
+        return {"data": data, "errors": errors} if permissive else {"data": data}
+
+    def _respond(self, status, payload):
+        encoded = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        print(f"{self.command} {self.path} -> {args[1] if len(args) > 1 else ''} | {_stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Resend API stand-in")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Fraction of batch messages to reject")
+    args = parser.parse_args()
+
+    ResendStubHandler.reject_rate = args.reject_rate
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), ResendStubHandler)
+    print(f"Resend stub listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Final stats: {_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Schedule load simulator.
+Compares outbound request rates (Claude, Google, Resend) for a synthetic
+location population under the old global cron schedule and the per-location
+slot schedule, and prints peak vs. average rates for each.
+
+Usage:
+    python simulate_schedule.py --locations 5000 --days 28
+"""
+
+from app.services.slot_scheduler import (
+    GBP_POST_WINDOW,
+    WEEKLY_REPORT_WINDOW,
+    MONTHLY_REPORT_WINDOW,
+    get_slot,
+)
+from app.services.gbp_agent import CADENCE_DAYS
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import argparse
+import random
+import uuid
+
+# Rough US small-business distribution by timezone
+TIMEZONE_WEIGHTS = {
+    "America/New_York": 0.47,
+    "America/Chicago": 0.29,
+    "America/Denver": 0.06,
+    "America/Phoenix": 0.02,
+    "America/Los_Angeles": 0.14,
+    "America/Anchorage": 0.01,
+    "Pacific/Honolulu": 0.01,
+}
+
+CADENCE_WEIGHTS = {
+    "daily": 0.10,
+    "triweekly": 0.20,
+    "weekly": 0.50,
+    "biweekly": 0.15,
+    "monthly": 0.05,
+}
+
+# Outbound requests per job
+GBP_POST_REQUESTS = {"claude": 1, "google": 1}
+REPORT_REQUESTS = {"resend": 1}
+
+
+def build_population(count: int, rng: random.Random):
+    """Generate synthetic locations with a timezone, cadence and last post date."""
+    timezones = rng.choices(list(TIMEZONE_WEIGHTS), weights=list(TIMEZONE_WEIGHTS.values()), k=count)
+    cadences = rng.choices(list(CADENCE_WEIGHTS), weights=list(CADENCE_WEIGHTS.values()), k=count)
+
+    population = []
+    for tz_name, cadence in zip(timezones, cadences):
+        days = CADENCE_DAYS[cadence]
+        population.append({
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "tz": ZoneInfo(tz_name),
+            "cadence_days": days,
+            # Spread existing posting history so cadences are out of phase
+            "days_since_post": rng.randrange(days),
+        })
+    return population
+
+
+def simulate(population, start: date, days: int, slotted: bool) -> Counter:
+    """
+    Simulate one schedule and count requests per (provider, minute).
+
+    Args:
+        population: Locations from build_population
+        start: First simulated date
+        days: Number of days to simulate
+        slotted: Use per-location slots instead of the global cron times
+
+    Returns:
+        Counter keyed by (provider, minute since start)
+    """
+    origin = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+    counts = Counter()
+
+    def record(at: datetime, requests):
+        minute = int((at - origin).total_seconds() // 60)
+        if 0 <= minute < days * 1440:
+            for provider, n in requests.items():
+                counts[(provider, minute)] += n
+
+    for location in population:
+        days_since_post = location["days_since_post"]
+
+        for day in range(days):
+            current = start + timedelta(days=day)
+
+            # GBP posts
+            days_since_post += 1
+            if days_since_post >= location["cadence_days"]:
+                days_since_post = 0
+                if slotted:
+                    at = get_slot(location["id"], location["tz"], current, GBP_POST_WINDOW)
+                else:
+                    at = origin + timedelta(days=day, hours=6)
+                record(at, GBP_POST_REQUESTS)
+
+            # Weekly and monthly reports
+            for window, legacy_hour in ((WEEKLY_REPORT_WINDOW, 8), (MONTHLY_REPORT_WINDOW, 9)):
+                if not window.has_slot_on(current):
+                    continue
+                if slotted:
+                    at = get_slot(location["id"], location["tz"], current, window)
+                else:
+                    at = origin + timedelta(days=day, hours=legacy_hour)
+                record(at, REPORT_REQUESTS)
+
+    return counts
+
+
+def summarize(label: str, counts: Counter, days: int, bucket_minutes: int):
+    """Print peak and average request rates per provider."""
+    total_minutes = days * 1440
+    print(f"\n{label}")
+    print(f"  {'provider':<10}{'total':>10}{'avg/min':>12}{'peak/min':>12}{'peak/avg':>12}")
+
+    for provider in ("claude", "google", "resend"):
+        buckets = Counter()
+        total = 0
+        for (name, minute), n in counts.items():
+            if name == provider:
+                buckets[minute // bucket_minutes] += n
+                total += n
+
+        average = total / total_minutes
+        peak = max(buckets.values(), default=0) / bucket_minutes
+        ratio = peak / average if average else 0
+        print(f"  {provider:<10}{total:>10}{average:>12.2f}{peak:>12.2f}{ratio:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cron vs. slot scheduling load")
+    parser.add_argument("--locations", type=int, default=5000, help="Number of locations")
+    parser.add_argument("--days", type=int, default=28, help="Days to simulate")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2026, 11, 2), help="First day (ISO date)")
+    parser.add_argument("--bucket-minutes", type=int, default=1, help="Bucket size for peak rates")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    population = build_population(args.locations, random.Random(args.seed))
+    print(f"Simulating {args.locations} locations for {args.days} days from {args.start}")
+
+    summarize("Global cron (GBP 06:00, reports Mon 08:00/09:00 server time)",
+              simulate(population, args.start, args.days, slotted=False), args.days, args.bucket_minutes)
+    summarize("Slot schedule (local time windows, hashed offsets)",
+              simulate(population, args.start, args.days, slotted=True), args.days, args.bucket_minutes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,205 @@
 #!/usr/bin/env python3
-"""Start the FastAPI application with the correct port"""
+"""
+Start the FastAPI application with the correct port.
+
+In production, a supervisor process pre-forks WEB_CONCURRENCY uvicorn
+workers (uvloop + httptools) that share one listening socket, restarts any
+worker that dies or stops responding, and splits DB_MAX_CONNECTIONS between
+them. Send the supervisor SIGHUP to replace workers one at a time (each
+replacement is up before the old worker finishes its in-flight requests
+and exits), SIGTTIN / SIGTTOU to add or remove a worker, and SIGTERM to
+shut down.
+
+Web workers never run the scheduler, job queue or email outbox here. With
+RUN_SCHEDULER_IN_API (the default) the supervisor runs them in one
+`python -m app.worker` process of its own, whose connections are set
+aside from DB_MAX_CONNECTIONS first; otherwise deploy app.worker separately.
+"""
+import math
 import os
+import subprocess
+import sys
+import tempfile
+import time
 import uvicorn
+from uvicorn.supervisors import Multiprocess
+from uvicorn.supervisors.multiprocess import Process, logger
+from app.config import settings
+from typing import Dict, List, Optional, Tuple
+
+# Below this many connections per worker, requests queue on the pool; run fewer workers instead
+MIN_CONNECTIONS_PER_WORKER = 4
+
+# Longest a reload waits for a replacement worker to finish starting up
+WORKER_STARTUP_TIMEOUT_SECONDS = 60
+
+# Connections the background process's scheduled jobs may use at once (APScheduler runs them in threads)
+SCHEDULED_JOB_CONNECTIONS = 2
+
+
+class ReadyServer(uvicorn.Server):
+    """uvicorn server that marks itself ready (a file named after its pid) once startup completes."""
+
+    def __init__(self, config: uvicorn.Config, ready_dir: str):
+        super().__init__(config)
+        self.ready_dir = ready_dir
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets)
+        if not self.should_exit:
+            open(os.path.join(self.ready_dir, str(os.getpid())), "w").close()
+
+
+class RollingMultiprocess(Multiprocess):
+    """
+    Supervisor whose SIGHUP reload replaces workers one at a time: each
+    replacement is started and ready before the worker it replaces is
+    stopped, so the socket is always being served. While both run, the
+    service briefly holds one extra worker's share of DB connections.
+    """
+
+    def __init__(self, config: uvicorn.Config, server: ReadyServer, sockets, background_env=None):
+        super().__init__(config, target=server.run, sockets=sockets)
+        self.ready_dir = server.ready_dir
+        self.background_env = background_env
+        self.background: Optional[subprocess.Popen] = None
+        self.draining: List[subprocess.Popen] = []
+
+    def init_processes(self):
+        super().init_processes()
+        if self.background_env:
+            self._start_background()
+
+    def _start_background(self):
+        self.background = subprocess.Popen([sys.executable, "-m", "app.worker"], env=self.background_env)
+        logger.info(f"Started background process [{self.background.pid}]")
+
+    def keep_subprocess_alive(self):
+        super().keep_subprocess_alive()
+        self.draining = [process for process in self.draining if process.poll() is None]
+        if self.background and self.background.poll() is not None and not self.should_exit.is_set():
+            logger.info(f"Background process [{self.background.pid}] died")
+            self._start_background()
+
+    def terminate_all(self):
+        super().terminate_all()
+        for process in [self.background, *self.draining]:
+            if process and process.poll() is None:
+                process.terminate()
+
+    def join_all(self):
+        super().join_all()
+        for process in [self.background, *self.draining]:
+            if process:
+                process.wait()
+
+    def restart_all(self):
+        self._restart_web_workers()
+        if self.background:
+            # The old process finishes its running jobs while the new one starts; they
+            # share the queue safely (leases, leader lock), so the reload doesn't wait for it
+            self.background.terminate()
+            self.draining.append(self.background)
+            self._start_background()
+
+    def _restart_web_workers(self):
+        for idx, process in enumerate(self.processes):
+            replacement = Process(self.config, self.target, self.sockets)
+            replacement.start()
+            if not self._wait_until_ready(replacement):
+                logger.error(f"Replacement worker [{replacement.pid}] failed to start; keeping the running workers")
+                replacement.terminate()
+                replacement.join()
+                return
+
+            process.terminate()
+            process.join()
+            self.processes[idx] = replacement
+
+    def _wait_until_ready(self, process: Process) -> bool:
+        marker = os.path.join(self.ready_dir, str(process.pid))
+        deadline = time.monotonic() + WORKER_STARTUP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline and process.process.is_alive():
+            if os.path.exists(marker):
+                os.remove(marker)
+                return True
+            time.sleep(0.1)
+        return False
+
+
+def available_cpus() -> int:
+    """CPU cores this process may use, honoring container (cgroup) CPU limits."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+    # cgroup v2, then v1: a quota of 150000 per 100000 period is 1.5 cores
+    for quota_file, period_file in (
+        ("/sys/fs/cgroup/cpu.max", None),
+        ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "/sys/fs/cgroup/cpu/cpu.cfs_period_us"),
+    ):
+        try:
+            with open(quota_file) as f:
+                values = f.read().split()
+            if period_file:
+                with open(period_file) as f:
+                    values.append(f.read().strip())
+        except OSError:
+            continue
+        if values[0] not in ("max", "-1"):
+            cpus = min(cpus, math.ceil(int(values[0]) / int(values[1])))
+        break
+
+    return max(1, cpus)
+
+
+def background_pool() -> Tuple[int, int]:
+    """
+    DB pool for the background process, and the connections it holds in
+    total (its pool plus the scheduler's leader-election connection).
+    """
+    pool_size = (
+        settings.JOB_QUEUE_WORKER_THREADS
+        + settings.EMAIL_OUTBOX_CONCURRENCY + 1  # Batch senders plus the poller
+        + SCHEDULED_JOB_CONNECTIONS
+    )
+    return pool_size, pool_size + 1
+
+
+def plan_workers(env: str, background: bool) -> Tuple[int, int, int]:
+    """
+    Worker count and per-worker DB pool.
+
+    Args:
+        env: ENVIRONMENT
+        background: The supervisor also runs the background process, whose
+            connections come out of DB_MAX_CONNECTIONS first
+
+    Returns:
+        Tuple of (workers, pool_size, max_overflow)
+    """
+    if settings.WEB_CONCURRENCY > 0:
+        workers = settings.WEB_CONCURRENCY
+    else:
+        workers = 1 if env == "development" else available_cpus()
+
+    budget = settings.DB_MAX_CONNECTIONS - (background_pool()[1] if background else 0)
+
+    # Every worker has its own pool; together they must fit the connection budget
+    max_workers = max(1, budget // MIN_CONNECTIONS_PER_WORKER)
+    if workers > max_workers:
+        print(f"⚠️  DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} allows {max_workers} workers, not {workers}")
+        workers = max_workers
+
+    # Keep the configured pool / overflow ratio, scaled down to this worker's share
+    configured = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    connections = max(1, min(configured, budget // workers))
+    pool_size = max(1, connections * settings.DB_POOL_SIZE // configured)
+    return workers, pool_size, max(0, connections - pool_size)
+
 
 if __name__ == "__main__":
     # --- Pre-flight Checks ---
     print("🚀 Starting Sponte AI Backend Startup Script")
-    
+
     # Check Environment
     env = os.environ.get("ENVIRONMENT", "development")
     print(f"ℹ️  Environment: {env}")
@@ -35,12 +228,44 @@ if __name__ == "__main__":
         print("ℹ️  PORT is not set. Defaulting to 8000")
         port = 8000
 
-    print(f"🚀 Launching Uvicorn on 0.0.0.0:{port}...")
-    print("-" * 50)
+    # Web workers never run background services under the supervisor; it runs them in a process of its own
+    supervised = not (env == "development" and settings.WEB_CONCURRENCY <= 1)
+    background = supervised and settings.RUN_SCHEDULER_IN_API
+    background_env: Optional[Dict[str, str]] = None
+    if supervised:
+        os.environ["RUN_SCHEDULER_IN_API"] = "false"
+        # /metrics aggregates every worker (and the background process) through a shared directory
+        os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="sponte-metrics-"))
+    if background:
+        pool_size, _ = background_pool()
+        background_env = dict(os.environ, DB_POOL_SIZE=str(pool_size), DB_MAX_OVERFLOW="0")
+        print(f"✅ Background process (scheduler, job queue, email outbox) with DB pool {pool_size}")
+    elif supervised:
+        print("ℹ️  Scheduler disabled in web workers (RUN_SCHEDULER_IN_API=false); run python -m app.worker")
+
+    # Size workers and their DB pools (workers read these from the environment)
+    workers, pool_size, max_overflow = plan_workers(env, background)
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    print(f"✅ {workers} worker(s) on {available_cpus()} CPU(s), DB pool {pool_size} + {max_overflow} overflow per worker")
 
-    uvicorn.run(
+    config = uvicorn.Config(
         "app.main:app",
         host="0.0.0.0",
         port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
         log_level="info"
-    )
\ No newline at end of file
+    )
+    server = ReadyServer(config, ready_dir=tempfile.mkdtemp(prefix="sponte-workers-"))
+
+    print(f"🚀 Launching Uvicorn on 0.0.0.0:{port}...")
+    print("-" * 50)
+
+    if supervised:
+        sock = config.bind_socket()
+        RollingMultiprocess(config, server, sockets=[sock], background_env=background_env).run()
+    else:
+        server.run()
@@ -0,0 +1,40 @@
+"""
+Shared test fixtures.
+The unit tests here need no database: app.database builds its engine on
+import but never connects, so a throwaway SQLite URL is enough.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test-sponte.db")
+os.environ.setdefault("ENVIRONMENT", "test")  # No SQL echo
+
+import pytest
+from sqlalchemy import create_engine
+from app.services import query_tracker
+from app.services.query_tracker import assert_max_queries
+
+
+@pytest.fixture
+def max_queries(request):
+    """
+    Query budget for a block of a test, failing it when exceeded (see
+    query_tracker.assert_max_queries):
+
+        def test_approve_post(db, output, max_queries):
+            with max_queries(3, max_repeats=1):
+                GBPAgentService.approve_post(db, output.id)
+    """
+    def budget(count: int, max_repeats=None):
+        return assert_max_queries(count, label=request.node.name, max_repeats=max_repeats)
+
+    return budget
+
+
+@pytest.fixture
+def sqlite_engine():
+    """In-memory SQLite engine whose statements are tracked like the app's."""
+    engine = create_engine("sqlite://")
+    query_tracker.instrument_engine(engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,56 @@
+from app.services.email_templates import _fragments, render_report_email, render_welcome_email
+import pytest
+
+REPORT_DATA = {
+    "period": "Oct 12 - Oct 18, 2026",
+    "metrics": {
+        "calls": {"current": 1247, "change": 12.5},
+        "gbpViews": {"current": 18432, "change": -3.1},
+        "reviews": {"avgRating": 4.7, "count": 213, "newReviews": 9},
+    },
+    "insights": ["<script>alert(1)</script>", "Calls up"],
+    "opportunities": [],
+}
+
+
+def test_fragments_substitute_constants_and_split_on_placeholders():
+    assert _fragments("<p>${greeting}, ${name}!</p>", ("name",), greeting="Hi") == ("<p>Hi, ", "!</p>")
+
+
+def test_fragments_check_placeholder_order():
+    with pytest.raises(ValueError, match="don't match"):
+        _fragments("${b} ${a}", ("a", "b"))
+
+
+def test_fragments_are_ascii():
+    assert _fragments("📞 ${label} →", ("label",)) == ("&#128222; ", " &#8594;")
+
+
+def test_report_email_escapes_values():
+    html = render_report_email("Tom & Jerry's", "weekly", REPORT_DATA, "report-1")
+
+    assert "Tom &amp; Jerry&#x27;s" in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "<script>" not in html
+
+
+def test_report_email_content():
+    html = render_report_email("Demo", "weekly", REPORT_DATA, "report-1")
+
+    assert "WEEKLY REPORT" in html
+    assert "this week" in html
+    assert "1,247" in html and "&#8593; 12.5%" in html
+    assert "18,432" in html and "&#8595; 3.1%" in html
+    assert "+9 new this week" in html
+    assert "<span>Opportunities Identified</span>" not in html
+    assert "<span>Key Insights</span>" in html
+    assert "/dashboard/reports/report-1" in html
+    assert html.isascii()
+
+
+def test_welcome_email_escapes_values():
+    html = render_welcome_email("<b>Demo</b>", "user-1", "location-1")
+
+    assert "Hey &lt;b&gt;Demo&lt;/b&gt;!" in html
+    assert "/dashboard/setup/user-1" in html
+    assert "Location: location-1" in html
@@ -0,0 +1,47 @@
+from app.services.google_oauth_service import GoogleOAuthService
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+
+SYNCED_AT = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def oauth_token():
+    return SimpleNamespace(location_id="loc-1", provider_email=None, accounts_count=3, account_info_synced_at=SYNCED_AT)
+
+
+@pytest.fixture(autouse=True)
+def user_email(monkeypatch):
+    monkeypatch.setattr(GoogleOAuthService, "get_user_email", staticmethod(lambda credentials: "owner@example.com"))
+
+
+def test_sync_account_info_caches_account_count(monkeypatch, oauth_token):
+    monkeypatch.setattr(GoogleOAuthService, "_fetch_accounts", staticmethod(lambda credentials: [{}, {}]))
+
+    GoogleOAuthService.sync_account_info(MagicMock(), oauth_token, credentials=None)
+
+    assert oauth_token.provider_email == "owner@example.com"
+    assert oauth_token.accounts_count == 2
+    assert oauth_token.account_info_synced_at > SYNCED_AT
+
+
+def test_sync_account_info_keeps_cached_count_when_listing_fails(monkeypatch, oauth_token):
+    def fail(credentials):
+        raise ConnectionError("Google unavailable")
+
+    monkeypatch.setattr(GoogleOAuthService, "_fetch_accounts", staticmethod(fail))
+
+    GoogleOAuthService.sync_account_info(MagicMock(), oauth_token, credentials=None)
+
+    assert oauth_token.accounts_count == 3
+    assert oauth_token.account_info_synced_at == SYNCED_AT
+
+
+def test_list_accounts_still_returns_empty_list_on_failure(monkeypatch):
+    def fail(credentials):
+        raise ConnectionError("Google unavailable")
+
+    monkeypatch.setattr(GoogleOAuthService, "_fetch_accounts", staticmethod(fail))
+    assert GoogleOAuthService.list_accounts(credentials=None) == []
@@ -0,0 +1,23 @@
+from app.config import settings
+from app.services.job_queue import compute_backoff
+
+
+def test_backoff_doubles_per_attempt(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_QUEUE_BACKOFF_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "JOB_QUEUE_BACKOFF_MAX_SECONDS", 3600)
+
+    for attempts, base in ((0, 30), (1, 30), (2, 60), (3, 120)):
+        for _ in range(50):
+            assert base * 0.8 <= compute_backoff(attempts).total_seconds() <= base * 1.2
+
+
+def test_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_QUEUE_BACKOFF_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "JOB_QUEUE_BACKOFF_MAX_SECONDS", 3600)
+
+    assert compute_backoff(30).total_seconds() <= 3600 * 1.2
+    assert compute_backoff(30).total_seconds() >= 3600 * 0.8
+
+
+def test_backoff_is_jittered():
+    assert len({compute_backoff(2) for _ in range(20)}) > 1
@@ -0,0 +1,144 @@
+from app.services import scheduler
+from app.services.leader_election import LeaderElector
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import threading
+import pytest
+
+LOCK_ID = 42
+
+
+class FakeServer:
+    """Session-level advisory locks, released when the owning connection goes away."""
+
+    def __init__(self):
+        self.locks = {}
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, server: FakeServer):
+        self.server = server
+        self.dropped = False
+
+    def execution_options(self, **options):
+        return self
+
+    def execute(self, statement, params=None):
+        if self.dropped:
+            raise ConnectionError("server closed the connection unexpectedly")
+
+        sql = str(statement)
+        if "pg_try_advisory_lock" in sql:
+            owner = self.server.locks.setdefault(params["lock_id"], self)
+            return SimpleNamespace(scalar=lambda: owner is self)
+        if "pg_advisory_unlock" in sql:
+            released = self.server.locks.get(params["lock_id"]) is self
+            if released:
+                del self.server.locks[params["lock_id"]]
+            return SimpleNamespace(scalar=lambda: released)
+        return SimpleNamespace(scalar=lambda: 1)
+
+    def drop(self):
+        """The session dies server-side (network loss, backend terminated)."""
+        self.dropped = True
+        self._release_locks()
+
+    def invalidate(self):
+        self._release_locks()
+
+    def close(self):
+        self._release_locks()
+
+    def _release_locks(self):
+        for lock_id, owner in list(self.server.locks.items()):
+            if owner is self:
+                del self.server.locks[lock_id]
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+def make_elector(server: FakeServer, **callbacks) -> LeaderElector:
+    elector = LeaderElector(LOCK_ID, heartbeat_interval=0.01, database_url="sqlite://", **callbacks)
+    elector._engine = SimpleNamespace(connect=server.connect, dispose=lambda: None)
+    return elector
+
+
+def test_only_one_elector_acquires_the_lock(server):
+    on_elected = MagicMock()
+    first, second = make_elector(server, on_elected=on_elected), make_elector(server)
+
+    first._try_acquire()
+    second._try_acquire()
+
+    assert first.is_leader
+    assert not second.is_leader
+    on_elected.assert_called_once()
+
+
+def test_release_lets_a_follower_take_over(server):
+    first, second = make_elector(server), make_elector(server)
+    first._try_acquire()
+
+    first.stop()
+    assert not first.is_leader
+    assert LOCK_ID not in server.locks
+
+    second._try_acquire()
+    assert second.is_leader
+
+
+def test_dropped_connection_demotes_and_reelects(server):
+    on_demoted = MagicMock()
+    first, second = make_elector(server, on_demoted=on_demoted), make_elector(server)
+    first._try_acquire()
+    second._try_acquire()
+
+    first._connection.drop()
+    first._heartbeat()
+
+    assert not first.is_leader
+    assert first._connection is None
+    on_demoted.assert_called_once()
+
+    second._try_acquire()
+    assert second.is_leader
+
+    # The old leader reconnects on its next attempt but stays a follower
+    first._try_acquire()
+    assert not first.is_leader
+    assert first._connection is not None
+
+
+def test_election_loop_elects_and_demotes(server):
+    elected, demoted = threading.Semaphore(0), threading.Event()
+    elector = make_elector(server, on_elected=elected.release, on_demoted=demoted.set)
+
+    elector.start()
+    try:
+        assert elected.acquire(timeout=5)
+        elector._connection.drop()
+        assert demoted.wait(timeout=5)
+        assert elected.acquire(timeout=5)  # Re-elected on a fresh connection
+    finally:
+        elector.stop()
+
+    assert not elector.is_leader
+
+
+@pytest.mark.parametrize("elector, runs", [
+    (None, False),
+    (SimpleNamespace(is_leader=False), False),
+    (SimpleNamespace(is_leader=True), True),
+])
+def test_leader_only_jobs_run_on_the_leader(monkeypatch, elector, runs):
+    monkeypatch.setattr(scheduler, "leader_elector", elector)
+    job = MagicMock(__name__="job", return_value="done")
+
+    assert scheduler.leader_only(job)() == ("done" if runs else None)
+    assert job.called == runs
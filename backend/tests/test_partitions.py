@@ -0,0 +1,103 @@
+from app.config import settings
+from app.services.partitions import PartitionManager, add_months, month_start, partition_month, partition_name, retention_cutoff
+from datetime import date
+from types import SimpleNamespace
+
+
+def test_month_start():
+    assert month_start(date(2026, 10, 19)) == date(2026, 10, 1)
+
+
+def test_add_months_across_years():
+    assert add_months(date(2026, 10, 19), 3) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 31), -1) == date(2025, 12, 1)
+    assert add_months(date(2026, 3, 1), -24) == date(2024, 3, 1)
+    assert add_months(date(2026, 12, 5), 0) == date(2026, 12, 1)
+
+
+def test_partition_name_round_trips():
+    name = partition_name("agent_tasks", date(2026, 2, 14))
+    assert name == "agent_tasks_p2026_02"
+    assert partition_month(name) == date(2026, 2, 1)
+
+
+def test_partition_month_of_default_partition():
+    assert partition_month("agent_outputs_default") is None
+
+
+def test_retention_cutoff():
+    assert retention_cutoff(date(2026, 10, 19), retention_months=24) == date(2024, 10, 1)
+    assert retention_cutoff(date(2026, 10, 19), retention_months=0) is None
+
+
+class FakeSession:
+    """Records executed SQL; answers to_regclass (partition exists) and the default partition's row count."""
+
+    def __init__(self, existing=(), stranded=None, failing=()):
+        self.existing = set(existing)
+        self.stranded = stranded or {}
+        self.failing = set(failing)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        params = params or {}
+        self.statements.append(sql)
+        if sql.startswith("SELECT to_regclass"):
+            return SimpleNamespace(scalar=lambda: params["name"] if params["name"] in self.existing else None)
+        if sql.startswith("SELECT count(*)"):
+            return SimpleNamespace(scalar=lambda: self.stranded.get((sql.split('"')[1], params["start"]), 0))
+        if sql.startswith("CREATE TABLE") and sql.split('"')[1] in self.failing:
+            raise RuntimeError("partition would overlap")
+        return SimpleNamespace()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_create_partition_with_empty_default():
+    db = FakeSession()
+
+    assert PartitionManager.create_partition(db, "agent_tasks", date(2026, 10, 19))
+    assert db.statements[-1] == (
+        'CREATE TABLE "agent_tasks_p2026_10" PARTITION OF "agent_tasks" '
+        "FOR VALUES FROM ('2026-10-01') TO ('2026-11-01')"
+    )
+    assert not any("DETACH" in sql for sql in db.statements)
+
+
+def test_create_partition_skips_existing():
+    db = FakeSession(existing={"agent_tasks_p2026_10"})
+
+    assert not PartitionManager.create_partition(db, "agent_tasks", date(2026, 10, 1))
+    assert len(db.statements) == 1
+
+
+def test_create_partition_moves_rows_out_of_default():
+    db = FakeSession(stranded={("agent_tasks_default", date(2026, 10, 1)): 12})
+
+    assert PartitionManager.create_partition(db, "agent_tasks", date(2026, 10, 1))
+    moves = [sql.split(" WHERE")[0] for sql in db.statements[2:]]
+    assert moves == [
+        'ALTER TABLE "agent_tasks" DETACH PARTITION "agent_tasks_default"',
+        'CREATE TABLE "agent_tasks_p2026_10" PARTITION OF "agent_tasks" '
+        "FOR VALUES FROM ('2026-10-01') TO ('2026-11-01')",
+        'INSERT INTO "agent_tasks_p2026_10" SELECT * FROM "agent_tasks_default"',
+        'DELETE FROM "agent_tasks_default"',
+        'ALTER TABLE "agent_tasks" ATTACH PARTITION "agent_tasks_default" DEFAULT',
+    ]
+
+
+def test_ensure_partitions_skips_a_failing_month(monkeypatch):
+    monkeypatch.setattr(settings, "PARTITION_PREMAKE_MONTHS", 2)
+    db = FakeSession(failing={"agent_tasks_p2026_11"})
+
+    assert PartitionManager.ensure_partitions(db, today=date(2026, 10, 19)) == 5
+    created = [sql.split('"')[1] for sql in db.statements if sql.startswith("CREATE TABLE")]
+    assert "agent_tasks_p2026_12" in created and "agent_outputs_p2026_10" in created
+    assert db.rollbacks == 1
@@ -0,0 +1,46 @@
+from sqlalchemy import text
+from app.services.query_tracker import QueryBudgetExceeded, assert_max_queries, statement_shape, track_queries
+import pytest
+
+
+def test_statement_shape_collapses_whitespace_and_in_lists():
+    first = statement_shape("SELECT *\n  FROM reports WHERE id IN (?, ?, ?)")
+    second = statement_shape("SELECT * FROM reports   WHERE id IN (?)")
+    assert first == second == "SELECT * FROM reports WHERE id IN (...)"
+
+
+def test_track_queries_groups_by_shape(sqlite_engine):
+    with sqlite_engine.connect() as conn, track_queries("test") as tracker:
+        for value in range(3):
+            conn.execute(text("SELECT :value"), {"value": value})
+        conn.execute(text("SELECT 1"))
+
+    assert tracker.count == 4
+    assert tracker.repeated(threshold=3) == [("SELECT ?", 3)]
+
+
+def test_assert_max_queries_within_budget(sqlite_engine):
+    with sqlite_engine.connect() as conn, assert_max_queries(2) as tracker:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    assert tracker.count == 2
+
+
+def test_assert_max_queries_over_budget(sqlite_engine):
+    with pytest.raises(QueryBudgetExceeded, match="budget of 1 exceeded"):
+        with sqlite_engine.connect() as conn, assert_max_queries(1):
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+
+def test_assert_max_queries_repeats(sqlite_engine):
+    with pytest.raises(QueryBudgetExceeded, match="repeated more than 1 times"):
+        with sqlite_engine.connect() as conn, assert_max_queries(10, max_repeats=1):
+            conn.execute(text("SELECT :value"), {"value": 1})
+            conn.execute(text("SELECT :value"), {"value": 2})
+
+
+def test_max_queries_fixture(sqlite_engine, max_queries):
+    with pytest.raises(QueryBudgetExceeded, match="test_max_queries_fixture"):
+        with sqlite_engine.connect() as conn, max_queries(0):
+            conn.execute(text("SELECT 1"))
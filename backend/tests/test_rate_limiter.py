@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from app.config import settings
+from app.services.rate_limiter import Bucket, BucketState, take, throttle
+import pytest
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def quota_settings(monkeypatch):
+    monkeypatch.setattr(settings, "QUOTA_BURST_SECONDS", 10.0)
+    monkeypatch.setattr(settings, "QUOTA_BACKOFF_FACTOR", 0.5)
+    monkeypatch.setattr(settings, "QUOTA_MIN_RATE_FACTOR", 0.1)
+    monkeypatch.setattr(settings, "QUOTA_RECOVERY_SECONDS", 300)
+
+
+def full(bucket: Bucket) -> BucketState:
+    return BucketState(bucket.capacity, NOW)
+
+
+def test_bucket_capacity_is_burst_seconds_of_rate():
+    bucket = Bucket("gbp", "project", 60)
+    assert bucket.per_second == 1
+    assert bucket.capacity == 10
+    assert Bucket("gbp", "account", 60, "accounts/1").key == "gbp:account:accounts/1"
+
+
+def test_take_until_empty_then_wait():
+    bucket = Bucket("gbp", "project", 60)
+    state = full(bucket)
+
+    for _ in range(10):
+        assert take([state], [bucket], 1, NOW) == 0
+    assert take([state], [bucket], 1, NOW) == pytest.approx(1.0)
+
+
+def test_tokens_refill_at_rate():
+    bucket = Bucket("gbp", "project", 60)
+    state = BucketState(0, NOW)
+
+    assert take([state], [bucket], 1, NOW + timedelta(seconds=2)) == 0
+    assert state.tokens == pytest.approx(1.0)
+
+
+def test_refill_is_capped_at_capacity():
+    bucket = Bucket("gbp", "project", 60)
+    state = full(bucket)
+
+    take([state], [bucket], 1, NOW + timedelta(hours=1))
+    assert state.tokens == pytest.approx(bucket.capacity - 1)
+
+
+def test_take_is_all_or_nothing():
+    project = Bucket("gbp", "project", 60)
+    account = Bucket("gbp", "account", 60, "accounts/1")
+    project_state, account_state = full(project), BucketState(0, NOW)
+
+    assert take([project_state, account_state], [project, account], 1, NOW) == pytest.approx(1.0)
+    assert project_state.tokens == project.capacity
+
+
+def test_throttle_backs_off_and_blocks():
+    bucket = Bucket("gbp", "project", 60)
+    state = full(bucket)
+
+    throttle(state, bucket, retry_after=5, now=NOW)
+    assert state.rate_factor == 0.5
+    assert state.tokens == 0
+    assert take([state], [bucket], 1, NOW + timedelta(seconds=1)) == pytest.approx(4.0)
+
+
+def test_throttle_rate_floor():
+    bucket = Bucket("gbp", "project", 60)
+    state = full(bucket)
+
+    for _ in range(10):
+        throttle(state, bucket, retry_after=None, now=NOW)
+    assert state.rate_factor == pytest.approx(0.1)
+
+
+def test_rate_recovers_over_recovery_period():
+    bucket = Bucket("gbp", "project", 60)
+    state = full(bucket)
+    throttle(state, bucket, retry_after=None, now=NOW)
+
+    take([state], [bucket], 0, NOW + timedelta(seconds=150))
+    assert state.rate_factor == pytest.approx(1.0)
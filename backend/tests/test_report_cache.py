@@ -0,0 +1,26 @@
+from app.services.report_cache import combine_etags, etag_matches
+
+ETAG = '"abc123"'
+
+
+def test_etag_matches_exact_and_weak():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches(f"W/{ETAG}", ETAG)
+    assert etag_matches(f'"other", {ETAG}', ETAG)
+
+
+def test_etag_mismatch():
+    assert not etag_matches('"other"', ETAG)
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+
+
+def test_wildcard_needs_a_current_representation():
+    assert etag_matches("*", ETAG)
+    assert not etag_matches("*", None)
+
+
+def test_combine_etags_depends_on_every_part():
+    assert combine_etags('"a"', None) == combine_etags('"a"', None)
+    assert combine_etags('"a"', None) != combine_etags('"a"', '"b"')
+    assert combine_etags('"a"', '"b"') != combine_etags('"b"', '"a"')
@@ -0,0 +1,127 @@
+from app.models import ReportRunItemStatus, ReportRunStatus, ReportType, TaskStatus
+from app.services import scheduler
+from app.services.slot_scheduler import WEEKLY_REPORT_WINDOW
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+import uuid
+
+LOCATION_ID = uuid.uuid4()
+OTHER_LOCATION_ID = uuid.uuid4()
+
+# A Monday; both times fall inside the 7:00-10:00 UTC report window's planning range
+FIRST_PASS = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)
+SECOND_PASS = datetime(2026, 10, 19, 10, 0, tzinfo=timezone.utc)
+
+
+class FakeQuery:
+    """Location query: each row holds as many of (id, timezone) as columns were selected."""
+
+    def __init__(self, columns: int):
+        self.columns = columns
+
+    def filter(self, *criteria):
+        return self
+
+    def all(self):
+        return [(location_id, "UTC")[:self.columns] for location_id in (LOCATION_ID, OTHER_LOCATION_ID)]
+
+
+class FakeDB:
+    def query(self, *columns):
+        return FakeQuery(len(columns))
+
+    def commit(self):
+        pass
+
+
+class FakeStore:
+    """Report run, run items and queued tasks, standing in for their tables."""
+
+    def __init__(self):
+        self.run = SimpleNamespace(id=uuid.uuid4(), status=ReportRunStatus.RUNNING)
+        self.items = {}
+        self.tasks = {}
+
+    # ReportRunService
+    def start_run(self, db, report_type, period_start, period_end, reopen=False):
+        if reopen:
+            self.run.status = ReportRunStatus.RUNNING
+        return self.run
+
+    def add_items(self, db, run_id, location_ids):
+        for location_id in location_ids:
+            self.items.setdefault(location_id, SimpleNamespace(location_id=location_id, status=ReportRunItemStatus.PENDING))
+
+    def get_outstanding_items(self, db, run_id, include_failed=False):
+        statuses = {ReportRunItemStatus.PENDING, ReportRunItemStatus.FAILED} if include_failed else {ReportRunItemStatus.PENDING}
+        return [item for item in self.items.values() if item.status in statuses]
+
+    def finish_if_done(self, db, run_id):
+        pass
+
+    # JobQueue
+    def enqueue_many(self, db, jobs, commit=True):
+        inserted = [job["dedupe_key"] for job in jobs if job["dedupe_key"] not in self.tasks]
+        for key in inserted:
+            self.tasks[key] = SimpleNamespace(status=TaskStatus.PENDING, attempts=0)
+        return inserted
+
+    def requeue_many(self, db, dedupe_keys, commit=True):
+        dead = [self.tasks[key] for key in dedupe_keys if self.tasks[key].status == TaskStatus.DEAD]
+        for task in dead:
+            task.status, task.attempts = TaskStatus.PENDING, 0
+        return len(dead)
+
+    def dead_letter(self, location_id):
+        """What the job queue and report handler do after a location's last attempt fails."""
+        self.items[location_id].status = ReportRunItemStatus.FAILED
+        task = next(task for key, task in self.tasks.items() if str(location_id) in key)
+        task.status, task.attempts = TaskStatus.DEAD, 3
+        return task
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeStore()
+    for name in ("start_run", "add_items", "get_outstanding_items", "finish_if_done"):
+        monkeypatch.setattr(scheduler.ReportRunService, name, getattr(store, name))
+    for name in ("enqueue_many", "requeue_many"):
+        monkeypatch.setattr(scheduler.JobQueue, name, getattr(store, name))
+    monkeypatch.setattr(scheduler, "current_run", lambda: None)
+    return store
+
+
+def plan(now):
+    return scheduler.plan_report_jobs(FakeDB(), ReportType.WEEKLY, WEEKLY_REPORT_WINDOW, scheduler.get_weekly_period, now)
+
+
+def test_replanning_the_window_leaves_dead_jobs_dead(store):
+    assert plan(FIRST_PASS) == 2
+    task = store.dead_letter(LOCATION_ID)
+
+    assert plan(SECOND_PASS) == 0
+    assert task.status == TaskStatus.DEAD
+    assert task.attempts == 3
+
+
+def test_replanning_a_finished_run_enqueues_nothing(store):
+    plan(FIRST_PASS)
+    task = store.dead_letter(LOCATION_ID)
+    store.run.status = ReportRunStatus.COMPLETED_WITH_ERRORS
+
+    assert plan(SECOND_PASS) == 0
+    assert store.run.status == ReportRunStatus.COMPLETED_WITH_ERRORS
+    assert task.status == TaskStatus.DEAD
+
+
+def test_rerun_requeues_dead_jobs(store):
+    plan(FIRST_PASS)
+    task = store.dead_letter(LOCATION_ID)
+    store.run.status = ReportRunStatus.COMPLETED_WITH_ERRORS
+
+    period_start, period_end = scheduler.get_weekly_period(datetime(2026, 10, 19))
+    assert scheduler.enqueue_report_jobs(FakeDB(), ReportType.WEEKLY, period_start, period_end, rerun=True) == 1
+    assert store.run.status == ReportRunStatus.RUNNING
+    assert task.status == TaskStatus.PENDING
+    assert task.attempts == 0
@@ -0,0 +1,45 @@
+from app.config import settings
+import pytest
+import start
+
+
+@pytest.fixture(autouse=True)
+def launcher_settings(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 0)
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 80)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 20)
+    monkeypatch.setattr(settings, "JOB_QUEUE_WORKER_THREADS", 2)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_CONCURRENCY", 4)
+    monkeypatch.setattr(start, "available_cpus", lambda: 4)
+
+
+def test_development_runs_one_worker_with_configured_pool():
+    assert start.plan_workers("development", background=False) == (1, 10, 20)
+
+
+def test_production_runs_a_worker_per_core_within_budget():
+    workers, pool_size, max_overflow = start.plan_workers("production", background=False)
+    assert workers == 4
+    assert workers * (pool_size + max_overflow) <= 80
+    assert (pool_size, max_overflow) == (6, 14)
+
+
+def test_background_connections_come_out_of_the_budget():
+    background_pool, background_total = start.background_pool()
+    assert (background_pool, background_total) == (9, 10)
+
+    workers, pool_size, max_overflow = start.plan_workers("production", background=True)
+    assert workers * (pool_size + max_overflow) + background_total <= 80
+
+
+def test_workers_are_capped_by_connection_budget(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 64)
+    workers, pool_size, max_overflow = start.plan_workers("production", background=False)
+    assert workers == 80 // start.MIN_CONNECTIONS_PER_WORKER
+    assert pool_size + max_overflow == start.MIN_CONNECTIONS_PER_WORKER
+
+
+def test_web_concurrency_overrides_cores(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    assert start.plan_workers("production", background=False)[0] == 2